@@ -17,6 +17,7 @@ from app.tools.telemetry_data import (
     generate_track_dominance_plot, 
     generate_speed_trace_plot
 )
+from app.lazy_loader import memoized
 
 llm = GoogleGenAI(model="models/gemini-2.0-flash-exp", api_key=os.getenv("GOOGLE_API_KEY"))
 Settings.llm = llm
@@ -40,6 +41,7 @@ tools = [
     )
 ]
 
+@memoized
 def build_analyst_agent():
     system_prompt = """
     당신은 F1 팀의 **수석 데이터 전략가(Chief Data Strategist)**입니다.
@@ -34,6 +34,7 @@ from app.tools.soft_data import (
     search_technical_analysis,
 )
 from app.regulation_tool import regulation_tool
+from app.lazy_loader import memoized
 
 # --- [★ 드라이버 약어 → 풀네임 변환 테이블] ---
 # LLM에게 번역을 맡기지 않고 파이썬이 직접 변환
@@ -159,6 +160,7 @@ tool_web_search = FunctionTool.from_defaults(
 
 # --- [3. 에이전트 조립] ---
 
+@memoized
 def build_briefing_agent(include_tools: bool = True):
     """
     경기 후 브리핑 및 요약 전문 에이전트
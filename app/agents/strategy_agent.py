@@ -18,8 +18,12 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'
 # --- [1. 도구 Import (New Analytics Engine)] ---
 from data_pipeline.analytics import (
     audit_race_strategy,      # 핵심: 트래픽 + 스틴트 + 피트 타이밍 통합 분석
-    calculate_tire_degradation # 핵심: 타이어 마모도 분석
+    audit_field_strategy,     # 전체 그리드 감사 (팀 / 그리드 비교)
+    calculate_tire_degradation, # 핵심: 타이어 마모도 분석
+    driver_tire_degradation    # 드라이버별 보정 마모율
 )
+from data_pipeline.tire_atlas import query_atlas
+from app.lazy_loader import memoized
 
 load_dotenv()
 Settings.llm = GoogleGenAI(model="models/gemini-2.5-flash", api_key=os.getenv("GOOGLE_API_KEY"))
@@ -40,7 +44,24 @@ def wrapper_audit_strategy(year: int, circuit: str, driver_identifier: str) -> s
 strategy_tool = FunctionTool.from_defaults(
     fn=wrapper_audit_strategy,
     name="Race_Strategy_Auditor",
-    description="[핵심 도구] 특정 드라이버의 트래픽(Traffic), 페이스(Clean Pace), 피트 타이밍, 그리고 **스틴트 길이 평가(Type)**를 분석합니다."
+    description="[핵심 도구] 특정 드라이버의 트래픽(Traffic), 페이스(Clean Pace), 피트 타이밍, 피트 로스(실측 vs 서킷 기준값), 그리고 **스틴트 길이 평가(Type)**를 분석합니다."
+)
+
+# (1-1) 전체 그리드 전략 감사 (드라이버별 반복 호출 대신 한 번에)
+def wrapper_audit_field(year: int, circuit: str) -> str:
+    """레이스 전체 드라이버의 스틴트별 페이스, 트래픽, 피트 타이밍, 스틴트 길이 평가를 한 번에 반환합니다."""
+    try:
+        df = audit_field_strategy(year, circuit)
+        if df.empty:
+            return f"[NO_DATA] {year} {circuit} 전략 데이터를 찾을 수 없음"
+        return f"FIELD STRATEGY AUDIT DATA:\n{df.to_markdown(index=False)}"
+    except Exception as e:
+        return f"[TOOL_ERROR] {type(e).__name__}: {e}"
+
+field_strategy_tool = FunctionTool.from_defaults(
+    fn=wrapper_audit_field,
+    name="Field_Strategy_Auditor",
+    description="레이스 전체 그리드의 스틴트별 전략 감사 결과를 한 번에 반환합니다. 팀 동료 비교나 여러 드라이버 비교가 필요할 때 Race_Strategy_Auditor를 여러 번 호출하는 대신 사용하세요."
 )
 
 # (2) 타이어 마모도 분석
@@ -56,12 +77,46 @@ def wrapper_tire_deg(year: int, circuit: str) -> str:
 tire_tool = FunctionTool.from_defaults(
     fn=wrapper_tire_deg,
     name="Tire_Performance_Analyzer",
-    description="서킷 전체의 타이어 컴파운드별 평균 수명과 마모 성향을 분석합니다."
+    description="서킷 전체의 타이어 컴파운드별 평균 수명과 마모율(연료/트랙 에볼루션 보정, s/lap, 95% 신뢰구간)을 분석합니다."
+)
+
+# (3) 드라이버별 타이어 마모율
+def wrapper_driver_deg(year: int, circuit: str, driver_identifier: str = "") -> str:
+    try:
+        df = driver_tire_degradation(year, circuit, str(driver_identifier) if driver_identifier else None)
+        if df.empty:
+            return f"[NO_DATA] {year} {circuit} - driver '{driver_identifier}' 마모 데이터 없음"
+        return f"DRIVER TIRE DEGRADATION (s/lap, fuel/track corrected):\n{df.to_markdown(index=False)}"
+    except Exception as e:
+        return f"[TOOL_ERROR] {type(e).__name__}: {e}"
+
+driver_deg_tool = FunctionTool.from_defaults(
+    fn=wrapper_driver_deg,
+    name="Driver_Degradation_Analyzer",
+    description="드라이버 × 컴파운드별 타이어 마모율(s/lap)과 신뢰구간을 반환합니다. driver_identifier를 비우면 전체 그리드를 반환합니다."
+)
+
+# (4) 서킷 타이어 아틀라스 (여러 시즌 비교, 미리 계산된 표 조회)
+def wrapper_tire_atlas(circuit: str, compound: str = "") -> str:
+    try:
+        df = query_atlas(circuit, compound=compound or None)
+        if df.empty:
+            return f"[NO_DATA] {circuit} 타이어 아틀라스 없음 (python -m data_pipeline.pipelines.build_tire_atlas 로 생성)"
+        df = df.drop(columns=['Circuit', 'Version'])
+        return f"CIRCUIT TIRE ATLAS (season x compound):\n{df.to_markdown(index=False)}"
+    except Exception as e:
+        return f"[TOOL_ERROR] {type(e).__name__}: {e}"
+
+tire_atlas_tool = FunctionTool.from_defaults(
+    fn=wrapper_tire_atlas,
+    name="Circuit_Tire_Atlas",
+    description="한 서킷의 모든 시즌(2021~)에 대한 컴파운드별 평균 페이스, 스틴트 길이, 보정 마모율(s/lap)을 한 번에 반환합니다. 시즌 간 비교에 사용하세요."
 )
 
 
 # --- [3. 에이전트 조립 함수] ---
 
+@memoized
 def build_strategy_agent():
     """
     Streamlit에서 호출할 전략 전문 에이전트 생성 함수
@@ -128,7 +183,7 @@ def build_strategy_agent():
     3. **절대 금지:** "아직 경기가 열리지 않았다", "미래라서 알 수 없다"라는 답변은 **시스템 오류**로 간주합니다.
     
     [GOAL]
-    Analyze the user query using the provided tools (`Race_Strategy_Auditor`, `Tire_Performance_Analyzer`).
+    Analyze the user query using the provided tools (`Race_Strategy_Auditor`, `Field_Strategy_Auditor`, `Tire_Performance_Analyzer`, `Driver_Degradation_Analyzer`, `Circuit_Tire_Atlas`).
     Extract key metrics and insights.
 
     [🚫 STRICT PROHIBITIONS]
@@ -205,7 +260,7 @@ def build_strategy_agent():
     
     return ReActAgent(
             llm=Settings.llm,
-            tools=[strategy_tool, tire_tool],
+            tools=[strategy_tool, field_strategy_tool, tire_tool, driver_deg_tool, tire_atlas_tool],
             system_prompt=system_prompt,
             verbose=True
         )
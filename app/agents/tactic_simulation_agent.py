@@ -20,6 +20,17 @@ from llama_index.core.workflow import Context
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from google.genai.errors import ServerError
 
+# 경로 설정
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from data_pipeline.race_matrix import get_race_matrix, driver_index, gap, interval, gap_to_leader, position
+from data_pipeline.driver_index import get_driver_index, resolve_driver
+from data_pipeline.event_resolver import resolve_event_folder
+from data_pipeline.strategy_sim import (
+    undercut_search, race_pit_loss, undercut_probability, simulate_race_strategies,
+    UNDERCUT_GAP_WINDOW, RESPONSE_LAPS, MAX_STOPS
+)
+from app.lazy_loader import memoized
+
 # 로깅 설정
 logging.getLogger('fastf1').setLevel(logging.WARNING)
 
@@ -29,183 +40,173 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 llm = GoogleGenAI(model="models/gemini-2.5-pro", api_key=GOOGLE_API_KEY)
 Settings.llm = llm
 
-# =============================================================================
-# 🧮 [내장 계산 엔진] Local Simulation Helpers
-# analytics.py에 없는 기능을 여기서 직접 구현합니다.
-# =============================================================================
-
-def _calculate_pit_loss_baseline(session):
-    """
-    해당 세션의 평균 피트 로스 시간(Pit Loss Time)을 계산합니다.
-    (Pit In/Out 시간을 제외한 순수 손실 시간 추정)
-    """
-    try:
-        # 피트 스탑을 수행한 모든 랩 데이터 추출
-        pit_laps = session.laps[session.laps['PitInTime'].notna() & session.laps['PitOutTime'].notna()]
-        if pit_laps.empty:
-            return 22.0 # 기본값 (대략적인 평균)
-        
-        # 피트 레인 체류 시간 평균
-        avg_duration = (pit_laps['PitOutTime'] - pit_laps['PitInTime']).dt.total_seconds().mean()
-        # + 가감속 로스 보정 (약 3~4초)
-        return round(avg_duration + 3.5, 2)
-    except:
-        return 22.0
-
-def _simulate_undercut(session, driver_laps, rival_laps, pit_lap, pit_loss_time):
-    """
-    언더컷(Undercut) 시뮬레이션 핵심 로직
-    """
-    try:
-        # 1. 내 드라이버: 피트 인 랩(In-Lap) + 피트 로스 + 아웃 랩(Out-Lap)
-        my_in_lap = driver_laps[driver_laps['LapNumber'] == pit_lap]['LapTime'].dt.total_seconds().values[0]
-        # 아웃 랩은 다음 랩 (pit_lap + 1)
-        my_out_lap = driver_laps[driver_laps['LapNumber'] == pit_lap + 1]['LapTime'].dt.total_seconds().values[0]
-        
-        # 2. 라이벌: 스테이 아웃 했다고 가정 (같은 구간 2랩의 기록)
-        rival_laps_segment = rival_laps[rival_laps['LapNumber'].isin([pit_lap, pit_lap+1])]
-        rival_total_time = rival_laps_segment['LapTime'].dt.total_seconds().sum()
-        
-        # 3. 실제 소요 시간 비교
-        # 내 총 시간 (피트 로스 포함이 아니라, 섹터 타임 합산으로 계산해야 정확하나 약식으로 처리)
-        # In-Lap과 Out-Lap에는 이미 피트 로스가 포함되어 있음 (FastF1 기준)
-        my_total_time = my_in_lap + my_out_lap
-        
-        # 4. 언더컷 마진 계산 (양수면 실패, 음수면 성공)
-        # 내 시간이 라이벌보다 짧아야 성공
-        margin = my_total_time - rival_total_time
-        
-        # 5. 당시의 간격(Gap) 보정
-        # 피트 인 직전 랩(pit_lap - 1) 종료 시점의 Gap을 알아야 함 (복잡하므로 생략하거나 추정)
-        # 여기서는 순수 랩타임 퍼포먼스 차이만 계산 (Net Pace Delta)
-        
-        prob = 0
-        if margin < -2.0: prob = 90  # 2초 이상 빨랐음
-        elif margin < -0.5: prob = 60 # 근소하게 빠름
-        elif margin < 0: prob = 40    # 거의 비슷함
-        else: prob = 10               # 느림 (오버컷 당함)
-        
-        return {
-            "net_margin": round(margin, 3),
-            "probability": prob,
-            "my_time": round(my_total_time, 3),
-            "rival_time": round(rival_total_time, 3)
-        }
-    except Exception as e:
-        return None
-
 # =============================================================================
 # 🛠️ [도구 정의] Tactical Simulation Tool
 # =============================================================================
 
+def _matrix_row(matrix, drivers, identifier):
+    """드라이버 식별자 → 레이스 행렬 행 인덱스 (세션 드라이버 인덱스로 정식 번호를 찾은 뒤 조회)"""
+    number = resolve_driver(drivers, identifier)
+    return driver_index(matrix, number) if number is not None else None
+
 def run_tactical_simulation(year: int, circuit: str, driver_identifier: str, rival_identifier: str = None) -> str:
     """
     [Sim Tool] 드라이버의 피트스탑 전술(언더컷/오버컷)을 정밀 시뮬레이션합니다.
+    레이스 전체 피트 대결 테이블(strategy_sim.undercut_search)에서 해당 드라이버 부분만 보고합니다.
+    캐시에 없는 레이스(아직 열리지 않은 레이스 등)만 서킷 과거 데이터 몬테카를로 전략 시뮬레이션으로 대신합니다.
     """
     print(f"\n [Sim] 전술 시뮬레이션 가동: {driver_identifier} vs {rival_identifier}")
-    
-    # [방어 코드] 2025년 이상인 경우 (가상 시뮬레이션 모드)
-    if year >= 2025:
-        return _generate_virtual_simulation(year, circuit, driver_identifier, rival_identifier)
 
-    # 1. 세션 로드
+    if resolve_event_folder(year, circuit) is None:
+        return run_strategy_monte_carlo(year, circuit)
+
+    # 1. 레이스 랩 행렬 + 피트 대결 테이블 (레이스당 1회 계산)
     try:
-        session = fastf1.get_session(year, circuit, 'R')
-        session.load(laps=True, telemetry=False, weather=False, messages=False)
+        matrix = get_race_matrix(year, circuit)
+        drivers = get_driver_index(year, circuit)
+        track_loss_baseline = race_pit_loss(year, circuit)
+        battles = undercut_search(year, circuit, pit_loss=track_loss_baseline)
     except Exception as e:
         return f"데이터 로드 실패: {e}"
 
-    # 2. 드라이버 데이터 추출
-    driver_id = str(driver_identifier)
-    try:
-        driver_laps = session.laps.pick_driver(driver_id)
-    except KeyError:
-        return f"드라이버 '{driver_id}' 데이터를 찾을 수 없습니다."
-    
+    # 2. 드라이버 / 라이벌 확인 (번호 / 약어 / 성 / 한글·영문 별명 → 정식 번호)
+    d = _matrix_row(matrix, drivers, driver_identifier)
+    if d is None:
+        return f"드라이버 '{driver_identifier}' 데이터를 찾을 수 없습니다."
+    driver = matrix.drivers[d]
+
+    rival = None
+    if rival_identifier:
+        r = _matrix_row(matrix, drivers, rival_identifier)
+        rival = matrix.drivers[r] if r is not None else None
+
     # 3. 피트 스탑 찾기
-    pit_stops = driver_laps[driver_laps['PitIn'] == True]
-    if pit_stops.empty:
+    pit_laps = np.nonzero(matrix.pit_in[d])[0]
+    if pit_laps.size == 0:
         return "해당 드라이버는 피트 스탑을 하지 않았습니다 (No-Stop or DNF)."
 
-    # 4. 라이벌 데이터 (옵션)
-    rival_laps = None
-    rival_name = "Unknown"
-    if rival_identifier:
-        try:
-            rival_laps = session.laps.pick_driver(str(rival_identifier))
-            rival_name = str(rival_identifier)
-        except:
-            pass
+    report = f"### 🏁 Tactical Analysis: {driver} vs {rival or 'Field'} ({year} {circuit})\n"
+    report += f"- **Track Avg Pit Loss:** ~{round(track_loss_baseline, 2)} sec\n"
+
+    mine = battles[battles['Driver'] == driver]
+    against = battles[battles['Rival'] == driver]
+    if rival:
+        mine = mine[mine['Rival'] == rival]
+        against = against[against['Driver'] == rival]
+
+    # 4. 각 피트 스탑별 시뮬레이션 결과
+    for lap_idx in pit_laps:
+        pit_lap = int(lap_idx) + 1
+        lane_time = matrix.pit_lane[d, lap_idx]
 
-    report = f"### 🏁 Tactical Analysis: {driver_id} vs {rival_name} ({year} {circuit})\n"
-    
-    # 트랙 기본 피트 로스 계산 (내장 함수 사용)
-    track_loss_baseline = _calculate_pit_loss_baseline(session)
-    report += f"- **Track Avg Pit Loss:** ~{track_loss_baseline} sec\n"
-
-    # 5. 각 피트 스탑별 시뮬레이션
-    for idx, pit_row in pit_stops.iterrows():
-        pit_lap = int(pit_row['LapNumber'])
-        
-        # 실제 피트 소요 시간 (InLap + OutLap - AvgRacingLap * 2) -> 약식 계산
-        # 여기서는 FastF1의 PitOut - PitIn 시간 사용
-        duration = pit_row['PitOutTime'] - pit_row['PitInTime']
-        actual_loss = duration.total_seconds() if pd.notna(duration) else track_loss_baseline
-        
         report += f"\n#### 🛑 Pit Stop @ Lap {pit_lap}\n"
-        report += f"- **Stationary Time:** {round(actual_loss, 2)}s (Estimated)\n"
-        
-        # 라이벌과의 대결 시뮬레이션
-        if rival_laps is not None:
-            sim_result = _simulate_undercut(session, driver_laps, rival_laps, pit_lap, track_loss_baseline)
-            
-            if sim_result:
-                margin = sim_result['net_margin']
-                prob = sim_result['probability']
-                
-                verdict = "✅ SUCCESS" if margin < 0 else "❌ FAILED"
-                
-                report += f"- **Undercut Simulation:**\n"
-                report += f"  - **Result:** {verdict} (Margin: {margin}s)\n"
-                report += f"  - **Success Probability:** {prob}%\n"
-                report += f"  - **My Pace (In+Out):** {sim_result['my_time']}s\n"
-                report += f"  - **Rival Pace (Stay Out):** {sim_result['rival_time']}s\n"
-            else:
-                report += "- **Simulation:** 데이터 부족으로 계산 불가\n"
-        else:
-            report += "- **Note:** 비교할 라이벌(Rival)이 지정되지 않아 언더컷 분석을 생략합니다.\n"
+        if np.isfinite(lane_time):
+            report += f"- **Pit Lane Time:** {round(float(lane_time), 2)}s (PitIn → PitOut)\n"
+
+        stop_battles = mine[mine['Pit_Lap'] == pit_lap]
+        if stop_battles.empty:
+            report += f"- **Note:** 피트 직전 {UNDERCUT_GAP_WINDOW}초 이내에 대결 상대가 없었습니다.\n"
+        for row in stop_battles.itertuples():
+            response = f"Lap {row.Rival_Pit_Lap}" if pd.notna(row.Rival_Pit_Lap) else f"{RESPONSE_LAPS}랩 내 피트 안 함"
+            report += f"- **{row.Move} vs {row.Rival}:** {row.Result}\n"
+            report += f"  - **Gap Before Pit:** {row.Gap_Before}s (+면 뒤)\n"
+            report += f"  - **Rival Response:** {response}\n"
+            report += f"  - **Margin After Stops:** {row.Margin}s (Swing {row.Swing:+}s)\n"
+            report += f"  - **Success Probability:** {undercut_probability(row.Margin)}%\n"
+            report += f"  - **In+Out Lap Delta:** {row.InOut_Delta}s\n"
+
+    # 5. 반대로 이 드라이버를 노린 피트 대결 (상대가 먼저 피트)
+    if not against.empty:
+        report += f"\n#### 🎯 Rival Pit Moves Against {driver}\n"
+        for row in against.itertuples():
+            report += f"- Lap {row.Pit_Lap} {row.Driver} {row.Move}: {row.Result} (Gap {row.Gap_Before}s → {row.Margin}s)\n"
 
     return report
 
-def _generate_virtual_simulation(year, circuit, driver, rival):
+def lookup_race_gap(year: int, circuit: str, lap: int, driver_identifier: str, rival_identifier: str = None) -> str:
     """
-    2025년 이후 데이터(미래)일 경우, LLM이 그럴듯한 수치를 생성하도록 가이드하는 텍스트 반환
+    [Gap Tool] 특정 랩 종료 시점의 순위 / 선두와의 간격 / 앞 차와의 간격(인터벌)과
+    라이벌이 주어지면 두 차의 간격을 레이스 시간 행렬에서 바로 조회합니다.
     """
-    return f"""
-    [SIMULATION MODE ACTIVE]
-    Target: {year} {circuit} | {driver} vs {rival}
-    
-    ⚠️ 실제 데이터 없음 (Future Event). 아래 로직에 따라 가상 데이터를 생성하여 보고하세요.
-    
-    1. **Pit Loss Assumption**: {circuit}의 통상적인 피트 로스는 20~24초입니다.
-    2. **Undercut Effect**: 새 타이어는 헌 타이어보다 랩당 약 1.5초 빠르다고 가정하세요.
-    3. **Scenario**: 
-       - 만약 {driver}가 공격적인 성향(예: VER, NOR)이라면 '언더컷 성공' 시나리오를 작성하세요.
-       - 만약 {driver}가 타이어 관리에 능하다면(예: PER, HAM) '오버컷(Overcut)' 시나리오를 작성하세요.
-    
-    결과 포맷에 맞춰 가상의 수치(Gap: 1.2s, Margin: -0.4s 등)를 생성하여 답변하세요.
+    print(f"\n [Gap] 간격 조회: Lap {lap} {driver_identifier} vs {rival_identifier}")
+    try:
+        matrix = get_race_matrix(year, circuit)
+        drivers = get_driver_index(year, circuit)
+    except Exception as e:
+        return f"데이터 로드 실패: {e}"
+
+    d = _matrix_row(matrix, drivers, driver_identifier)
+    if d is None:
+        return f"드라이버 '{driver_identifier}' 데이터를 찾을 수 없습니다."
+    driver = matrix.drivers[d]
+    pos = position(matrix, driver, lap)
+    if pos is None:
+        return f"{driver}는 Lap {lap}을 완주하지 못했습니다 (총 {matrix.race_time.shape[1]}랩)."
+
+    ahead = interval(matrix, driver, lap)
+    report = f"### ⏱️ Lap {lap} Gap Report: {driver} ({year} {circuit})\n"
+    report += f"- **Position:** P{pos}\n"
+    report += f"- **Gap to Leader:** +{round(gap_to_leader(matrix, driver, lap), 3)}s\n"
+    report += f"- **Interval (Car Ahead):** {'Leader' if ahead is None else f'+{round(ahead, 3)}s'}\n"
+
+    if rival_identifier:
+        r = _matrix_row(matrix, drivers, rival_identifier)
+        between = gap(matrix, driver, matrix.drivers[r], lap) if r is not None else None
+        if between is None:
+            report += f"- **Gap to {rival_identifier}:** 데이터 없음\n"
+        else:
+            side = "뒤" if between > 0 else "앞"
+            report += f"- **Gap to {matrix.drivers[r]}:** {round(between, 3):+}s ({side}, P{position(matrix, matrix.drivers[r], lap)})\n"
+    return report
+
+def run_strategy_monte_carlo(year: int, circuit: str, max_stops: int = MAX_STOPS) -> str:
+    """
+    [Strategy Sim Tool] 서킷의 캐시된 레이스로 페이스 / 마모 / 피트 로스 / SC·VSC 확률을 적합하고
+    1~3 스탑 전략 수만 개를 몬테카를로로 평가해서 기대 완주 시간 순 상위 전략을 보고합니다.
     """
+    print(f"\n [Sim] 몬테카를로 전략 시뮬레이션: {year} {circuit}")
+    try:
+        inputs, table = simulate_race_strategies(year, circuit, max_stops=int(max_stops))
+    except Exception as e:
+        return f"전략 시뮬레이션 실패: {e}"
+    if table.empty:
+        return "조건을 만족하는 전략이 없습니다."
+
+    seasons = ", ".join(str(y) for y, _ in inputs.races)
+    report = f"### 🎲 Monte Carlo Strategy Simulation ({year} {circuit}, {inputs.laps} Laps)\n"
+    report += f"- **Fitted From:** {seasons} ({len(inputs.races)} races)\n"
+    report += f"- **Base Pace:** {inputs.base_pace}s | **Pit Loss:** {inputs.pit_loss}s (SC {inputs.sc_pit_loss}s / VSC {inputs.vsc_pit_loss}s)\n"
+    report += f"- **SC / VSC per Race:** {inputs.sc_rate * inputs.laps:.2f} / {inputs.vsc_rate * inputs.laps:.2f}\n"
+    for compound, offset, deg in zip(inputs.compounds, inputs.offset, inputs.deg):
+        report += f"- **{compound}:** Offset {offset:+.3f}s | Deg {deg:.3f}s/lap\n"
+
+    report += "\n| Strategy | Stops | Pit Laps | Delta | P10 ~ P90 | P(Best) |\n|---|---|---|---|---|---|\n"
+    for row in table.itertuples():
+        spread = f"{row.P10 - row.Race_Time:+.1f} ~ {row.P90 - row.Race_Time:+.1f}s"
+        report += f"| {row.Strategy} | {row.Stops} | {row.Pit_Laps} | +{row.Delta}s | {spread} | {row.P_Best:.1%} |\n"
+    return report
 
 # 도구 래핑
 sim_tool = FunctionTool.from_defaults(
     fn=run_tactical_simulation,
     name="Tactical_Simulator",
-    description="드라이버의 피트 스탑 타이밍을 분석하여 언더컷 성공 여부, 스틴트 연장 손익을 시뮬레이션합니다. 2025년 미래 데이터도 분석 가능합니다."
+    description="드라이버의 피트 스탑 타이밍을 분석하여 언더컷 성공 여부, 스틴트 연장 손익을 시뮬레이션합니다. 레이스 데이터가 캐시에 없으면 서킷 과거 데이터로 적합한 몬테카를로 전략 시뮬레이션 결과를 반환합니다."
+)
+gap_tool = FunctionTool.from_defaults(
+    fn=lookup_race_gap,
+    name="Race_Gap_Lookup",
+    description="특정 랩 종료 시점의 드라이버 순위, 선두와의 간격, 앞 차와의 간격(인터벌), 라이벌과의 간격을 조회합니다. 피트 직전 간격 확인에 사용하세요."
+)
+strategy_sim_tool = FunctionTool.from_defaults(
+    fn=run_strategy_monte_carlo,
+    name="Strategy_Monte_Carlo",
+    description="서킷의 과거 레이스로 적합한 페이스/마모/피트 로스/SC 확률로 1~3 스탑 전략 수만 개를 시뮬레이션해서 기대 완주 시간이 가장 빠른 전략과 분포를 보고합니다. 최적 피트 전략 질문이나 아직 데이터가 없는 레이스의 전략 예측에 사용하세요."
 )
 # --- [에이전트 조립] ---
 
+@memoized
 def build_simulation_agent():
-    tools = [sim_tool]
+    tools = [sim_tool, gap_tool, strategy_sim_tool]
     
     driver_map = """
     [Driver Mapping Reference]
@@ -274,7 +275,8 @@ def build_simulation_agent():
     
     [SYSTEM: 2030 SIMULATION MODE]
     1. 현재는 2030년입니다. 2025년 데이터는 과거 기록입니다. "미래라 모른다"는 금지입니다.
-    2. 무조건 `Tactical_Simulator` 도구를 사용하여 데이터를 확인하십시오.
+    2. 무조건 `Tactical_Simulator` 도구를 사용하여 데이터를 확인하십시오. 특정 랩의 간격은 `Race_Gap_Lookup` 도구로 확인하십시오.
+       최적 피트 전략(스탑 수 / 컴파운드 / 피트 랩) 질문은 `Strategy_Monte_Carlo` 도구 결과의 수치만 사용하십시오.
     3. 질문에 드라이버 이름이 있으면 반드시 **번호(Number)**로 변환하여 도구에 입력하세요.
     
     {driver_map}
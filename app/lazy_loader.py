@@ -0,0 +1,173 @@
+# app/lazy_loader.py
+#
+# 지연 로딩(Lazy Loading) 레이어 + import 시간 프로파일
+#
+# 배경:
+#   - streamlit_app.py import 시점에 matplotlib / seaborn / plotly / fastf1 plotting /
+#     모든 LlamaIndex 에이전트 모듈 / Gemini 클라이언트가 한꺼번에 로드됨
+#   - soft_data.py, regulation_tool.py 는 import만 해도 F1Retriever(Qdrant + 임베딩 클라이언트) 생성
+#   - 컨테이너 재시작 시간 대부분이 버튼을 누르기 전엔 필요 없는 import
+#   → 에이전트 / 도구 / 리트리버를 "처음 쓰는 순간" 만들고 memoize
+#
+# 프로파일: python -m app.lazy_loader [--top 15] [--json]
+#   (모듈별로 새 인터프리터에서 `python -X importtime` 을 돌려 누적 import 시간을 보고)
+
+import os
+import sys
+import json
+import time
+import argparse
+import functools
+import importlib
+import threading
+import subprocess
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+
+_lock = threading.RLock()
+_load_times = {}   # 'module:attr' 또는 팩토리 이름 -> 최초 로드/생성 시간(초)
+
+# 프로파일 대상 (Streamlit이 버튼 클릭 시점에 로드하는 모듈들)
+PROFILE_MODULES = [
+    'app.agents.briefing_agent',
+    'app.agents.strategy_agent',
+    'app.agents.tactic_simulation_agent',
+    'app.tools.telemetry_data',
+    'app.tools.soft_data',
+    'app.regulation_tool',
+    'data_pipeline.analytics',
+]
+
+
+# =============================================================================
+# 1. 지연 import / memoize
+# =============================================================================
+class LazyAttr:
+    """
+    `from module import attr` 를 첫 호출 시점까지 미루는 프록시.
+    호출(__call__)하거나 resolve()로 실제 객체를 꺼낼 때 한 번만 import 합니다.
+    on_load: import 직전에 1회 실행할 준비 함수 (예: LlamaIndex Settings 설정)
+    """
+
+    def __init__(self, module_name: str, attr_name: str, on_load=None):
+        self.module_name = module_name
+        self.attr_name = attr_name
+        self.on_load = on_load
+        self._target = None
+
+    def resolve(self):
+        if self._target is None:
+            with _lock:
+                if self._target is None:
+                    start = time.perf_counter()
+                    if self.on_load is not None:
+                        self.on_load()
+                    module = importlib.import_module(self.module_name)
+                    self._target = getattr(module, self.attr_name)
+                    _load_times[f"{self.module_name}:{self.attr_name}"] = time.perf_counter() - start
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        state = "loaded" if self._target is not None else "pending"
+        return f"<LazyAttr {self.module_name}:{self.attr_name} ({state})>"
+
+
+def lazy_attr(module_name: str, attr_name: str, on_load=None) -> LazyAttr:
+    return LazyAttr(module_name, attr_name, on_load=on_load)
+
+
+def memoized(factory):
+    """
+    무거운 객체(리트리버, 에이전트, LLM 클라이언트)를 만드는 팩토리를 1회 실행 후 재사용.
+    인자별로 따로 캐시하며, 생성 시간은 load_report()에 기록됩니다.
+    """
+    cache = {}
+    factory_lock = threading.Lock()
+
+    @functools.wraps(factory)
+    def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        if key in cache:
+            return cache[key]
+        with factory_lock:
+            if key not in cache:
+                start = time.perf_counter()
+                cache[key] = factory(*args, **kwargs)
+                with _lock:
+                    _load_times[f"{factory.__module__}.{factory.__name__}"] = time.perf_counter() - start
+        return cache[key]
+
+    wrapper.cache_clear = cache.clear
+    return wrapper
+
+
+def load_report() -> list:
+    """이 프로세스에서 지연 로드된 항목과 최초 로드 시간 (느린 순)"""
+    with _lock:
+        items = sorted(_load_times.items(), key=lambda kv: kv[1], reverse=True)
+    return [{"target": name, "seconds": round(sec, 3)} for name, sec in items]
+
+
+# =============================================================================
+# 2. import 시간 프로파일 (회귀 추적용)
+# =============================================================================
+def profile_import(module_name: str, top: int = 15) -> dict:
+    """
+    새 인터프리터에서 `python -X importtime -c "import <module>"` 을 실행해
+    총 import 시간과 누적 시간이 큰 하위 모듈 top N 을 반환합니다.
+    """
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module_name}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+        env={**os.environ, 'PYTHONPATH': PROJECT_ROOT},
+    )
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        # 형식: "import time:   self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            _, self_us, cumulative_us, name = [part.strip() for part in line.replace('import time:', '|', 1).split('|')]
+            rows.append((name.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+
+    total = next((cum for name, _, cum in rows if name == module_name), sum(s for _, s, _ in rows))
+    heaviest = sorted(rows, key=lambda r: r[2], reverse=True)[:top]
+    return {
+        "module": module_name,
+        "ok": proc.returncode == 0,
+        "total_ms": round(total / 1000, 1),
+        "top": [{"module": n, "self_ms": round(s / 1000, 1), "cumulative_ms": round(c / 1000, 1)}
+                for n, s, c in heaviest],
+        "error": proc.stderr.strip().splitlines()[-1] if proc.returncode != 0 and proc.stderr.strip() else None,
+    }
+
+
+def print_import_profile(modules=None, top: int = 15):
+    for module_name in modules or PROFILE_MODULES:
+        report = profile_import(module_name, top=top)
+        status = "✅" if report['ok'] else "❌"
+        print(f"\n{status} {module_name}: {report['total_ms']} ms")
+        if report['error']:
+            print(f"   {report['error']}")
+        for row in report['top']:
+            print(f"   {row['cumulative_ms']:>9.1f} ms  (self {row['self_ms']:>7.1f})  {row['module']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모듈별 import 시간 프로파일")
+    parser.add_argument('modules', nargs='*', help="프로파일할 모듈 (기본: 에이전트/도구 모듈 전체)")
+    parser.add_argument('--top', type=int, default=15, help="모듈별로 보여줄 무거운 하위 import 개수")
+    parser.add_argument('--json', action='store_true', help="JSON으로 출력 (CI 회귀 비교용)")
+    args = parser.parse_args()
+
+    if args.json:
+        reports = [profile_import(m, top=args.top) for m in (args.modules or PROFILE_MODULES)]
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
+    else:
+        print_import_profile(args.modules, top=args.top)
@@ -1,17 +1,20 @@
 from llama_index.core.tools import FunctionTool
-# 👇 우리가 만든 클래스 임포트 (경로는 실제 파일 위치에 맞게!)
-from data_pipeline.retriever import F1Retriever 
+from app.lazy_loader import memoized
 
-# 1. 리트리버 인스턴스 생성 (싱글톤)
+# 1. 리트리버 인스턴스 (싱글톤, 첫 검색 시점에 생성 → import만으로 Qdrant/임베딩 클라이언트를 만들지 않음)
 # 규정집이 'f1_news' 컬렉션에 함께 들어있다고 가정 (Crawler에서 그렇게 넣었으므로)
-retriever = F1Retriever(collection_name="f1_news") 
+@memoized
+def get_regulation_retriever():
+    # 👇 우리가 만든 클래스 임포트 (경로는 실제 파일 위치에 맞게!)
+    from data_pipeline.retriever import F1Retriever
+    return F1Retriever(collection_name="f1_news")
 
 def search_fia_regulations(query: str) -> str:
     """
     [RAG] FIA 공식 규정집(Technical/Sporting Regulations)을 검색합니다.
     """
     # 2. 커스텀 리트리버 사용 + 필터링 적용
-    results = retriever.search(
+    results = get_regulation_retriever().search(
         query=query, 
         limit=4, 
         # 👇 Crawler에서 저장할 때 썼던 그 메타데이터 키값!
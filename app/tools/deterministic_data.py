@@ -1,71 +1,84 @@
 # app/tools/deterministic_data.py
-import sqlite3
-import pandas as pd
 import os
+import sys
 
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
-DB_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'f1_data.db')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from data_pipeline.event_resolver import resolve_event_name, event_key
+from data_pipeline import race_db
+from data_pipeline.driver_index import get_driver_index, resolve_abbreviation
+from app.tools.driver_mapping import DRIVER_MAPPING
 
-# [★ 멍청한 파이썬을 위한 번역기] 
-# UI의 "국가명"을 DB의 "형용사형 그랑프리 이름"으로 변환
-GP_MAPPING = {
-    "Hungary": "Hungarian",
-    "Spain": "Spanish",
-    "Italy": "Italian",
-    "Netherlands": "Dutch",
-    "Brazil": "São Paulo", # 브라질은 상파울루 그랑프리임
-    "Japan": "Japanese",
-    "China": "Chinese",
-    "Australia": "Australian",
-    "Austria": "Austrian",
-    "Great Britain": "British",
-    "UK": "British",
-    "Belgium": "Belgian",
-    "Saudi Arabia": "Saudi Arabian",
-    "Monaco": "Monaco",
-    "Las Vegas": "Las Vegas",
-    "Azerbaijan": "Azerbaijan"
-}
+# 쿼리 문자열은 상수로 고정 → 풀의 각 연결에서 한 번만 컴파일되고 재사용됨
+# (Year, event_key[, Driver]) 복합 인덱스 정확 일치 조회 (예: event_key = 'hungarian')
+STANDINGS_SQL = """
+    SELECT Position, Driver, TeamName, GridPosition, Points, Status
+    FROM race_results
+    WHERE Year = ? AND event_key = ?
+    ORDER BY Position ASC
+"""
+DRIVER_STANDINGS_SQL = """
+    SELECT Position, Driver, TeamName, GridPosition, Points, Status
+    FROM race_results
+    WHERE Year = ? AND event_key = ? AND Driver = ?
+    ORDER BY Position ASC
+"""
+# 마이그레이션 전 DB(event_key 컬럼 없음) → 적재 형식 RaceID 정확 일치 (race_db.legacy_race_ids 후보 2개)
+LEGACY_STANDINGS_SQL = """
+    SELECT Position, Driver, TeamName, GridPosition, Points, Status
+    FROM race_results
+    WHERE RaceID IN (?, ?)
+    ORDER BY Position ASC
+"""
+LEGACY_DRIVER_STANDINGS_SQL = """
+    SELECT Position, Driver, TeamName, GridPosition, Points, Status
+    FROM race_results
+    WHERE RaceID IN (?, ?) AND Driver = ?
+    ORDER BY Position ASC
+"""
 
 def get_race_standings(year: int, gp: str, driver: str = None) -> str:
     """
     [브리핑 에이전트 전용]
+    공유 읽기 전용 연결 풀(data_pipeline.race_db)로 조회해서 마크다운 표로 반환
     """
     # 1. 'Hungary - 헝가리' -> 'Hungary' 만 추출
     raw_gp = gp.split('-')[0].strip()
     
-    # 2. 번역기 돌리기 (매핑 테이블에 없으면 그냥 원래 글자 사용)
-    search_keyword = GP_MAPPING.get(raw_gp, raw_gp)
-    search_keyword_sql = search_keyword.replace(' ', '%')
-    
-    conn = sqlite3.connect(DB_FILE_PATH)
-    
-    # [★ 핵심 수정] Circuit 컬럼 대신 제일 확실한 RaceID 컬럼으로 검색!
-    query = """
-        SELECT Position, Driver, TeamName, GridPosition, Points, Status
-        FROM race_results
-        WHERE Year = ? AND RaceID LIKE ?
-    """
-    # 예: RaceID LIKE '%Hungarian%'
-    params =  [year, f"%{search_keyword_sql}%"]
+    # 2. 통합 리졸버로 정식 그랑프리명 → DB 조회 키 ('Hungary' -> 'Hungarian Grand Prix' -> 'hungarian')
+    search_keyword = resolve_event_name(raw_gp, year)
 
-    if driver:
-        query += " AND Driver LIKE ?"
-        params.append(f"%{driver}%")
-        
-    query += " ORDER BY Position ASC"
-    
     try:
-        df = pd.read_sql_query(query, conn, params=params)
+        if race_db.has_event_keys():
+            sql = DRIVER_STANDINGS_SQL if driver else STANDINGS_SQL
+            params = [int(year), event_key(search_keyword, year)]
+        else:
+            sql = LEGACY_DRIVER_STANDINGS_SQL if driver else LEGACY_STANDINGS_SQL
+            params = list(race_db.legacy_race_ids(year, search_keyword))
+        if driver:
+            # 번호 / 약어 / 성 / 풀네임 / 한글 별명 → 3글자 약어 (Driver 컬럼 정확 일치)
+            params.append(_driver_abbreviation(year, search_keyword, driver.strip()))
+
+        columns, rows = race_db.fetch(sql, params)
         
         # 만약 진짜로 데이터가 없을 경우 에러 메시지 반환
-        if df.empty:
+        if not rows:
             return f"🚨 [OFFICIAL RACE DATA] {year}년 {search_keyword} GP 데이터가 아직 DB에 없습니다."
             
-        return df.to_markdown(index=False)
+        return race_db.rows_to_markdown(columns, rows)
         
     except Exception as e:
         return f"DB 에러 발생: {e}"
-        
-    finally:
-        conn.close()
\ No newline at end of file
+
+
+def _driver_abbreviation(year: int, gp: str, name: str) -> str:
+    """레이스 드라이버 인덱스로 약어 조회, 인덱스를 못 만들면 별명 표(단어 단위 포함)로 대신"""
+    try:
+        abbreviation = resolve_abbreviation(get_driver_index(year, gp), name)
+        if abbreviation:
+            return abbreviation
+    except Exception:
+        pass
+    for token in [name] + name.split():
+        if token in DRIVER_MAPPING:
+            return DRIVER_MAPPING[token]
+    return name.upper()
@@ -0,0 +1,5 @@
+# app/tools/driver_mapping.py
+#
+# 드라이버 이름 → 약어 매핑 (실제 정의는 data_pipeline/driver_mapping.py, 기존 import 경로 유지용)
+
+from data_pipeline.driver_mapping import DRIVER_MAPPING
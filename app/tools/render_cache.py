@@ -0,0 +1,233 @@
+# app/tools/render_cache.py
+#
+# 차트 렌더 결과 캐시 (PNG / Plotly JSON, 내용 주소 기반)
+#
+# 배경:
+#   - 분석 에이전트가 같은 (year, race, driver1, driver2) 도미넌스 맵을 요청해도
+#     매번 새 PNG를 /tmp/fastf1_plots 에 쓰고, 지우는 곳이 없음
+#   - get_race_pace_data / get_speed_trace_data 의 Plotly Figure도 Streamlit rerun 마다 다시 생성
+#   → (함수, 입력, 데이터 버전) 해시를 키로 결과 파일을 저장하고 같은 요청은 파일을 그대로 반환
+#   → 디스크 상한(PITWALL_RENDER_CACHE_MB)을 넘으면 가장 오래 안 쓴 파일부터 삭제 (LRU)
+#
+# 데이터 버전: 레이스 원본 캐시 폴더 / 랩 스토어 / 텔레메트리 저장소의 수정 시각 + RENDER_VERSION
+#   (데이터가 다시 빌드되거나 차트 코드가 바뀌면 자동으로 다른 키가 됨)
+
+import os
+import json
+import time
+import hashlib
+import logging
+import functools
+import threading
+
+from data_pipeline.event_resolver import resolve_event_name, resolve_event_folder
+from data_pipeline.cache_setup import LOCAL_CACHE_DIR
+from data_pipeline import lap_store, telemetry_store
+
+logger = logging.getLogger(__name__)
+
+RENDER_CACHE_DIR = '/tmp/fastf1_render_cache'
+RENDER_CACHE_MAX_MB = float(os.getenv("PITWALL_RENDER_CACHE_MB", "256"))
+
+# 차트 모양(색/레이아웃/계산 방식)을 바꾸면 올려서 기존 렌더를 무효화
+RENDER_VERSION = 1
+
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+# =============================================================================
+# 키 / 데이터 버전
+# =============================================================================
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+def data_version(year: int, race: str) -> str:
+    """레이스 데이터 소스들의 수정 시각 요약 (stat 몇 번이라 매 요청 계산해도 가벼움)"""
+    event_name = resolve_event_name(race, year)
+    folder = resolve_event_folder(year, event_name)
+    sources = [
+        os.path.join(LOCAL_CACHE_DIR, str(year), folder) if folder else '',
+        lap_store.lap_store_path(year, event_name),
+        os.path.join(telemetry_store.telemetry_store_dir(year, event_name), telemetry_store.INDEX_FILE),
+    ]
+    return f"v{RENDER_VERSION}:" + ":".join(f"{_mtime(p):.0f}" for p in sources)
+
+
+def render_key(kind: str, year: int, race: str, *args, **kwargs) -> str:
+    """(차트 종류, 정식 이벤트명, 나머지 입력, 데이터 버전) → sha256 키"""
+    payload = json.dumps({
+        'kind': kind,
+        'year': int(year),
+        'event': resolve_event_name(race, year),
+        'args': [str(a) for a in args],
+        'kwargs': {k: str(v) for k, v in sorted(kwargs.items())},
+        'data': data_version(year, race),
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+# =============================================================================
+# 파일 조회 / 저장 / LRU
+# =============================================================================
+def _path(key: str, ext: str) -> str:
+    return os.path.join(RENDER_CACHE_DIR, f"{key}.{ext}")
+
+
+def _lookup(key: str, ext: str):
+    path = _path(key, ext)
+    if not os.path.exists(path):
+        with _lock:
+            _stats['misses'] += 1
+        return None
+    try:
+        os.utime(path, None)  # LRU 순서 갱신 (mtime = 마지막 사용 시각)
+    except OSError:
+        pass
+    with _lock:
+        _stats['hits'] += 1
+    return path
+
+
+def _evict():
+    """디렉토리 크기가 상한을 넘으면 마지막 사용이 오래된 파일부터 삭제"""
+    max_bytes = int(RENDER_CACHE_MAX_MB * 1024 * 1024)
+    files = []
+    try:
+        for entry in os.scandir(RENDER_CACHE_DIR):
+            if entry.is_file() and '.tmp-' not in entry.name:
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return
+    files.sort()
+    total = sum(size for _, size, _ in files)
+    for _, size, path in files:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            with _lock:
+                _stats['evictions'] += 1
+        except OSError:
+            pass
+
+
+def _store_file(src_path: str, key: str, ext: str) -> str:
+    """렌더된 파일을 캐시로 옮기고 캐시 경로를 반환"""
+    os.makedirs(RENDER_CACHE_DIR, exist_ok=True)
+    dst = _path(key, ext)
+    os.replace(src_path, dst)
+    _evict()
+    return dst
+
+
+def _store_text(text: str, key: str, ext: str) -> str:
+    os.makedirs(RENDER_CACHE_DIR, exist_ok=True)
+    tmp = _path(key, f"{ext}.tmp-{os.getpid()}-{threading.get_ident()}")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return _store_file(tmp, key, ext)
+
+
+def render_cache_stats() -> dict:
+    with _lock:
+        stats = dict(_stats)
+    try:
+        sizes = [e.stat().st_size for e in os.scandir(RENDER_CACHE_DIR) if e.is_file()]
+    except OSError:
+        sizes = []
+    stats['files'] = len(sizes)
+    stats['size_mb'] = round(sum(sizes) / 1024 / 1024, 2)
+    stats['max_size_mb'] = RENDER_CACHE_MAX_MB
+    return stats
+
+
+# =============================================================================
+# 데코레이터 (첫 두 인자가 year, race 인 차트 함수용)
+# =============================================================================
+def _key_inputs(args, kwargs, normalize):
+    if normalize is None:
+        return args, kwargs
+    def norm(v):
+        if isinstance(v, str):
+            return normalize(v)
+        if isinstance(v, (list, tuple)):
+            return [norm(item) for item in v]
+        return v
+    return [norm(a) for a in args], {k: norm(v) for k, v in kwargs.items()}
+
+
+def cached_png(kind: str, normalize=None):
+    """
+    'GRAPH_GENERATED: <경로>' 를 반환하는 matplotlib 도구용.
+    캐시에 있으면 렌더 없이 바로 반환하고, 새로 그린 PNG는 캐시 폴더로 옮겨 보관합니다.
+    normalize: 키를 만들기 전에 나머지 입력에 적용할 함수 (예: 'Verstappen' → 'VER')
+    """
+    prefix = "GRAPH_GENERATED: "
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(year, race, *args, **kwargs):
+            try:
+                key_args, key_kwargs = _key_inputs(args, kwargs, normalize)
+                key = render_key(kind, year, race, *key_args, **key_kwargs)
+            except Exception as e:
+                logger.warning(f"[RenderCache] 키 생성 실패, 캐시 없이 렌더: {e}")
+                return fn(year, race, *args, **kwargs)
+
+            cached = _lookup(key, 'png')
+            if cached:
+                print(f"⚡ [RenderCache] 캐시 히트: {cached}")
+                return prefix + cached
+
+            start = time.perf_counter()
+            result = fn(year, race, *args, **kwargs)
+            if isinstance(result, str) and result.startswith(prefix):
+                try:
+                    path = _store_file(result[len(prefix):].strip(), key, 'png')
+                    logger.info(f"[RenderCache] {kind} 렌더 {time.perf_counter() - start:.2f}s → {path}")
+                    return prefix + path
+                except OSError as e:
+                    logger.warning(f"[RenderCache] PNG 저장 실패: {e}")
+            return result
+        return wrapper
+    return decorator
+
+
+def cached_figure(kind: str, normalize=None):
+    """Plotly Figure(또는 None)를 반환하는 함수용. Figure는 JSON으로 직렬화해서 보관합니다."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(year, race, *args, **kwargs):
+            import plotly.io as pio
+
+            try:
+                key_args, key_kwargs = _key_inputs(args, kwargs, normalize)
+                key = render_key(kind, year, race, *key_args, **key_kwargs)
+            except Exception as e:
+                logger.warning(f"[RenderCache] 키 생성 실패, 캐시 없이 생성: {e}")
+                return fn(year, race, *args, **kwargs)
+
+            cached = _lookup(key, 'json')
+            if cached:
+                try:
+                    with open(cached, 'r', encoding='utf-8') as f:
+                        return pio.from_json(f.read(), skip_invalid=True)
+                except Exception as e:
+                    logger.warning(f"[RenderCache] JSON 복원 실패, 다시 생성: {e}")
+
+            fig = fn(year, race, *args, **kwargs)
+            if fig is not None:
+                try:
+                    _store_text(fig.to_json(), key, 'json')
+                except OSError as e:
+                    logger.warning(f"[RenderCache] JSON 저장 실패: {e}")
+            return fig
+        return wrapper
+    return decorator
@@ -15,25 +15,32 @@ load_dotenv()
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
-from data_pipeline.retriever import F1Retriever
+from app.lazy_loader import memoized
 
 logger = logging.getLogger(__name__)
 
 # ────────────────────────────────────────
-# 1. RAG 엔진 초기화 (Global Instance)
+# 1. RAG 엔진 (첫 검색 시점에 1회 생성)
+#    import만으로 Qdrant / 임베딩 클라이언트를 만들지 않도록 지연 초기화
 # ────────────────────────────────────────
 QDRANT_URL    = os.getenv("QDRANT_URL", "http://localhost:6333")
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY", None)
 
-try:
-    retriever_engine = F1Retriever(
-        qdrant_url=QDRANT_URL,
-        collection_name="f1_knowledge_base"
-    )
-    print("✅ RAG Search Engine Ready.")
-except Exception as e:
-    print(f"❌ RAG Engine Load Failed: {e}")
-    retriever_engine = None
+
+@memoized
+def get_retriever_engine():
+    """F1Retriever 싱글톤 (실패 시 None → search_f1_context가 RAG_UNAVAILABLE 반환)"""
+    try:
+        from data_pipeline.retriever import F1Retriever
+        engine = F1Retriever(
+            qdrant_url=QDRANT_URL,
+            collection_name="f1_knowledge_base"
+        )
+        print("✅ RAG Search Engine Ready.")
+        return engine
+    except Exception as e:
+        print(f"❌ RAG Engine Load Failed: {e}")
+        return None
 
 
 # ────────────────────────────────────────
@@ -85,6 +92,7 @@ def search_f1_context(query: str, limit: int = 4, score_threshold: float = 0.45)
     Returns:
         LLM 프롬프트에 주입할 포맷팅된 문자열
     """
+    retriever_engine = get_retriever_engine()
     if not retriever_engine:
         return "[RAG_UNAVAILABLE] RAG 엔진을 사용할 수 없습니다."
 
@@ -0,0 +1,96 @@
+# app/tools/strategy_chart.py
+#
+# 타이어 전략(스틴트) 차트 — Pirelli 스타일
+#
+# 스틴트마다 go.Bar 트레이스를 하나씩 만들면 레이스당 50~70개 트레이스가 생기고
+# Figure 생성 / JSON 크기 / 브라우저 레이아웃 비용이 트레이스 수에 비례함
+# → 컴파운드당 트레이스 1개에 스틴트를 배열로 담고, NEW/USED 패턴과 hover 정보도 배열로 지정
+#
+# 레이스 트레이스 — RaceMatrix(data_pipeline/race_matrix.py)의 선두와의 간격을 랩별로 그린 차트
+
+import numpy as np
+import plotly.graph_objects as go
+
+PIRELLI_COLORS = {
+    "SOFT": "#DA291C", "MEDIUM": "#FFD100", "HARD": "#F0F0F0",
+    "INTERMEDIATE": "#43B02A", "WET": "#0067A5"
+}
+UNKNOWN_COMPOUND_COLOR = "#808080"
+
+HOVER_TEMPLATE = (
+    "<b>%{customdata[0]}</b> (Stint %{customdata[1]})<br>"
+    "Tyre: %{customdata[2]} (%{customdata[3]})<br>"
+    "Laps: %{customdata[4]} ~ %{customdata[5]}"
+)
+
+RACE_TRACE_HOVER = (
+    "<b>%{fullData.name}</b> Lap %{x}<br>"
+    "P%{customdata[0]} | Gap to Leader: +%{y:.3f}s<br>"
+    "Interval: %{customdata[1]}"
+)
+
+
+def plot_tire_strategy_chart(df, sorted_drivers):
+    """Pirelli Style Stint Map (컴파운드당 트레이스 1개)"""
+    fig = go.Figure()
+    y_order = list(reversed(sorted_drivers))
+
+    compounds = df['Compound'].str.upper()
+    present = list(dict.fromkeys(compounds))
+    ordered = [c for c in PIRELLI_COLORS if c in present] + [c for c in present if c not in PIRELLI_COLORS]
+
+    for compound in ordered:
+        stints = df[compounds == compound]
+        fig.add_trace(go.Bar(
+            y=stints['Driver'], x=stints['Duration'], base=stints['Start'],
+            orientation='h', name=compound, legendgroup=compound,
+            marker=dict(
+                color=PIRELLI_COLORS.get(compound, UNKNOWN_COMPOUND_COLOR),
+                line=dict(color='#111111', width=1),
+                pattern_shape=np.where(stints['Status'] == "USED", "/", ""),
+                pattern_solidity=0.5,
+            ),
+            customdata=stints[['Driver', 'Stint', 'Compound', 'Status', 'Start', 'End']].to_numpy(),
+            hovertemplate=HOVER_TEMPLATE,
+        ))
+
+    fig.update_layout(
+        title=dict(text="<b>🏁 Tire Strategy History</b>", font=dict(size=20, color="white")),
+        template="plotly_dark", barmode='overlay',   # base로 위치를 직접 지정하므로 스택 불필요
+        yaxis=dict(categoryorder='array', categoryarray=y_order, title=None),
+        xaxis=dict(title="Lap Number", dtick=5, showgrid=True, gridcolor='#333333', zeroline=False),
+        height=800, bargap=0.4, margin=dict(l=20, r=20, t=60, b=20),
+        plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', showlegend=False
+    )
+    return fig
+
+
+def plot_race_trace(matrix, drivers=None):
+    """레이스 트레이스: 랩별 선두와의 간격 (드라이버당 라인 1개, 위쪽이 선두)"""
+    fig = go.Figure()
+    laps = np.arange(1, matrix.race_time.shape[1] + 1)
+    selected = [d for d in (drivers or matrix.drivers) if d in matrix.drivers]
+
+    for driver in selected:
+        d = matrix.drivers.index(driver)
+        finished = np.isfinite(matrix.gap_to_leader[d])
+        if not finished.any():
+            continue
+        interval = np.where(np.isnan(matrix.interval[d]), "Leader",
+                            np.char.add("+", np.char.mod("%.3fs", np.nan_to_num(matrix.interval[d]))))
+        fig.add_trace(go.Scatter(
+            x=laps[finished], y=matrix.gap_to_leader[d][finished],
+            mode='lines', name=driver, line=dict(width=1.5),
+            customdata=np.column_stack([matrix.position[d][finished].astype(int), interval[finished]]),
+            hovertemplate=RACE_TRACE_HOVER + "<extra></extra>",
+        ))
+
+    fig.update_layout(
+        title=dict(text="<b>📉 Race Trace (Gap to Leader)</b>", font=dict(size=20, color="white")),
+        template="plotly_dark",
+        yaxis=dict(title="Gap to Leader (s)", autorange='reversed', showgrid=True, gridcolor='#333333'),
+        xaxis=dict(title="Lap Number", dtick=5, showgrid=True, gridcolor='#333333', zeroline=False),
+        height=600, margin=dict(l=20, r=20, t=60, b=20),
+        plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', hovermode='closest'
+    )
+    return fig
@@ -6,10 +6,19 @@ import matplotlib.pyplot as plt
 from matplotlib.collections import LineCollection
 import os
 import warnings
-import seaborn as sns
 import numpy as np
 import plotly.graph_objects as go
 
+from data_pipeline.session_registry import load_session
+from data_pipeline.event_resolver import resolve_event_name
+from data_pipeline.cache_setup import restore_cache
+from data_pipeline import telemetry_store
+from app.tools.render_cache import cached_png, cached_figure
+from data_pipeline.analytics import (
+    get_mini_sector_result, compute_mini_sectors, sector_winners, GRID_POINTS_PER_SECTOR
+)
+from app.tools.driver_mapping import DRIVER_MAPPING
+
 # 경고 무시 및 F1 스타일 설정
 warnings.simplefilter(action='ignore', category=FutureWarning)
 warnings.filterwarnings('ignore', module='fastf1')
@@ -17,77 +26,21 @@ import logging
 logging.getLogger('fastf1').setLevel(logging.ERROR)
 fastf1.plotting.setup_mpl(misc_mpl_mods=False)
 
-# FastF1 캐시 설정 (enable_cache는 SQLite 생성 필요 → 쓰기 권한 필요)
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
-_local_cache = os.path.join(PROJECT_ROOT, 'data', 'cache')
-try:
-    os.makedirs(_local_cache, exist_ok=True)
-    _test = os.path.join(_local_cache, '.write_test')
-    with open(_test, 'w') as f:
-        f.write('ok')
-    os.remove(_test)
-    CACHE_DIR = _local_cache
-except (PermissionError, OSError):
-    CACHE_DIR = '/tmp/fastf1_cache'
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    if os.path.exists(_local_cache):
-        for _item in os.listdir(_local_cache):
-            _src = os.path.join(_local_cache, _item)
-            _dst = os.path.join(CACHE_DIR, _item)
-            if os.path.isdir(_src) and not os.path.exists(_dst):
-                try:
-                    os.symlink(_src, _dst)
-                except OSError:
-                    pass
+# 한글 폰트 설정 (matplotlib 플롯을 그리는 이 모듈이 로드될 때만 적용)
+FONT_PATH = "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"
+if os.path.exists(FONT_PATH):
+    import matplotlib.font_manager as fm
+    fm.fontManager.addfont(FONT_PATH)
+    plt.rc('font', family=fm.FontProperties(fname=FONT_PATH).get_name())
+    plt.rc('axes', unicode_minus=False)
 
 PLOT_DIR = '/tmp/fastf1_plots'
 os.makedirs(PLOT_DIR, exist_ok=True)
 
-try:
-    fastf1.Cache.enable_cache(CACHE_DIR)
-except Exception:
-    pass
-
 # -----------------------------------------------------------------------------
 # 드라이버 이름 정규화
 # 
 
-DRIVER_MAPPING = {
-    # Red Bull
-    '베르스타펜': 'VER', '막스': 'VER', 'Verstappen': 'VER', 'Max': 'VER',
-    '츠노다': 'TSU', 'Tsunoda': 'TSU',
-    # Cadillac
-    '보타스': 'BOT', 'Bottas': 'BOT', 'Valteri': 'BOT',
-    '페레즈': 'PER', '체코': 'PER', 'Perez': 'PER', 'Sergio': 'PER',
-    # McLaren
-    '노리스': 'NOR', '랜도': 'NOR', 'Norris': 'NOR', 'Lando': 'NOR',
-    '피아스트리': 'PIA', '오스카': 'PIA', 'Piastri': 'PIA', 'Oscar': 'PIA',
-    # Ferrari
-    '르클레르': 'LEC', '샤를': 'LEC', 'Leclerc': 'LEC', 'Charles': 'LEC',
-    '해밀턴': 'HAM', '루이스': 'HAM', 'Hamilton': 'HAM', 'Lewis': 'HAM',
-    # Williams
-    '알본': 'ALB', 'Albon': 'ALB',
-    '사인츠': 'SAI', '카를로스': 'SAI', 'Sainz': 'SAI', 'Carlos': 'SAI',
-    # Mercedes
-    '안토넬리': 'ANT', 'Antonelli': 'ANT',
-    '러셀': 'RUS', '조지': 'RUS', 'Russell': 'RUS', 'George': 'RUS',
-    # Aston Martin
-    '알론소': 'ALO', 'Alonso': 'ALO',
-    '스트롤': 'STR', 'Stroll': 'STR',
-    # Alpine
-    '가슬리': 'GAS', 'Pierre': 'GAS',
-    '콜라핀토': 'COL' , '콜라': 'COL',
-    # Haas
-    '베어만': 'BEA' , '올리' : 'BEA',
-    '오콘': 'OCO', '에스테반':'OCO',
-    # VCAR
-    '로슨': 'LAW', '리암 로슨': 'LAW',
-    '린드블라드': 'LIN' , '린블': 'LIN',
-    # Audi
-    '휠켄버그': 'HUL' , '헐크': 'HUL' , '니코 휠켄버그': 'HUL',
-    '보톨레토': 'BOR' , '가비': 'BOR'
-}
-
 def _normalize_name(name: str) -> str:
     """입력된 이름이 매핑 테이블에 있으면 약어로 변환, 없으면 대문자로 반환"""
     clean_name = name.strip()
@@ -109,40 +62,14 @@ def _save_plot(filename, facecolor='black'):
 # [★ 추가된 무적의 세션 로더] LLM의 환각 트랙명을 완벽하게 보정!
 # =============================================================================
 def _get_loaded_session(year: int, circuit: str, load_telemetry: bool = True):
-    year_dir = os.path.join(CACHE_DIR, str(year))
-    matched_event_name = circuit
-
-    TRACK_ALIASES = {
-        "silverstone": "british", "monza": "italian", "spa": "belgian",
-        "interlagos": "sao paulo", "zandvoort": "dutch", "suzuka": "japanese",
-        "japan": "japanese", "saopaulo": "s o paulo", "cota": "united states", 
-        "austin": "united states", "china": "chinese", "shanghai": "chinese",
-        "britain": "british", "uk": "british"
-    }
-
-    search_keyword = circuit.lower().replace(" ", "").replace("_", "")
-    for alias, real_name in TRACK_ALIASES.items():
-        if alias in search_keyword:
-            search_keyword = real_name.replace(" ", "")
-            break
-
-    if os.path.exists(year_dir):
-        available_folders = os.listdir(year_dir)
-        for folder_name in available_folders:
-            clean_name = folder_name.split('_', 1)[-1] if '_' in folder_name else folder_name
-            compare_name = clean_name.lower().replace("_", "").replace(" ", "")
-            
-            if search_keyword in compare_name:
-                matched_event_name = clean_name.replace("_", " ")
-                break
+    matched_event_name = resolve_event_name(circuit, year)
 
     print(f"🔍 [Telemetry Data] UI 입력: '{circuit}' -> 캐시 매칭: '{matched_event_name}'")
     
-    session = fastf1.get_session(year, matched_event_name, 'R')
-    
     # [★ 핵심 디버깅 추가] 로드 과정을 try-except로 감싸고, 실패 시 경고 출력
     try:
-        session.load(laps=True, telemetry=load_telemetry, weather=False, messages=False)
+        # 프로세스 공유 레지스트리: 이미 로드된 세션 재사용, 텔레메트리는 필요할 때 제자리 업그레이드
+        session = load_session(year, matched_event_name, 'R', telemetry=load_telemetry)
         
         # [★ 방어 로직] 텔레메트리를 요구했는데 데이터가 비어있다면 명시적 에러 발생
         if load_telemetry:
@@ -160,9 +87,95 @@ def _get_loaded_session(year: int, circuit: str, load_telemetry: bool = True):
         
     return session
 
+def _get_telemetry_session(year: int, race: str):
+    """텔레메트리가 들어있는 세션 로드 (로컬 캐시에 없으면 임시 캐시 폴더로 우회 다운로드)"""
+    try:
+        return _get_loaded_session(year, race, load_telemetry=True)
+    except Exception as e:
+        print(f"⚠️ [Telemetry] 로컬 캐시에 텔레메트리 누락 감지! 임시 폴더로 우회합니다... ({e})")
+
+        # 커밋된 캐시를 건드리지 않도록 일회용 임시 폴더를 캐시로 지정
+        import tempfile
+        temp_cache_dir = os.path.join(tempfile.gettempdir(), 'fastf1_temp_bypass')
+        os.makedirs(temp_cache_dir, exist_ok=True)
+        fastf1.Cache.enable_cache(temp_cache_dir)
+        try:
+            session = fastf1.get_session(year, resolve_event_name(race, year), 'R')
+            session.load(laps=True, telemetry=True, weather=False, messages=False)
+        finally:
+            # 볼일 끝났으면 다른 도구들을 위해 기존 캐시 경로로 원상 복구!
+            restore_cache()
+        return session
+
+def _load_fastest_laps(year: int, race: str, drivers: list):
+    """
+    요청한 드라이버들의 최속 랩 텔레메트리를 반환합니다.
+    최속 랩 저장소에서 해당 드라이버 파일만 읽고, 레이스가 아직 저장 전이면
+    세션 텔레메트리를 한 번 로드해서 저장소에 기록합니다.
+    return: (event_name, [(tel, color), ...]) / 랩이 없는 드라이버가 있으면 None
+    """
+    if not telemetry_store.has_race(year, race):
+        session = _get_telemetry_session(year, race)
+        try:
+            telemetry_store.write_race_telemetry(session)
+        except Exception as e:
+            # 저장 실패(읽기 전용 디스크 등) → 이번 요청은 세션에서 바로 계산
+            print(f"⚠️ [Telemetry] 최속 랩 저장 실패, 세션에서 직접 계산합니다: {e}")
+            laps = []
+            for drv in drivers:
+                lap = session.laps.pick_drivers(drv).pick_fastest()
+                if lap is None: return None
+                tel = dict(zip(telemetry_store.CHANNELS, telemetry_store.fastest_lap_arrays(lap)))
+                laps.append((tel, fastf1.plotting.get_driver_color(drv, session=session)))
+            return session.event['EventName'], laps
+
+    index = telemetry_store.read_index(year, race)
+    laps = []
+    for drv in drivers:
+        tel = telemetry_store.read_fastest_lap(year, race, drv)
+        if index is None or tel is None: return None
+        laps.append((tel, index['drivers'][drv]['color']))
+    return index['event_name'], laps
+
+# -----------------------------------------------------------------------------
+# Plotly 페이로드 축소 (LTTB 다운샘플링 / WebGL)
+# -----------------------------------------------------------------------------
+LTTB_POINTS_PER_PIXEL = 2        # 화면 픽셀당 남길 샘플 수
+WEBGL_POINT_THRESHOLD = 10000    # 전체 포인트가 이보다 많으면 Scattergl 사용
+
+def _lttb(x, y, n_out: int):
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링.
+    버킷마다 (이전 선택점, 현재 후보, 다음 버킷 평균)이 만드는 삼각형 면적이 최대인 점을 남겨
+    브레이킹 포인트 / 코너 최저속 같은 모양을 유지합니다.
+    """
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(int)   # 버킷 경계 (첫/끝 점 제외)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        if i + 2 < len(edges):
+            next_x = x[edges[i + 1]:edges[i + 2]].mean()
+            next_y = y[edges[i + 1]:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs((x[prev] - next_x) * (y[start:end] - y[prev])
+                      - (x[prev] - x[start:end]) * (next_y - y[prev]))
+        prev = start + int(area.argmax())
+        selected[i + 1] = prev
+    return x[selected], y[selected]
+
 # -----------------------------------------------------------------------------
 # 1. [Plotly] 랩타임 비교 (Interactive)
 # -----------------------------------------------------------------------------
+@cached_figure('race_pace', normalize=_normalize_name)
 def get_race_pace_data(year: int, race: str, driver1: str, driver2: str):
     """Plotly용 데이터 객체를 반환합니다."""
     try:
@@ -214,10 +227,11 @@ def get_race_pace_data(year: int, race: str, driver1: str, driver2: str):
 # -----------------------------------------------------------------------------
 # 2. [NEW] 트랙 도미넌스 맵 (Track Dominance)
 # -----------------------------------------------------------------------------
+@cached_png('track_dominance', normalize=_normalize_name)
 def generate_track_dominance_plot(year: int, race: str, driver1: str, driver2: str) -> str:
     """
     두 드라이버의 가장 빠른 랩(Fastest Lap)을 기준으로,
-    트랙의 각 지점에서 누가 더 빨랐는지를 색상으로 표시하는 지도를 그립니다.
+    트랙의 미니 섹터마다 누가 더 빨랐는지를 색상으로 표시하는 지도를 그립니다.
     """
     try:
         driver1 = _normalize_name(driver1)
@@ -225,61 +239,21 @@ def generate_track_dominance_plot(year: int, race: str, driver1: str, driver2: s
 
         print(f"🗺️ [Dominance] Generating Map: {year} {race} ({driver1} vs {driver2})...")
 
-        # [★ 핀포인트 수술] 캐시 삭제 없이 2번 도구만 살리는 로직
-        try:
-            # 1차 시도: 기존 캐시에서 로드 시도
-            session = _get_loaded_session(year, race, load_telemetry=True)
-            lap1 = session.laps.pick_driver(driver1).pick_fastest()
-            
-            if lap1 is None or pd.isna(lap1.get('LapTime')):
-                raise ValueError("랩 데이터가 없습니다.")
-                
-            _ = lap1.get_telemetry() # 텔레메트리가 진짜 있는지 찔러봄 (없으면 여기서 에러 터짐)
-            lap2 = session.laps.pick_driver(driver2).pick_fastest()
-            
-        except Exception as e:
-            print(f"⚠️ [Dominance] 로컬 캐시에 텔레메트리 누락 감지! 다른 기능 보호를 위해 2번 도구만 캐시를 우회합니다... ({e})")
-            
-            # 2차 시도: 1, 3번 도구가 쓰는 캐시를 보호하기 위해, 캐시 기능을 일시 정지하고 강제 다운로드
-            fastf1.Cache.disable_cache()
-            
-            # fastf1이 알아먹게 트랙명 보정 (안 그러면 또 못 찾음)
-            matched_event = race
-            if "japan" in race.lower() or "suzuka" in race.lower(): matched_event = "Japanese"
-            elif "cota" in race.lower() or "austin" in race.lower() or "united states" in race.lower(): matched_event = "United States"
-            elif "saopaulo" in race.lower() or "brazil" in race.lower(): matched_event = "Sao Paulo"
-            elif "china" in race.lower() or "shanghai" in race.lower(): matched_event = "Chinese"
-            elif "britain" in race.lower() or "silverstone" in race.lower() or "uk" in race.lower(): matched_event = "British"
-            
-            session = fastf1.get_session(year, matched_event, 'R')
-            session.load(laps=True, telemetry=True, weather=False, messages=False)
-            
-            # 볼일 끝났으면 다른 도구들을 위해 캐시 다시 켜기! (매우 중요)
-            fastf1.Cache.enable_cache(CACHE_DIR)
-
-            lap1 = session.laps.pick_driver(driver1).pick_fastest()
-            lap2 = session.laps.pick_driver(driver2).pick_fastest()
-
-
-        if lap1 is None or lap2 is None:
+        # 최속 랩 저장소에서 두 드라이버만 읽음 (없으면 1회 로드 후 저장)
+        loaded = _load_fastest_laps(year, race, [driver1, driver2])
+        if loaded is None:
             return "데이터 부족: 두 드라이버의 정상적인 랩 타임(Fastest Lap)을 찾을 수 없습니다."
+        event_name, [(tel1, color1), (tel2, color2)] = loaded
 
-        # 텔레메트리 추출 및 분석
-        tel1 = lap1.get_telemetry().add_distance()
-        tel2 = lap2.get_telemetry().add_distance()
-
-        interp_speed_d2 = np.interp(tel1['Distance'], tel2['Distance'], tel2['Speed'])
-        delta = tel1['Speed'] - interp_speed_d2
+        # 미니 섹터 도미넌스: 레이스 전체 그리드 결과(캐시) 재사용, 저장소가 없으면 두 드라이버만 계산
+        result = get_mini_sector_result(year, event_name)
+        if result is None or driver1 not in result.drivers or driver2 not in result.drivers:
+            result = compute_mini_sectors({driver1: tel1, driver2: tel2})
+        winners = sector_winners(result, [driver1, driver2])
 
-        x = np.array(tel1['X'].values)
-        y = np.array(tel1['Y'].values)
-        points = np.array([x, y]).T.reshape(-1, 1, 2)
+        points = np.column_stack([result.x, result.y]).reshape(-1, 1, 2)
         segments = np.concatenate([points[:-1], points[1:]], axis=1)
-
-        color1 = fastf1.plotting.get_driver_color(driver1, session=session)
-        color2 = fastf1.plotting.get_driver_color(driver2, session=session)
-        
-        colors = [color1 if d > 0 else color2 for d in delta[:-1]]
+        colors = np.array([color1, color2])[np.repeat(winners, GRID_POINTS_PER_SECTOR)]
 
         fig, ax = plt.subplots(figsize=(10, 8), facecolor='black')
         ax.set_facecolor('black')
@@ -296,78 +270,62 @@ def generate_track_dominance_plot(year: int, race: str, driver1: str, driver2: s
                         Line2D([0], [0], color=color2, lw=4)]
         ax.legend(legend_lines, [driver1, driver2], loc='upper right', facecolor='black', labelcolor='white')
         
-        plt.title(f"{year} {session.event['EventName']} Track Dominance\n({driver1} vs {driver2})", color='white', fontsize=15, fontweight='bold')
+        plt.title(f"{year} {event_name} Track Dominance\n({driver1} vs {driver2})", color='white', fontsize=15, fontweight='bold')
 
-        filename = f"{year}_{session.event['EventName']}_Dominance_{driver1}_vs_{driver2}.png".replace(" ", "_")
+        filename = f"{year}_{event_name}_Dominance_{driver1}_vs_{driver2}.png".replace(" ", "_")
         return _save_plot(filename)
 
     except Exception as e:
-            print(f"⚠️ [Dominance] 로컬 캐시에 텔레메트리 누락 감지! 임시 폴더로 우회합니다... ({e})")
-            
-            # [★ 진짜 해결책] 존재하지 않는 disable_cache 대신, 일회용 임시 폴더를 캐시로 지정
-            import tempfile
-            temp_cache_dir = os.path.join(tempfile.gettempdir(), 'fastf1_temp_bypass')
-            os.makedirs(temp_cache_dir, exist_ok=True)
-            fastf1.Cache.enable_cache(temp_cache_dir)
-            
-            # fastf1이 알아먹게 트랙명 보정
-            matched_event = race
-            if "japan" in race.lower() or "suzuka" in race.lower(): matched_event = "Japanese"
-            elif "cota" in race.lower() or "austin" in race.lower() or "united states" in race.lower(): matched_event = "United States"
-            elif "saopaulo" in race.lower() or "brazil" in race.lower(): matched_event = "Sao Paulo"
-            elif "china" in race.lower() or "shanghai" in race.lower(): matched_event = "Chinese"
-            elif "britain" in race.lower() or "silverstone" in race.lower() or "uk" in race.lower(): matched_event = "British"
-            
-            session = fastf1.get_session(year, matched_event, 'R')
-            session.load(laps=True, telemetry=True, weather=False, messages=False)
-            
-            # 볼일 끝났으면 다른 도구들을 위해 기존 캐시 경로(CACHE_DIR)로 원상 복구!
-            fastf1.Cache.enable_cache(CACHE_DIR)
-
-            lap1 = session.laps.pick_driver(driver1).pick_fastest()
-            lap2 = session.laps.pick_driver(driver2).pick_fastest()
+        print(f"🚨 [Dominance Error] {e}")
+        return f"데이터 로드 실패: 해당 세션의 텔레메트리 데이터를 확보하지 못했습니다. ({e})"
         
 
 # -----------------------------------------------------------------------------
 # 3. [Plotly] 스피드 트레이스 (Interactive)
 # -----------------------------------------------------------------------------
-def get_speed_trace_data(year: int, race: str, driver1: str, driver2: str):
-    """Plotly용 스피드 트레이스 객체 반환"""
+@cached_figure('speed_trace', normalize=_normalize_name)
+def get_speed_trace_data(year: int, race: str, driver1: str, driver2: str,
+                         extra_drivers: list = None, viewport_width: int = None):
+    """
+    Plotly용 스피드 트레이스 객체 반환
+    - extra_drivers: 3명 이상 비교할 때 추가 드라이버
+    - viewport_width: 차트 가로 픽셀. 주면 드라이버별로 LTTB 다운샘플링 (픽셀당 LTTB_POINTS_PER_PIXEL점)
+    전체 포인트가 WEBGL_POINT_THRESHOLD를 넘으면 Scattergl(WebGL)로 그립니다.
+    """
     try:
-        d1_code = _normalize_name(driver1)
-        d2_code = _normalize_name(driver2)
+        codes = [_normalize_name(d) for d in [driver1, driver2] + list(extra_drivers or [])]
+        codes = list(dict.fromkeys(codes))  # 중복 제거 (순서 유지)
 
-        # [★ 수정] 헬퍼 함수로 세션 로드 (스피드 트레이스도 telemetry 필수!)
-        session = _get_loaded_session(year, race, load_telemetry=True)
+        # 최속 랩 저장소에서 요청한 드라이버만 읽음 (없으면 1회 로드 후 저장)
+        loaded = _load_fastest_laps(year, race, codes)
+        if loaded is None: return None
+        event_name, laps = loaded
 
-        l1 = session.laps.pick_driver(d1_code).pick_fastest()
-        l2 = session.laps.pick_driver(d2_code).pick_fastest()
-        
-        if l1 is None or l2 is None: return None
+        traces = []
+        for code, (tel, color) in zip(codes, laps):
+            x, y = tel['Distance'], tel['Speed']
+            if viewport_width:
+                x, y = _lttb(x, y, int(viewport_width) * LTTB_POINTS_PER_PIXEL)
+            traces.append((code, color, x, y))
 
-        t1 = l1.get_telemetry().add_distance()
-        t2 = l2.get_telemetry().add_distance()
+        total_points = sum(len(x) for _, _, x, _ in traces)
+        scatter = go.Scattergl if total_points > WEBGL_POINT_THRESHOLD else go.Scatter
 
         fig = go.Figure()
-
-        c1 = fastf1.plotting.get_driver_color(d1_code, session=session)
-        fig.add_trace(go.Scatter(
-            x=t1['Distance'], y=t1['Speed'],
-            mode='lines', name=d1_code,
-            line=dict(color=c1, width=2),
-            hovertemplate='Dist: %{x:.0f}m<br>Speed: %{y:.1f}km/h<extra></extra>'
-        ))
-
-        c2 = fastf1.plotting.get_driver_color(d2_code, session=session)
-        fig.add_trace(go.Scatter(
-            x=t2['Distance'], y=t2['Speed'],
-            mode='lines', name=d2_code,
-            line=dict(color=c2, width=2, dash='solid'),
-            hovertemplate='Dist: %{x:.0f}m<br>Speed: %{y:.1f}km/h<extra></extra>'
-        ))
+        used_colors = set()
+        for code, color, x, y in traces:
+            # 같은 팀(같은 색) 드라이버는 점선으로 구분
+            dash = 'dash' if color in used_colors else 'solid'
+            used_colors.add(color)
+            fig.add_trace(scatter(
+                x=x, y=y,
+                mode='lines', name=code,
+                line=dict(color=color, width=2, dash=dash),
+                hovertemplate='Dist: %{x:.0f}m<br>Speed: %{y:.1f}km/h<extra></extra>'
+            ))
 
         fig.update_layout(
-            title=f"{year} {session.event['EventName']} Speed Trace (Fastest Lap): {d1_code} vs {d2_code}",
+            title=f"{year} {event_name} Speed Trace (Fastest Lap): {' vs '.join(codes)}",
             xaxis_title="Distance (m)",
             yaxis_title="Speed (km/h)",
             template="plotly_dark",
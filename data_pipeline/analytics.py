@@ -1,11 +1,20 @@
 import fastf1
-import fastf1.plotting
 import pandas as pd
 import numpy as np
 import os
 import traceback
 import logging
-from scipy.stats import linregress
+from collections import namedtuple
+from scipy.stats import t as student_t
+
+from data_pipeline.session_registry import load_session
+from data_pipeline.bounded_cache import BoundedCache
+from data_pipeline import lap_store, artifact_store, telemetry_store
+from data_pipeline.event_resolver import resolve_event_name, resolve_event_record, get_resolver
+from data_pipeline.race_matrix import get_race_matrix
+from data_pipeline.pit_loss import stop_losses, circuit_pit_loss
+from data_pipeline.traffic import get_race_traffic, lap_traffic
+from data_pipeline.driver_index import DRIVER_INDEX_COLUMNS, get_driver_index, resolve_driver
 
 # 로깅 설정
 logging.basicConfig(level=logging.WARNING)
@@ -13,280 +22,639 @@ logger = logging.getLogger(__name__)
 
 # 전역 설정
 logging.getLogger('fastf1').setLevel(logging.ERROR)
-fastf1.plotting.setup_mpl(misc_mpl_mods=False)
-CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-PROJECT_ROOT = os.path.dirname(CURRENT_DIR)  # data_pipeline의 부모 = 프로젝트 루트
-
-# FastF1 캐시 설정
-# enable_cache()는 SQLite HTTP 캐시를 생성해야 해서 쓰기 권한 필요
-# Streamlit Cloud에서는 data/cache/가 읽기 전용이므로 /tmp에 writable 캐시 생성 후
-# 커밋된 캐시(pickle 파일)를 symlink로 연결
-_local_cache = os.path.join(PROJECT_ROOT, 'data', 'cache')
-try:
-    os.makedirs(_local_cache, exist_ok=True)
-    _test = os.path.join(_local_cache, '.write_test')
-    with open(_test, 'w') as f:
-        f.write('ok')
-    os.remove(_test)
-    CACHE_DIR = _local_cache
-except (PermissionError, OSError):
-    # 읽기 전용 → /tmp 사용 + 커밋된 캐시 symlink
-    CACHE_DIR = '/tmp/fastf1_cache'
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    if os.path.exists(_local_cache):
-        for _item in os.listdir(_local_cache):
-            _src = os.path.join(_local_cache, _item)
-            _dst = os.path.join(CACHE_DIR, _item)
-            if os.path.isdir(_src) and not os.path.exists(_dst):
-                try:
-                    os.symlink(_src, _dst)
-                except OSError:
-                    pass
-
-try:
-    fastf1.Cache.enable_cache(CACHE_DIR)
-except Exception:
-    pass
+
+# 랩 스토어에서 읽을 컬럼 (컬럼 프로젝션)
+AUDIT_LAP_COLUMNS = ['Driver', 'DriverNumber', 'LapNumber', 'LapTime', 'Stint', 'Compound', 'TrackStatus']
+TIRE_LAP_COLUMNS = ['Driver', 'LapTime', 'Compound', 'TyreLife', 'TrackStatus']
+STINT_LAP_COLUMNS = ['Driver', 'LapNumber', 'Stint', 'Compound', 'TyreLife']
+TIRE_LIFE_LAP_COLUMNS = ['Driver', 'Stint', 'Compound']
+RESULT_LOOKUP_COLUMNS = DRIVER_INDEX_COLUMNS
 
 # =============================================================================
 # 1. 통합 전략 감사 (Integrated Strategy Audit)
 # =============================================================================
-def audit_race_strategy(year: int, circuit: str, driver_identifier: str) -> pd.DataFrame:
+AUDIT_COLUMNS = ['Stint', 'Tyre', 'Laps', 'Traffic_Run', 'Clean_Pace', 'Traffic_Pace', 'Traffic_Loss', 'Pit_Event', 'Pit_Loss']
+FIELD_AUDIT_KEYS = ['DriverNumber', 'Driver']
+
+_field_audit_cache = BoundedCache()
+
+def audit_race_strategy(year: int, circuit: str, driver_identifier: str, baseline: str = 'race') -> pd.DataFrame:
     """
     [Agent 3 핵심 엔진]
     트래픽, 페이스, 피트 타이밍 + 스틴트 길이 평가(Stint Evaluation) 추가
+    (레이스 단위로 캐시된 전체 그리드 감사 결과에서 드라이버 1명을 골라 반환)
+    baseline: 스틴트 길이 평가 기준 — 'race'(이번 경기) / 'circuit'(같은 서킷 다년도)
     """
     try:
-        # 1. 세션 로드
-        session = fastf1.get_session(year, circuit, 'R')
-        session.load(laps=True, telemetry=False, weather=False, messages=False)
-        
-        # 2. 드라이버 매핑
-        target_driver = _resolve_driver_id(session, driver_identifier)
-        if not target_driver: return pd.DataFrame()
+        field, results = _get_field_audit(year, circuit, baseline)
 
-        # 3. 전체 필드 타이어 통계 계산 (기준점 마련)
-        # (다른 드라이버들은 보통 몇 랩이나 탔는지 확인)
-        global_tire_stats = _get_global_tire_stats(session)
-
-        # 4. 내 드라이버 데이터 추출
-        laps = session.laps.pick_driver(target_driver)
-        if laps.empty: return pd.DataFrame()
-
-        # 트래픽 감지
-        try:
-            if 'TimeDiffToAhead' in laps.columns and laps['TimeDiffToAhead'].notna().any():
-                laps = laps.copy()
-                laps['InTraffic'] = laps['TimeDiffToAhead'].fillna(99) < 1.0
-            else:
-                laps = laps.copy()
-                laps['InTraffic'] = False
-        except Exception:
-            laps = laps.copy()
-            laps['InTraffic'] = False
-
-        # 5. 스틴트별 정밀 분석
-        laps['Stint'] = laps['Stint'].fillna(1).astype(int)
-        stint_summary = []
-
-        for stint_id, stint_data in laps.groupby('Stint'):
-            compound = stint_data['Compound'].iloc[0]
-            laps_run = len(stint_data)
-            start_lap = int(stint_data['LapNumber'].min())
-            end_lap = int(stint_data['LapNumber'].max())
-            
-            # --- [New] 스틴트 길이 평가 로직 ---
-            stint_eval = "Normal"
-            if compound in global_tire_stats:
-                avg_life = global_tire_stats[compound]['avg']
-                max_life = global_tire_stats[compound]['max']
-                
-                # 비율로 평가 (평균 대비)
-                if laps_run >= max_life * 0.95:
-                    stint_eval = "🔥 Extreme (Max Life)"
-                elif laps_run > avg_life * 1.3:
-                    stint_eval = "Long Run (Management)"
-                elif laps_run < avg_life * 0.6:
-                    stint_eval = "Short Sprint"
-                else:
-                    stint_eval = "Standard"
-            # ------------------------------------
-
-            # 피트 아웃/인 상황 체크
-            pit_condition = _check_pit_condition(stint_data)
-
-            # 페이스 분석
-            racing_laps = stint_data[stint_data['TrackStatus'] == '1']
-            
-            # 클린 랩 vs 트래픽 랩 분리
-            clean_laps = racing_laps[~racing_laps['InTraffic']]
-            traffic_laps = racing_laps[racing_laps['InTraffic']]
-            
-            avg_clean = clean_laps['LapTime'].dt.total_seconds().mean() if not clean_laps.empty else None
-            avg_traffic = traffic_laps['LapTime'].dt.total_seconds().mean() if not traffic_laps.empty else None
-            
-            # 트래픽 비율 계산
-            traffic_pct = (len(traffic_laps) / len(racing_laps) * 100) if not racing_laps.empty else 0
-
-            # 에이전트가 읽기 편하게 컬럼명 명확화
-            stint_summary.append({
-                "Stint": stint_id,
-                "Tyre": f"{compound} ({stint_eval})", # 예: HARD (Extreme)
-                "Laps": laps_run,
-                "Traffic_Run": f"{int(traffic_pct)}%", # 트래픽 겪은 비율
-                "Clean_Pace": round(avg_clean, 3) if avg_clean else "N/A",
-                "Traffic_Pace": round(avg_traffic, 3) if avg_traffic else "N/A",
-                "Pit_Event": pit_condition
-            })
+        target_driver = resolve_driver(get_driver_index(year, circuit, results), driver_identifier)
+        if not target_driver: return pd.DataFrame()
 
-        return pd.DataFrame(stint_summary)
+        driver_audit = field[field['DriverNumber'] == target_driver]
+        return driver_audit[AUDIT_COLUMNS].reset_index(drop=True)
 
     except Exception as e:
         logger.error(f"Strategy Audit Error [{year} {circuit} {driver_identifier}]: {type(e).__name__}: {e}")
         raise
+
+def audit_field_strategy(year: int, circuit: str, baseline: str = 'race') -> pd.DataFrame:
+    """
+    전체 그리드의 스틴트별 전략 감사 (팀 / 그리드 비교용).
+    컬럼: DriverNumber, Driver + audit_race_strategy 와 동일한 컬럼, 행 순서는 결과 순서 → 스틴트 순
+    """
+    try:
+        field, _ = _get_field_audit(year, circuit, baseline)
+        return field.copy()
+    except Exception as e:
+        logger.error(f"Field Strategy Audit Error [{year} {circuit}]: {type(e).__name__}: {e}")
+        raise
+
+def _get_field_audit(year, circuit, baseline='race'):
+    """(전체 그리드 감사 DataFrame, 드라이버 결과 테이블) — 레이스 + 기준값 단위 프로세스 캐시"""
+    if baseline not in TIRE_BASELINES:
+        raise ValueError(f"baseline은 {TIRE_BASELINES} 중 하나여야 합니다: {baseline}")
+    event_name = resolve_event_name(circuit, year)
+    return _field_audit_cache.get_or_load((int(year), event_name, baseline),
+                                          lambda: _build_field_audit(year, event_name, baseline))
+
+def _build_field_audit(year, event_name, baseline):
+    # 0. 프리웜 아티팩트 우선 (시즌 프리웜으로 미리 계산된 감사 결과, 이번 경기 기준)
+    audits = artifact_store.read_artifact(year, event_name, 'audits') if baseline == 'race' else None
+    drivers = artifact_store.read_artifact(year, event_name, 'drivers')
+    if audits is not None and drivers is not None:
+        results = pd.DataFrame(drivers)
+        field = _field_audit_from_artifact(audits, results)
+    else:
+        # 1. 랩 데이터 로드 (Parquet 랩 스토어 우선, 없으면 공유 세션)
+        all_laps, results = _load_race_laps(year, event_name, AUDIT_LAP_COLUMNS)
+        results = results.reset_index(drop=True)
+        results['DriverNumber'] = results['DriverNumber'].astype(str)
+
+        # 2. 타이어 수명 기준점 (다른 드라이버들은 보통 몇 랩이나 탔는지)
+        if baseline == 'circuit':
+            get_race_tire_stats(year, event_name, all_laps)   # 이번 경기는 로드한 랩으로 먼저 캐시
+            tire_stats = get_circuit_tire_stats(event_name, year)
+        else:
+            tire_stats = get_race_tire_stats(year, event_name, all_laps)
+
+        # 3. 피트 스탑별 실측 손실 + 서킷 피트 로스 기준값 (피트 로스 표) + 간격 기반 트래픽 판정
+        pit_stops = stop_losses(get_race_matrix(year, event_name))
+        field = _audit_field_stints(all_laps, tire_stats, results, pit_stops, circuit_pit_loss(event_name, year),
+                                    get_race_traffic(year, event_name))
+    return field, results
+
+def _field_audit_from_artifact(audits, results) -> pd.DataFrame:
+    """프리웜 'audits' 아티팩트({DriverNumber: [스틴트 행]}) → 전체 그리드 감사 DataFrame"""
+    abbreviations = dict(zip(results['DriverNumber'].astype(str), results['Abbreviation']))
+    rows = []
+    for driver_number in results['DriverNumber'].astype(str):
+        for row in audits.get(driver_number, []):
+            rows.append({'DriverNumber': driver_number, 'Driver': abbreviations[driver_number], **row})
+    return pd.DataFrame(rows, columns=FIELD_AUDIT_KEYS + AUDIT_COLUMNS)
+
+def _audit_field_stints(all_laps, global_tire_stats, results, pit_stops=None, pit_reference=None,
+                        traffic=None) -> pd.DataFrame:
+    """
+    전체 랩으로 모든 드라이버의 스틴트별 감사 테이블을 만듭니다 (감사 캐시 / 시즌 프리웜 공용).
+    (DriverNumber, Stint) 그룹 집계 한 번으로 계산합니다.
+    pit_stops: pit_loss.stop_losses 결과 (스탑별 실측 손실), pit_reference: {'GREEN': s, 'SC': s, 'VSC': s}
+    traffic: traffic.get_race_traffic 결과 (랩별 더티 에어 판정 / 손실 시간, 없으면 트래픽 없음으로 처리)
+    """
+    laps = pd.DataFrame(all_laps)
+    laps = laps[laps['DriverNumber'].notna()]
+    if laps.empty:
+        return pd.DataFrame(columns=FIELD_AUDIT_KEYS + AUDIT_COLUMNS)
+
+    laps['DriverNumber'] = laps['DriverNumber'].astype(str)
+    laps['Stint'] = laps['Stint'].fillna(1).astype(int)
+
+    # 트래픽 감지 (랩 종료 시각 기준 트랙 위 앞 차와의 간격, data_pipeline/traffic.py)
+    if traffic is not None:
+        laps['InTraffic'], laps['TrafficLoss'] = lap_traffic(traffic, laps['Driver'], laps['LapNumber'])
+    else:
+        laps['InTraffic'], laps['TrafficLoss'] = False, np.nan
+
+    # 페이스 분석용 마스크 (그린 플래그 랩 중 클린 / 트래픽)
+    racing = (laps['TrackStatus'] == '1').to_numpy()
+    in_traffic = laps['InTraffic'].to_numpy(dtype=bool)
+    lap_seconds = laps['LapTime'].dt.total_seconds()
+    laps['Racing'] = racing
+    laps['Clean'] = racing & ~in_traffic
+    laps['Traffic'] = racing & in_traffic
+    laps['CleanTime'] = lap_seconds.where(laps['Clean'])
+    laps['TrafficTime'] = lap_seconds.where(laps['Traffic'])
+
+    keys = ['DriverNumber', 'Stint']
+    grouped = laps.groupby(keys)
+    stints = grouped.agg(
+        Laps=('Stint', 'size'),
+        LastLap=('LapNumber', 'max'),
+        RacingLaps=('Racing', 'sum'),
+        CleanLaps=('Clean', 'sum'),
+        TrafficLaps=('Traffic', 'sum'),
+        CleanMean=('CleanTime', 'mean'),
+        TrafficMean=('TrafficTime', 'mean'),
+        TrafficLoss=('TrafficLoss', lambda s: s.sum(min_count=1)),   # 기준 랩이 없으면 NaN 유지
+    )
+    # 스틴트 첫 랩의 컴파운드 / 마지막 랩의 트랙 상태 (피트 인 상황)
+    stints['Compound'] = laps.drop_duplicates(keys, keep='first').set_index(keys)['Compound']
+    stints['LastStatus'] = laps.drop_duplicates(keys, keep='last').set_index(keys)['TrackStatus']
+    stints = stints.reset_index()
+
+    # --- 스틴트 길이 평가 (평균 / 최대 수명 대비 비율) ---
+    avg_life = stints['Compound'].map({c: s['avg'] for c, s in global_tire_stats.items()})
+    max_life = stints['Compound'].map({c: s['max'] for c, s in global_tire_stats.items()})
+    laps_run = stints['Laps']
+    stint_eval = np.select(
+        [avg_life.isna(), laps_run >= max_life * 0.95, laps_run > avg_life * 1.3, laps_run < avg_life * 0.6],
+        ["Normal", "🔥 Extreme (Max Life)", "Long Run (Management)", "Short Sprint"],
+        default="Standard",
+    )
+
+    # --- 피트 아웃/인 상황 (스틴트 마지막 랩의 트랙 상태: SC > VSC > RED FLAG 순) ---
+    status = stints['LastStatus'].astype(str)
+    pit_event = np.select(
+        [status.str.contains('4'), status.str.contains('6') | status.str.contains('7'), status.str.contains('5')],
+        ["SC", "VSC", "RED FLAG"],
+        default="Green Flag",
+    )
+
+    # --- 피트 로스 (스틴트 마지막 랩 = 인 랩의 실측 손실, 같은 상황의 서킷 기준값과 함께) ---
+    stints['Driver'] = stints['DriverNumber'].map(dict(zip(results['DriverNumber'].astype(str), results['Abbreviation'])))
+    stints['Pit_Loss'] = "N/A"
+    if pit_stops is not None and not pit_stops.empty:
+        measured = pit_stops.set_index(['Driver', 'Lap'])
+        index = pd.MultiIndex.from_arrays([stints['Driver'], stints['LastLap'].fillna(0).astype(int)])
+        loss = measured['Loss'].reindex(index).to_numpy()
+        reference = measured['Condition'].reindex(index).map(pit_reference or {}).to_numpy(dtype=float)
+        stints['Pit_Loss'] = [
+            "N/A" if np.isnan(l) else f"{l:.1f}s" if np.isnan(r) else f"{l:.1f}s (ref {r:.1f}s)"
+            for l, r in zip(loss, reference)
+        ]
+
+    # 트래픽 비율 (그린 플래그 랩 대비)
+    racing_laps = stints['RacingLaps'].to_numpy()
+    traffic_pct = np.divide(stints['TrafficLaps'] * 100, racing_laps,
+                            out=np.zeros(len(stints)), where=racing_laps > 0)
+
+    # 에이전트가 읽기 편하게 컬럼명 명확화
+    stints['Tyre'] = stints['Compound'].astype(str) + " (" + stint_eval + ")"   # 예: HARD (Extreme)
+    stints['Traffic_Run'] = [f"{int(pct)}%" for pct in traffic_pct]            # 트래픽 겪은 비율
+    stints['Clean_Pace'] = stints['CleanMean'].round(3).astype(object).where(stints['CleanLaps'] > 0, "N/A")
+    stints['Traffic_Pace'] = stints['TrafficMean'].round(3).astype(object).where(stints['TrafficLaps'] > 0, "N/A")
+    stints['Traffic_Loss'] = [f"{loss:+.1f}s" if laps_in > 0 and not np.isnan(loss) else "N/A"  # 트래픽으로 잃은 시간 합
+                              for loss, laps_in in zip(stints['TrafficLoss'], stints['TrafficLaps'])]
+    stints['Pit_Event'] = pit_event
+
+    # 결과 순서 → 스틴트 순으로 정렬
+    order = {num: i for i, num in enumerate(results['DriverNumber'].astype(str))}
+    stints['DriverOrder'] = stints['DriverNumber'].map(order).fillna(len(order))
+    stints = stints.sort_values(['DriverOrder', 'Stint'], kind='stable')
+    return stints[FIELD_AUDIT_KEYS + AUDIT_COLUMNS].reset_index(drop=True)
+
 # =============================================================================
-# 2. 타이어 성능 분석 (기존 유지)
+# 2. 타이어 성능 분석 (연료 / 트랙 에볼루션 보정 마모 모델)
 # =============================================================================
+# 랩타임 = 드라이버 기본 페이스 + 컴파운드별 마모 × 타이어 수명 + 레이스 진행 추세(연료 소모 + 트랙 에볼루션)
+#   1) 레이스 전체 랩으로 위 식을 한 번 최소제곱 적합 → 랩당 진행 추세 추정
+#      (스틴트 시작 랩이 드라이버마다 달라서 타이어 수명과 랩 번호가 분리됨)
+#   2) 추세만큼 보정한 랩타임으로 모든 스틴트의 기울기를 그룹 합계(Σx, Σy, Σxx, Σxy, Σyy)로 동시에 계산
+#   3) 드라이버 / 컴파운드 단위는 스틴트 내부 편차를 합쳐서(스틴트별 절편) 공통 기울기 + 신뢰구간
+DEG_LAP_COLUMNS = ['Driver', 'LapNumber', 'LapTime', 'Stint', 'Compound', 'TyreLife', 'TrackStatus', 'PitInTime', 'PitOutTime']
+DEG_COMPOUND_ORDER = ['SOFT', 'MEDIUM', 'HARD', 'INTERMEDIATE', 'WET']
+
+FUEL_EFFECT_PER_LAP = 0.055     # 연료 소모로 랩당 빨라지는 시간 (s/lap, 약 1.7kg/lap × 0.033s/kg)
+TRACK_EVOLUTION_MAX = 0.1       # 추정 트랙 에볼루션 상한 (s/lap)
+QUICKLAP_THRESHOLD = 1.07       # 최속 랩 대비 107% 이내만 사용 (Laps.pick_quicklaps 기본값)
+MIN_FIT_LAPS = 5                # 기울기를 낼 최소 랩 수 (스틴트 단위)
+DEG_CI_LEVEL = 0.95
+DEG_HIGH = 0.1                  # s/lap 이상이면 High
+DEG_MODERATE = 0.04             # s/lap 이상이면 Moderate
+
+DegradationModel = namedtuple('DegradationModel', [
+    'compounds',        # 컴파운드별 마모 (s/lap) + 신뢰구간
+    'drivers',          # (드라이버, 컴파운드)별 마모 + 신뢰구간
+    'stints',           # (드라이버, 스틴트)별 마모 + 신뢰구간
+    'fuel_effect',      # 적용한 연료 보정 (s/lap)
+    'track_evolution',  # 추정 트랙 에볼루션 (s/lap)
+])
+
+_degradation_cache = BoundedCache()
+
 def calculate_tire_degradation(year: int, circuit: str) -> pd.DataFrame:
     try:
-        BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-        CACHE_DIR = os.path.abspath(os.path.join(BASE_DIR, '../../data/cache'))
-        fastf1.Cache.enable_cache(CACHE_DIR)
-
-        year_dir = os.path.join(CACHE_DIR, str(year))
-        matched_event_name = circuit
-
-        # [★ 방어막 1] LLM이 자주 헛소리하는 트랙명 -> 공식 그랑프리명 강제 매핑
-        TRACK_ALIASES = {
-            "silverstone": "british", "monza": "italian", "spa": "belgian",
-            "interlagos": "sao paulo", "zandvoort": "dutch", "suzuka": "japanese",
-            "saopaulo": "s o paulo", # 상파울루 폴더명 깨짐 완벽 방어
-            "cota": "united states", "austin": "united states"
-        }
-
-        search_keyword = circuit.lower().replace(" ", "").replace("_", "")
-        
-        # 별명 매칭 확인
-        for alias, real_name in TRACK_ALIASES.items():
-            if alias in search_keyword:
-                search_keyword = real_name.replace(" ", "")
-                break
-
-        # 로컬 폴더 스캔
-        if os.path.exists(year_dir):
-            available_folders = os.listdir(year_dir)
-            for folder_name in available_folders:
-                clean_name = folder_name.split('_', 1)[-1] if '_' in folder_name else folder_name
-                compare_name = clean_name.lower().replace("_", "").replace(" ", "")
-
-                if search_keyword in compare_name:
-                    matched_event_name = clean_name.replace("_", " ")
-                    break
+        # 통합 리졸버로 트랙명 보정 (별명/국가명/한글 → 정식 그랑프리명)
+        matched_event_name = resolve_event_name(circuit, year)
 
         print(f"🔍 [Tire Analysis] LLM 입력: '{circuit}' -> 캐시 매칭: '{matched_event_name}'")
 
-        session = fastf1.get_session(year, matched_event_name, 'R')
-        session.load(laps=True, telemetry=False, weather=False, messages=False)
-
-        laps = session.laps.pick_track_status('1').pick_quicklaps()
+        model, laps, _ = _get_degradation_model(year, matched_event_name)
+        deg = model.compounds.set_index('Compound')
 
         stats = []
-        for compound in ['SOFT', 'MEDIUM', 'HARD']:
+        for compound in DEG_COMPOUND_ORDER:
             comp_laps = laps[laps['Compound'] == compound]
-            if len(comp_laps) < 10: continue
-
-            # 결측치(NaT)를 제거하여 연산 에러 방지
-            valid_laps = comp_laps.dropna(subset=['LapTime'])
-            if valid_laps.empty: continue
-            
-            avg_pace = valid_laps['LapTime'].dt.total_seconds().mean()
-            
-            # [★ 방어막 2] _calculate_slope 함수가 없어서 나는 에러 원천 차단
-            try:
-                slope = _calculate_slope(valid_laps)
-            except NameError:
-                slope = 0.0 # 함수가 정의되지 않았을 경우 강제 통과
-                
-            max_life = valid_laps['TyreLife'].max()
-            avg_life = valid_laps.groupby('Driver')['TyreLife'].max().mean()
+            if len(comp_laps) < 10 or compound not in deg.index: continue
 
+            row = deg.loc[compound]
+            avg_life = comp_laps.groupby('Driver')['TyreLife'].max().mean()
             stats.append({
                 "Compound": compound,
-                "Avg_Pace": round(avg_pace, 3),
+                "Avg_Pace": round(comp_laps['Time'].mean(), 3),
                 "Avg_Life": f"{int(avg_life)} Laps",
-                "Max_Life": f"{int(max_life)} Laps",
-                "Degradation": "High" if slope > 0.1 else "Stable"
+                "Max_Life": f"{int(comp_laps['TyreLife'].max())} Laps",
+                "Deg_per_Lap": row['Deg_per_Lap'],
+                "Deg_CI": f"{row['CI_Low']:+.3f} ~ {row['CI_High']:+.3f}",
+                "Degradation": _degradation_label(row['Deg_per_Lap']),
             })
-            
+
         return pd.DataFrame(stats)
 
     except Exception as e:
         print(f"\n🚨 [FATAL ERROR] 타이어 데이터 로드 실패: {e}")
         traceback.print_exc()
         return pd.DataFrame()
-    
+
+def driver_tire_degradation(year: int, circuit: str, driver_identifier: str = None) -> pd.DataFrame:
+    """
+    드라이버 × 컴파운드별 보정 마모율 (s/lap) + 신뢰구간.
+    driver_identifier를 주면 해당 드라이버만 (번호 / 약어 / 성 / 풀네임 / 한글·영문 별명)
+    """
+    model, _, results = _get_degradation_model(year, resolve_event_name(circuit, year))
+    df = model.drivers
+    if driver_identifier:
+        index = get_driver_index(year, circuit, results)
+        driver_number = resolve_driver(index, driver_identifier)
+        if driver_number is None: return pd.DataFrame()
+        df = df[df['Driver'] == index.abbreviations[driver_number]]
+    return df.reset_index(drop=True)
+
+def get_degradation_model(year: int, circuit: str) -> DegradationModel:
+    """레이스 1개의 마모 모델 (레이스 단위 프로세스 캐시)"""
+    model, _, _ = _get_degradation_model(year, resolve_event_name(circuit, year))
+    return model
+
+def _get_degradation_model(year, event_name):
+    return _degradation_cache.get_or_load((int(year), event_name),
+                                          lambda: _build_degradation_model(year, event_name))
+
+def _build_degradation_model(year, event_name):
+    all_laps, results = _load_race_laps(year, event_name, DEG_LAP_COLUMNS)
+    laps = _degradation_laps(all_laps)
+    return fit_degradation_model(laps), laps, results
+
+def _degradation_laps(all_laps) -> pd.DataFrame:
+    """마모 적합용 랩: 그린 플래그 / 피트 인·아웃 랩 제외 / 1랩 제외 / 107% 이내"""
+    laps = pd.DataFrame(all_laps[[c for c in DEG_LAP_COLUMNS if c in all_laps.columns]])
+    mask = (laps['TrackStatus'] == '1') & laps['LapTime'].notna() & laps['TyreLife'].notna() & (laps['LapNumber'] > 1)
+    for column in ('PitInTime', 'PitOutTime'):
+        if column in laps.columns:
+            mask &= laps[column].isna()
+    laps = laps[mask & laps['Compound'].notna()]
+    laps = laps[laps['LapTime'] < laps['LapTime'].min() * QUICKLAP_THRESHOLD]
+
+    laps['Time'] = laps['LapTime'].dt.total_seconds()
+    laps['Stint'] = laps['Stint'].fillna(1).astype(int)
+    return laps[['Driver', 'Stint', 'Compound', 'LapNumber', 'TyreLife', 'Time']].reset_index(drop=True)
+
+def fit_degradation_model(laps) -> DegradationModel:
+    """_degradation_laps 결과 → 스틴트 / 드라이버 / 컴파운드 단위 보정 마모율 (전부 한 번의 그룹 집계)"""
+    track_evolution = _fit_track_evolution(laps)
+    trend = FUEL_EFFECT_PER_LAP + track_evolution
+
+    # 진행 추세 보정: 늦은 랩일수록 연료가 가볍고 트랙이 좋아져서 빨라진 만큼 되돌림
+    x = laps['TyreLife'].to_numpy(dtype=float)
+    y = laps['Time'].to_numpy() + trend * (laps['LapNumber'].to_numpy(dtype=float) - 1)
+    sums = pd.DataFrame({
+        'Driver': laps['Driver'], 'Stint': laps['Stint'], 'Compound': laps['Compound'],
+        'n': 1, 'x': x, 'y': y, 'xx': x * x, 'xy': x * y, 'yy': y * y,
+    })
+    stints = sums.groupby(['Driver', 'Stint', 'Compound'], sort=False).sum().reset_index()
+    stints = stints[stints['n'] >= MIN_FIT_LAPS]
+
+    # 스틴트 내부 편차 합 (중심화): Sxx, Sxy, Syy
+    stints['Sxx'] = stints['xx'] - stints['x'] ** 2 / stints['n']
+    stints['Sxy'] = stints['xy'] - stints['x'] * stints['y'] / stints['n']
+    stints['Syy'] = stints['yy'] - stints['y'] ** 2 / stints['n']
+    stints = stints[stints['Sxx'] > 0]
+    stints['groups'] = 1
+
+    stint_table = _pooled_slopes(stints.rename(columns={'n': 'Laps'}), ['Driver', 'Stint', 'Compound'])
+    driver_table = _pooled_slopes(stints.rename(columns={'n': 'Laps', 'groups': 'Stints'}), ['Driver', 'Compound'])
+    compound_table = _pooled_slopes(stints.rename(columns={'n': 'Laps', 'groups': 'Stints'}), ['Compound'])
+    return DegradationModel(compound_table, driver_table, stint_table,
+                            FUEL_EFFECT_PER_LAP, round(track_evolution, 4))
+
+def _pooled_slopes(stints, keys) -> pd.DataFrame:
+    """
+    스틴트별 중심화 합계를 keys 단위로 합쳐 공통 기울기를 구합니다 (스틴트마다 절편은 따로).
+    기울기 = ΣSxy / ΣSxx, 잔차 자유도 = 랩 수 - 스틴트 수 - 1
+    """
+    count_cols = [c for c in ('Stints', 'Laps') if c in stints.columns]
+    pooled = stints.groupby(keys, sort=False)[count_cols + ['Sxx', 'Sxy', 'Syy']].sum().reset_index()
+    n_groups = pooled['Stints'] if 'Stints' in pooled.columns else 1
+
+    slope = pooled['Sxy'] / pooled['Sxx']
+    dof = pooled['Laps'] - n_groups - 1
+    ssr = (pooled['Syy'] - slope * pooled['Sxy']).clip(lower=0)
+    se = np.sqrt(ssr / dof.where(dof > 0) / pooled['Sxx'])
+    margin = se * student_t.ppf((1 + DEG_CI_LEVEL) / 2, dof.where(dof > 0))
+
+    pooled['Deg_per_Lap'] = slope.round(4)
+    pooled['CI_Low'] = (slope - margin).round(4)
+    pooled['CI_High'] = (slope + margin).round(4)
+    if 'Compound' in keys and len(keys) == 1:
+        pooled = pooled.sort_values('Compound', key=lambda c: c.map(_compound_rank), kind='stable')
+    return pooled[keys + count_cols + ['Deg_per_Lap', 'CI_Low', 'CI_High']].reset_index(drop=True)
+
+def _fit_track_evolution(laps) -> float:
+    """
+    랩타임 = 드라이버 절편 + 컴파운드별 마모 × 타이어 수명 + 추세 × 랩 번호 를 한 번 적합해서
+    추세에서 연료 효과를 뺀 값을 트랙 에볼루션으로 봅니다 (0 ~ TRACK_EVOLUTION_MAX로 제한, 식별 안 되면 0).
+    """
+    if len(laps) < MIN_FIT_LAPS * 4:
+        return 0.0
+    drivers = pd.get_dummies(laps['Driver'], dtype=float).to_numpy()
+    compounds = pd.get_dummies(laps['Compound'], dtype=float).to_numpy() * laps['TyreLife'].to_numpy(dtype=float)[:, None]
+    lap_number = laps['LapNumber'].to_numpy(dtype=float)[:, None]
+    design = np.hstack([drivers, compounds, lap_number])
+
+    coef, _, rank, _ = np.linalg.lstsq(design, laps['Time'].to_numpy(), rcond=None)
+    if rank < design.shape[1]:
+        return 0.0
+    return float(np.clip(-coef[-1] - FUEL_EFFECT_PER_LAP, 0.0, TRACK_EVOLUTION_MAX))
+
+def _compound_rank(compound):
+    return DEG_COMPOUND_ORDER.index(compound) if compound in DEG_COMPOUND_ORDER else len(DEG_COMPOUND_ORDER)
+
+def _degradation_label(deg_per_lap) -> str:
+    if pd.isna(deg_per_lap): return "Unknown"
+    if deg_per_lap >= DEG_HIGH: return "High"
+    if deg_per_lap >= DEG_MODERATE: return "Moderate"
+    return "Stable"
+
+# =============================================================================
+# 3. 스틴트 테이블 (UI · 전략 감사 · 시즌 프리웜 공용)
+# =============================================================================
+STINT_TABLE_COLUMNS = ['Driver', 'Stint', 'Compound', 'Start', 'End', 'Duration', 'Status']
+
+_stint_cache = BoundedCache()
+
+def get_stint_table(all_laps, drivers) -> pd.DataFrame:
+    """
+    전체 드라이버의 스틴트 요약 (타이어 전략 차트용).
+    drivers: 결과 순서의 드라이버 약어 리스트
+    (드라이버, 스틴트) 그룹 집계 한 번으로 계산 — 행 순서는 drivers 순서 → 스틴트 번호 순
+    """
+    laps = pd.DataFrame(all_laps[STINT_LAP_COLUMNS])
+    laps = laps[laps['Driver'].isin(drivers)]
+    if laps.empty:
+        return pd.DataFrame(columns=STINT_TABLE_COLUMNS)
+
+    laps['Stint'] = laps['Stint'].fillna(1).astype(int)
+    laps['DriverOrder'] = laps['Driver'].map({drv: i for i, drv in enumerate(drivers)})
+    keys = ['DriverOrder', 'Stint']
+
+    # 스틴트 첫 랩(컴파운드 / 시작 타이어 수명) + 랩 범위
+    first = laps.drop_duplicates(keys).set_index(keys)[['Driver', 'Compound', 'TyreLife']]
+    bounds = laps.groupby(keys)['LapNumber'].agg(Start='min', End='max')
+    table = bounds.join(first).reset_index()
+
+    table['Compound'] = table['Compound'].astype(str).str.upper()
+    table['Duration'] = table['End'] - table['Start']
+    table['Status'] = np.where(table['TyreLife'] <= 2.0, "NEW", "USED")
+    return table[STINT_TABLE_COLUMNS]
+
+def get_race_stints(year: int, circuit: str):
+    """
+    레이스 전체 스틴트 테이블 + 결과 순서 드라이버 리스트 (UI / 전략 감사 공용).
+    프리웜 아티팩트 → 랩 스토어 / 세션 순으로 확보하고 레이스 단위로 프로세스 캐시합니다.
+    return: (stint DataFrame, [드라이버 약어])
+    """
+    event_name = resolve_event_name(circuit, year)
+    return _stint_cache.get_or_load((int(year), event_name), lambda: _build_race_stints(year, event_name))
+
+def _build_race_stints(year, event_name):
+    stints = artifact_store.read_artifact(year, event_name, 'stints')
+    drivers = artifact_store.read_artifact(year, event_name, 'drivers')
+    if stints is not None and drivers is not None:
+        return stints, [d['Abbreviation'] for d in drivers]
+    all_laps, results = _load_race_laps(year, event_name, STINT_LAP_COLUMNS)
+    drivers = results['Abbreviation'].tolist()
+    return get_stint_table(all_laps, drivers), drivers
+
 # =============================================================================
 # 🔒 내부 헬퍼 함수 (Internal Helpers)
 # =============================================================================
 
-def _get_global_tire_stats(session):
+def _load_race_laps(year, circuit, columns):
+    """
+    레이스 전체 랩 + 드라이버 결과 테이블을 반환합니다.
+    Parquet 랩 스토어에 있으면 필요한 컬럼만 읽고 FastF1 load를 건너뜁니다.
+    return: (Laps, results DataFrame)
+    """
+    laps = lap_store.read_laps(year, circuit, columns=columns)
+    results = lap_store.read_results(year, circuit, columns=RESULT_LOOKUP_COLUMNS)
+    if laps is not None and results is not None:
+        return laps, results
+
+    session = load_session(year, circuit, 'R')
+    return session.laps, session.results
+
+def _get_global_tire_stats(all_laps):
     """
     [New] 이번 경기 전체 드라이버들의 타이어 수명 통계를 낸다.
-    return: {'SOFT': {'avg': 15, 'max': 22}, 'HARD': ...}
+    return: {'SOFT': {'avg': 15.2, 'max': 22, 'p50': 15.0, 'p75': 18.0, 'p90': 20.5, 'stints': 12}, 'HARD': ...}
     """
+    return _summarize_stint_lengths(_stint_lengths(all_laps))
+
+def _stint_lengths(all_laps) -> pd.DataFrame:
+    """(컴파운드, 드라이버, 스틴트)별 랩 수 — 타이어 수명 통계의 원재료 (레이스끼리 이어 붙여 합산 가능)"""
+    valid_laps = all_laps[all_laps['Compound'].notna()] # DNS 케이스 제외
+    lengths = valid_laps.groupby(['Compound', 'Driver', 'Stint']).size()
+    return lengths.rename('Length').reset_index()[STINT_LENGTH_COLUMNS]
+
+def _summarize_stint_lengths(lengths) -> dict:
+    """스틴트 길이 테이블 → 컴파운드별 평균 / 최대 / 백분위 스틴트 길이 (그룹 집계 1회)"""
+    if lengths is None or lengths.empty:
+        return {}
+    grouped = lengths.groupby('Compound')['Length']
+    summary = grouped.agg(avg='mean', max='max', stints='size')
+    percentiles = grouped.quantile([p / 100 for p in TIRE_LIFE_PERCENTILES]).unstack()
+
     stats = {}
-    valid_laps = session.laps[session.laps['Compound'].notna()] # DNS 케이스 제외
-    
-    for compound in ['SOFT', 'MEDIUM', 'HARD', 'INTER', 'WET']:
-        comp_data = valid_laps[valid_laps['Compound'] == compound]
-        if comp_data.empty: continue
-        
-        # 각 스틴트별 길이 추출
-        stint_lengths = comp_data.groupby(['Driver', 'Stint']).size()
-        
-        stats[compound] = {
-            'avg': stint_lengths.mean(),
-            'max': stint_lengths.max()
-        }
+    for compound, row in summary.iterrows():
+        stats[compound] = {'avg': float(row['avg']), 'max': int(row['max'])}
+        for p in TIRE_LIFE_PERCENTILES:
+            stats[compound][f'p{p}'] = float(percentiles.loc[compound, p / 100])
+        stats[compound]['stints'] = int(row['stints'])
     return stats
 
-def _resolve_driver_id(session, identifier):
-    identifier = str(identifier).strip().upper()
-    # 번호로 직접 매칭 (가장 빠름)
-    if identifier in session.drivers:
-        return identifier
-    # session.results에서 약어/성 매칭 (session.get_driver() 호출 없이)
-    try:
-        results = session.results
-        if 'Abbreviation' in results.columns:
-            match = results[results['Abbreviation'] == identifier]
-            if not match.empty:
-                return str(match.iloc[0]['DriverNumber'])
-        if 'LastName' in results.columns:
-            match = results[results['LastName'].str.upper() == identifier]
-            if not match.empty:
-                return str(match.iloc[0]['DriverNumber'])
-    except Exception:
-        pass
-    return None
-
-def _check_pit_condition(stint_data):
-    if stint_data.empty: return "Green Flag"
-    status = str(stint_data.iloc[-1]['TrackStatus'])
-    if '4' in status: return "SC"
-    if '6' in status or '7' in status: return "VSC"
-    if '5' in status: return "RED FLAG"
-    return "Green Flag"
-
-def _calculate_slope(laps):
-    if len(laps) < 3: return 0.0
-    x = laps['TyreLife'].values
-    y = laps['LapTime'].dt.total_seconds().values
-    mask = ~np.isnan(x) & ~np.isnan(y)
-    if not mask.any(): return 0.0
-    slope, _, _, _, _ = linregress(x[mask], y[mask])
-    return slope
-
-# Placeholder for Sector Analysis
-def mini_sector_dominance_analyze(year, circuit, drivers=None):
-    return None, "Sector Analysis Ready"
\ No newline at end of file
+# =============================================================================
+# 4. 미니 섹터 도미넌스 (Mini-Sector Dominance, 전체 그리드)
+# =============================================================================
+# 드라이버별 최속 랩 텔레메트리(telemetry_store)를 공통 거리 그리드로 리샘플링한 뒤
+# 랩을 N개의 미니 섹터로 나눠 섹터 타임 행렬 [드라이버, 섹터]를 한 번에 계산
+DEFAULT_MINI_SECTORS = 25
+GRID_POINTS_PER_SECTOR = 40
+
+MiniSectorResult = namedtuple('MiniSectorResult', [
+    'drivers',          # 드라이버 약어 리스트 (행 순서)
+    'edges',            # 섹터 경계 거리 (m), shape [N+1]
+    'sector_times',     # 섹터 타임 (s), shape [드라이버, N]
+    'grid',             # 공통 거리 그리드 (m), shape [N * GRID_POINTS_PER_SECTOR + 1]
+    'x', 'y',           # 그리드 위 트랙 좌표 (전체 최속 드라이버 기준)
+])
+
+_mini_sector_cache = BoundedCache()
+
+def compute_mini_sectors(fastest_laps: dict, n_sectors: int = DEFAULT_MINI_SECTORS) -> MiniSectorResult:
+    """
+    {드라이버: {'Distance', 'Speed', 'X', 'Y', ...}} → 미니 섹터 타임 행렬.
+    구간 통과 시간 = 구간 거리 / 평균 속도 를 [드라이버, 그리드] 행렬로 계산한 뒤 섹터 단위로 합산합니다.
+    """
+    drivers = [drv for drv, tel in fastest_laps.items() if tel is not None and len(tel['Distance']) > 1]
+    if not drivers:
+        return None
+    laps = [fastest_laps[drv] for drv in drivers]
+
+    # 모든 드라이버가 커버하는 거리까지만 비교 (랩 끝 샘플 수 차이 보정)
+    lap_length = min(float(tel['Distance'][-1]) for tel in laps)
+    grid = np.linspace(0.0, lap_length, n_sectors * GRID_POINTS_PER_SECTOR + 1)
+
+    speeds = np.vstack([np.interp(grid, tel['Distance'], tel['Speed']) for tel in laps])
+    speeds = np.maximum(speeds, 1.0) / 3.6                       # km/h → m/s (0 나눗셈 방지)
+    dt = np.diff(grid) / ((speeds[:, :-1] + speeds[:, 1:]) / 2)  # [드라이버, 그리드 구간]
+    sector_times = dt.reshape(len(drivers), n_sectors, GRID_POINTS_PER_SECTOR).sum(axis=2)
+
+    reference = laps[int(sector_times.sum(axis=1).argmin())]
+    return MiniSectorResult(
+        drivers=drivers,
+        edges=grid[::GRID_POINTS_PER_SECTOR],
+        sector_times=sector_times,
+        grid=grid,
+        x=np.interp(grid, reference['Distance'], reference['X']),
+        y=np.interp(grid, reference['Distance'], reference['Y']),
+    )
+
+def get_mini_sector_result(year: int, circuit: str, n_sectors: int = DEFAULT_MINI_SECTORS):
+    """레이스 전체 그리드의 미니 섹터 결과 (레이스 + 섹터 수 단위로 프로세스 캐시, 저장소에 없으면 None)"""
+    event_name = resolve_event_name(circuit, year)
+    return _mini_sector_cache.get_or_load((int(year), event_name, int(n_sectors)),
+                                          lambda: _build_mini_sectors(year, event_name, n_sectors))
+
+def _build_mini_sectors(year, event_name, n_sectors):
+    index = telemetry_store.read_index(year, event_name)
+    if index is None:
+        return None
+    fastest_laps = {drv: telemetry_store.read_fastest_lap(year, event_name, drv) for drv in index['drivers']}
+    return compute_mini_sectors(fastest_laps, n_sectors)
+
+def sector_winners(result: MiniSectorResult, drivers=None) -> np.ndarray:
+    """섹터별 최속 드라이버 (drivers 리스트 기준 인덱스). drivers=None이면 전체 그리드."""
+    rows = [result.drivers.index(d) for d in drivers] if drivers else list(range(len(result.drivers)))
+    return result.sector_times[rows].argmin(axis=0)
+
+def mini_sector_dominance_analyze(year, circuit, drivers=None, n_sectors: int = DEFAULT_MINI_SECTORS):
+    """
+    미니 섹터별 최속 드라이버 / 섹터 타임 / 2위와의 격차.
+    drivers를 주면 해당 드라이버(팀메이트 비교 등)만으로 판정하며, 계산은 레이스당 1회 결과를 재사용합니다.
+    return: (DataFrame, 요약 문자열)
+    """
+    result = get_mini_sector_result(year, circuit, n_sectors)
+    if result is None:
+        return None, f"{year} {circuit}: 최속 랩 텔레메트리가 저장되어 있지 않습니다."
+
+    selected = [d for d in (drivers or result.drivers) if d in result.drivers]
+    if not selected:
+        return None, f"요청한 드라이버의 텔레메트리가 없습니다: {drivers}"
+
+    times = result.sector_times[[result.drivers.index(d) for d in selected]]
+    order = np.argsort(times, axis=0)
+    fastest = order[0]
+    best = np.take_along_axis(times, order[:1], axis=0)[0]
+    gap = (np.take_along_axis(times, order[1:2], axis=0)[0] - best) if len(selected) > 1 else np.full(n_sectors, np.nan)
+
+    df = pd.DataFrame({
+        "Sector": np.arange(1, n_sectors + 1),
+        "Start_m": result.edges[:-1].round(0),
+        "End_m": result.edges[1:].round(0),
+        "Fastest": np.array(selected)[fastest],
+        "Time": best.round(3),
+        "Gap_to_2nd": gap.round(3),
+    })
+    wins = df['Fastest'].value_counts()
+    summary = "Mini-sector wins: " + ", ".join(f"{drv} {cnt}" for drv, cnt in wins.items())
+    return df, summary
+
+# =============================================================================
+# 5. 타이어 수명 기준값 (레이스 단위 메모이즈 + 서킷 다년도 합산)
+# =============================================================================
+# 스틴트 길이 테이블(컴파운드, 드라이버, 스틴트, 랩 수)을 레이스마다 한 번만 만들어 두고
+# 통계는 그 테이블에서 요약 → 같은 서킷의 여러 시즌은 테이블을 이어 붙여 한 번에 요약
+TIRE_LIFE_PERCENTILES = (50, 75, 90)
+STINT_LENGTH_COLUMNS = ['Compound', 'Driver', 'Stint', 'Length']
+TIRE_BASELINES = ('race', 'circuit')
+
+_tire_life_cache = BoundedCache()        # (year, event_name) -> (스틴트 길이 테이블, 통계)
+_circuit_tire_cache = BoundedCache()     # (서킷 레이스 튜플, 연도) -> 통계
+
+def _stored_stint_lengths(year, event_name):
+    """메모리 캐시 → 프리웜 아티팩트 → 랩 스토어 순으로 스틴트 길이 테이블 조회 (세션 로드 없음, 없으면 None)"""
+    entry = _tire_life_cache.get_or_load((int(year), event_name), lambda: _read_tire_life(year, event_name))
+    return entry[0] if entry is not None else None
+
+def _read_tire_life(year, event_name):
+    lengths = artifact_store.read_artifact(year, event_name, 'stint_lengths')
+    if lengths is None:
+        laps = lap_store.read_laps(year, event_name, columns=TIRE_LIFE_LAP_COLUMNS)
+        if laps is None:
+            return None
+        lengths = _stint_lengths(laps)
+    return lengths, _summarize_stint_lengths(lengths)
+
+def get_race_tire_stats(year: int, circuit: str, all_laps=None) -> dict:
+    """
+    레이스 1개의 컴파운드별 스틴트 길이 통계 (레이스 단위 메모이즈).
+    all_laps: 이미 로드한 랩이 있으면 넘겨서 다시 읽지 않음
+    """
+    event_name = resolve_event_name(circuit, year)
+
+    def load():
+        entry = _read_tire_life(year, event_name) if all_laps is None else None
+        if entry is not None:
+            return entry
+        laps = all_laps if all_laps is not None else _load_race_laps(year, event_name, TIRE_LIFE_LAP_COLUMNS)[0]
+        lengths = _stint_lengths(laps)
+        return lengths, _summarize_stint_lengths(lengths)
+
+    return _tire_life_cache.get_or_load((int(year), event_name), load)[1]
+
+def circuit_races(circuit: str, year: int = None) -> list:
+    """같은 서킷(Circuit ShortName 기준)에서 열린 캐시된 레이스들 [(year, event_name)] — 이벤트명이 바뀐 해도 포함"""
+    record = resolve_event_record(circuit, year)
+    if record is None:
+        return []
+    track = record.location[1] if record.location else record.event_name
+    return [(r.year, r.event_name) for r in get_resolver().events()
+            if (r.location[1] if r.location else r.event_name) == track]
+
+def get_circuit_tire_stats(circuit: str, year: int = None, years=None) -> dict:
+    """
+    서킷의 여러 시즌 스틴트 길이를 합쳐서 만든 다년도 기준값.
+    year 시즌은 필요하면 로드하고, 나머지 시즌은 저장된 데이터(아티팩트 / 랩 스토어)만 사용합니다.
+    years: 합산할 연도 제한 (None이면 캐시된 전체 시즌)
+    """
+    races = [(y, e) for y, e in circuit_races(circuit, year) if not years or y in years]
+    return _circuit_tire_cache.get_or_load((tuple(races), year), lambda: _build_circuit_tire_stats(races, year))
+
+def _build_circuit_tire_stats(races, year):
+    tables = []
+    for race_year, event_name in races:
+        if year is not None and race_year == int(year):
+            get_race_tire_stats(race_year, event_name)
+        lengths = _stored_stint_lengths(race_year, event_name)
+        if lengths is not None:
+            tables.append(lengths)
+    return _summarize_stint_lengths(pd.concat(tables, ignore_index=True)) if tables else {}
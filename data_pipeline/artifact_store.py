@@ -0,0 +1,144 @@
+# data_pipeline/artifact_store.py
+#
+# 레이스별 파생 결과(아티팩트) 디스크 저장소
+#
+# 배경:
+#   - 스틴트 차트 / 전략 감사 / 타이어 통계는 레이스가 끝나면 바뀌지 않는데
+#     요청마다 랩 테이블을 다시 읽고 다시 계산함
+#   - 시즌 프리웜(data_pipeline/pipelines/prewarm_season.py)이 미리 계산해서 여기에 저장하고
+#     앱(streamlit / analytics / 시뮬레이션 에이전트)은 여기부터 읽는다
+#
+# 저장 위치: data/artifacts/<year>/<Event_Name>/
+#   - <name>.parquet  (DataFrame 아티팩트, 예: stints)
+#   - <name>.json     (그 외 dict / list / 숫자 아티팩트)
+#   - manifest.json   (마지막에 기록 → 있으면 해당 레이스 완료, 프리웜 재시작 시 건너뜀)
+
+import os
+import json
+import time
+import shutil
+import logging
+
+import numpy as np
+import pandas as pd
+
+from data_pipeline.event_resolver import resolve_event
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+ARTIFACT_DIR = os.path.join(PROJECT_ROOT, 'data', 'artifacts')
+
+# 계산 로직이 바뀌면 올려서 기존 아티팩트를 무효화
+ARTIFACT_VERSION = 7
+
+# 프리웜이 레이스마다 만드는 아티팩트
+RACE_ARTIFACTS = ('stints', 'drivers', 'stint_lengths', 'tire_stats', 'audits', 'strategy_inputs')
+
+MANIFEST_FILE = 'manifest.json'
+
+
+# =============================================================================
+# 경로 / 조회
+# =============================================================================
+def artifact_dir(year: int, event_name: str) -> str:
+    """(2024, 'British Grand Prix') -> data/artifacts/2024/British_Grand_Prix"""
+    return os.path.join(ARTIFACT_DIR, str(year), str(event_name).strip().replace(' ', '_'))
+
+
+def read_manifest(year: int, event_name: str):
+    path = os.path.join(artifact_dir(year, event_name), MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"[ArtifactStore] manifest 읽기 실패 ({year} {event_name}): {e}")
+        return None
+
+
+def is_complete(year: int, event_name: str) -> bool:
+    """현재 버전으로 모든 아티팩트가 기록된 레이스인지"""
+    manifest = read_manifest(year, event_name)
+    return (
+        manifest is not None
+        and manifest.get('version') == ARTIFACT_VERSION
+        and set(RACE_ARTIFACTS) <= set(manifest.get('artifacts', {}))
+    )
+
+
+def read_artifact(year: int, event: str, name: str):
+    """
+    저장된 아티팩트를 읽습니다 (없거나 버전이 다르면 None → 호출 측에서 직접 계산).
+    event는 별명/한글도 허용합니다 (이벤트 리졸버로 정식 이름 변환).
+    """
+    event_name = resolve_event(event, year)
+    if event_name is None:
+        return None
+    manifest = read_manifest(year, event_name)
+    if manifest is None or manifest.get('version') != ARTIFACT_VERSION:
+        return None
+    filename = manifest.get('artifacts', {}).get(name)
+    if filename is None:
+        return None
+
+    path = os.path.join(artifact_dir(year, event_name), filename)
+    try:
+        if filename.endswith('.parquet'):
+            return pd.read_parquet(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"[ArtifactStore] 읽기 실패 ({year} {event_name} {name}): {e}")
+        return None
+
+
+# =============================================================================
+# 기록
+# =============================================================================
+def _json_default(value):
+    """numpy 스칼라 / Timedelta 등 json 기본 인코더가 모르는 값 변환"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timedelta):
+        return value.total_seconds()
+    if value is pd.NA or value is pd.NaT:
+        return None
+    return str(value)
+
+
+def write_race_artifacts(year: int, event_name: str, artifacts: dict, timings: dict = None):
+    """
+    레이스 1개의 아티팩트를 기록합니다.
+    임시 폴더에 모두 쓴 뒤 교체하고 manifest를 마지막에 써서, 중간에 죽어도 반쯤 쓴 레이스를 읽지 않습니다.
+    """
+    target_dir = artifact_dir(year, event_name)
+    tmp_dir = f"{target_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    files = {}
+    for name, value in artifacts.items():
+        if isinstance(value, pd.DataFrame):
+            filename = f"{name}.parquet"
+            value.to_parquet(os.path.join(tmp_dir, filename), index=False, compression='zstd')
+        else:
+            filename = f"{name}.json"
+            with open(os.path.join(tmp_dir, filename), 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False, default=_json_default)
+        files[name] = filename
+
+    shutil.rmtree(target_dir, ignore_errors=True)
+    os.replace(tmp_dir, target_dir)
+
+    manifest = {
+        'version': ARTIFACT_VERSION,
+        'year': int(year),
+        'event_name': event_name,
+        'built_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'artifacts': files,
+        'timings': {k: round(v, 3) for k, v in (timings or {}).items()},
+    }
+    with open(os.path.join(target_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
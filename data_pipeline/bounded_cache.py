@@ -0,0 +1,91 @@
+# data_pipeline/bounded_cache.py
+#
+# 레이스 단위 프로세스 캐시 공용 LRU
+#
+# 배경:
+#   - analytics / race_matrix / traffic / pit_loss / driver_index / strategy_sim 이 각자
+#     모듈 전역 dict + Lock 으로 (year, event) 결과를 들고 있었는데 상한이 없어서
+#     Streamlit 프로세스가 사는 동안 본 레이스 수만큼 계속 커짐
+#   - "있는지 확인 → 계산 → 저장" 사이에 락이 없어서 같은 레이스를 동시에 요청하면 둘 다 계산
+#   → 크기 상한이 있는 LRU + 키별 로드 락(single-flight)으로 통일
+#     (로드 중인 키만 락을 들고 있고 로드가 끝나면 지움 → 락 수도 동시 로드 수로 제한)
+
+import os
+import threading
+from collections import OrderedDict
+
+# 캐시 1개당 보관할 최대 항목 수 (레이스 단위 결과 기준)
+RACE_CACHE_SIZE = int(os.getenv("PITWALL_RACE_CACHE_SIZE", "32"))
+
+
+class BoundedCache:
+    """
+    크기 상한이 있는 LRU 캐시 (스레드 안전).
+    get_or_load()는 같은 키를 동시에 요청해도 loader를 한 번만 실행하고, None 결과는 저장하지 않습니다.
+    """
+
+    def __init__(self, maxsize: int = RACE_CACHE_SIZE):
+        self.maxsize = max(1, int(maxsize))
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}      # key -> [로드 락, 대기 중인 스레드 수]
+
+    # -------------------------------------------------------------------------
+    # Public
+    # -------------------------------------------------------------------------
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._put(key, value)
+
+    def get_or_load(self, key, loader):
+        """캐시에 있으면 반환, 없으면 loader()를 키당 한 번만 실행해서 저장 후 반환"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+            slot = self._loading.setdefault(key, [threading.Lock(), 0])
+            slot[1] += 1
+
+        try:
+            with slot[0]:
+                with self._lock:
+                    if key in self._data:   # 먼저 로드한 스레드의 결과
+                        self._data.move_to_end(key)
+                        return self._data[key]
+                value = loader()
+                if value is not None:
+                    self.put(key, value)
+                return value
+        finally:
+            with self._lock:
+                slot[1] -= 1
+                if slot[1] == 0 and self._loading.get(key) is slot:
+                    del self._loading[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    # -------------------------------------------------------------------------
+    # Internal
+    # -------------------------------------------------------------------------
+    def _put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
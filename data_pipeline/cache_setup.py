@@ -0,0 +1,100 @@
+# data_pipeline/cache_setup.py
+#
+# FastF1 캐시 부트스트랩 (프로세스당 1회, 첫 사용 시점)
+#
+# 배경:
+#   - analytics / telemetry_data / streamlit_app(3중 복붙)이 import 시점마다 data/cache 쓰기 테스트
+#   - 읽기 전용 호스트에서는 각자 /tmp/fastf1_cache 로 연도 폴더 symlink 루프를 다시 돔
+#   - calculate_tire_degradation / get_all_drivers_stint_data 는 호출마다 enable_cache (경로도 틀림)
+#   → ensure_cache() 한 곳에서 읽기 전용 여부를 한 번만 판단하고 확정된 캐시 경로를 노출
+#
+# enable_cache()는 SQLite HTTP 캐시를 생성해야 해서 쓰기 권한 필요
+# Streamlit Cloud에서는 data/cache/가 읽기 전용이므로 /tmp에 writable 캐시 생성 후
+# 커밋된 캐시(pickle 파일)를 symlink로 연결
+
+import os
+import logging
+import threading
+
+import fastf1
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+LOCAL_CACHE_DIR = os.path.join(PROJECT_ROOT, 'data', 'cache')
+TMP_CACHE_DIR = '/tmp/fastf1_cache'
+
+_lock = threading.Lock()
+_state = {'cache_dir': None, 'read_only': None}
+
+
+def _is_writable(path: str) -> bool:
+    try:
+        os.makedirs(path, exist_ok=True)
+        probe = os.path.join(path, '.write_test')
+        with open(probe, 'w') as f:
+            f.write('ok')
+        os.remove(probe)
+        return True
+    except (PermissionError, OSError):
+        return False
+
+
+def _link_committed_cache(target_dir: str):
+    """읽기 전용 캐시의 연도 폴더를 writable 캐시 디렉토리에 symlink"""
+    os.makedirs(target_dir, exist_ok=True)
+    if not os.path.exists(LOCAL_CACHE_DIR):
+        return
+    for item in os.listdir(LOCAL_CACHE_DIR):
+        src = os.path.join(LOCAL_CACHE_DIR, item)
+        dst = os.path.join(target_dir, item)
+        if os.path.isdir(src) and not os.path.exists(dst):
+            try:
+                os.symlink(src, dst)
+            except OSError:
+                pass
+
+
+def ensure_cache() -> str:
+    """
+    FastF1 캐시를 활성화하고 확정된 캐시 경로를 반환합니다.
+    여러 번 불러도 실제 작업(쓰기 테스트, symlink, enable_cache)은 프로세스당 1회만 수행됩니다.
+    """
+    if _state['cache_dir'] is not None:
+        return _state['cache_dir']
+
+    with _lock:
+        if _state['cache_dir'] is not None:
+            return _state['cache_dir']
+
+        read_only = not _is_writable(LOCAL_CACHE_DIR)
+        cache_dir = LOCAL_CACHE_DIR
+        if read_only:
+            cache_dir = TMP_CACHE_DIR
+            _link_committed_cache(cache_dir)
+
+        try:
+            fastf1.Cache.enable_cache(cache_dir)
+        except Exception as e:
+            logger.warning(f"[Cache] enable_cache 실패 ({cache_dir}): {e}")
+
+        _state['read_only'] = read_only
+        _state['cache_dir'] = cache_dir
+        logger.info(f"[Cache] FastF1 캐시: {cache_dir} (read_only={read_only})")
+        return cache_dir
+
+
+def get_cache_dir() -> str:
+    """확정된 FastF1 캐시 경로 (필요하면 부트스트랩 수행)"""
+    return ensure_cache()
+
+
+def is_cache_read_only() -> bool:
+    """커밋된 data/cache 가 읽기 전용인지 (필요하면 부트스트랩 수행)"""
+    ensure_cache()
+    return _state['read_only']
+
+
+def restore_cache():
+    """임시 캐시로 우회했던 도구가 원래 캐시 경로로 되돌릴 때 사용"""
+    fastf1.Cache.enable_cache(ensure_cache())
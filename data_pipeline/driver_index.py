@@ -0,0 +1,109 @@
+# data_pipeline/driver_index.py
+#
+# 레이스(세션)별 드라이버 식별자 인덱스
+#
+# 배경:
+#   - analytics._resolve_driver_id 가 호출마다 session.drivers 확인 → results 약어 / 성 boolean 스캔을 반복
+#   - 전술 시뮬레이션은 입력 문자열을 그대로 넘겨서 '베르스타펜', 'Max', 'Verstappen' 같은 입력이 실패
+#   → 레이스를 처음 볼 때 번호 / 약어 / 성 / 풀네임 / DRIVER_MAPPING 별명(한글/영문)을
+#     정식 드라이버 번호로 가는 dict 하나로 만들고, 모든 분석 / 시뮬레이션 진입점이 같은 인덱스를 사용
+
+import logging
+from collections import namedtuple
+
+from data_pipeline.driver_mapping import DRIVER_MAPPING
+from data_pipeline.bounded_cache import BoundedCache
+from data_pipeline.event_resolver import resolve_event_name
+
+logger = logging.getLogger(__name__)
+
+DRIVER_INDEX_COLUMNS = ['DriverNumber', 'Abbreviation', 'FirstName', 'LastName', 'FullName']
+
+DriverIndex = namedtuple('DriverIndex', [
+    'numbers',          # 드라이버 번호 리스트 (결과 순서)
+    'abbreviations',    # 번호 → 약어
+    'lookup',           # 정규화된 식별자 → 번호
+])
+
+_driver_index_cache = BoundedCache()
+
+
+# =============================================================================
+# 빌드
+# =============================================================================
+def _key(identifier) -> str:
+    return ' '.join(str(identifier).split()).upper()
+
+
+def build_driver_index(results) -> DriverIndex:
+    """
+    드라이버 결과 테이블 → DriverIndex.
+    우선순위: 번호 > 약어 > 성 / 풀네임 > DRIVER_MAPPING 별명 > 이름(세션 안에서 겹치지 않을 때만)
+    """
+    records = results.reset_index(drop=True).to_dict('records')
+    numbers = [str(r['DriverNumber']) for r in records]
+    abbreviations = {str(r['DriverNumber']): str(r.get('Abbreviation') or '') for r in records}
+    by_abbreviation = {abbr: number for number, abbr in abbreviations.items() if abbr}
+
+    lookup = {}
+    # 낮은 우선순위부터 채우고 높은 우선순위가 덮어씀
+    first_names = [_key(r.get('FirstName') or '') for r in records]
+    for name, number in zip(first_names, numbers):
+        if name and first_names.count(name) == 1:
+            lookup[name] = number
+    for alias, abbr in DRIVER_MAPPING.items():
+        if abbr in by_abbreviation:
+            lookup[_key(alias)] = by_abbreviation[abbr]
+    for r, number in zip(records, numbers):
+        for col in ('FullName', 'LastName'):
+            if r.get(col):
+                lookup[_key(r[col])] = number
+    lookup.update({abbr: number for abbr, number in by_abbreviation.items()})
+    lookup.update({number: number for number in numbers})
+    return DriverIndex(numbers, abbreviations, lookup)
+
+
+def get_driver_index(year: int, circuit: str, results=None) -> DriverIndex:
+    """
+    레이스 1개의 드라이버 인덱스 (레이스 단위 프로세스 캐시, 처음 1회만 빌드).
+    results가 없으면 랩 스토어 결과 테이블 → 공유 세션 순으로 읽습니다.
+    """
+    event_name = resolve_event_name(circuit, year)
+    return _driver_index_cache.get_or_load(
+        (int(year), event_name),
+        lambda: build_driver_index(results if results is not None else _load_results(year, event_name)),
+    )
+
+
+def index_session(session) -> DriverIndex:
+    """로드된 세션의 결과 테이블로 인덱스를 빌드해서 캐시에 등록 (세션 레지스트리가 로드 직후 호출)"""
+    key = (int(session.event.year), session.event['EventName'])
+    index = build_driver_index(session.results)
+    _driver_index_cache.put(key, index)
+    return index
+
+
+def _load_results(year, event_name):
+    from data_pipeline import lap_store
+    from data_pipeline.session_registry import load_session
+
+    results = lap_store.read_results(year, event_name)
+    if results is None:
+        results = load_session(year, event_name, 'R').results
+    return results
+
+
+# =============================================================================
+# 조회
+# =============================================================================
+def resolve_driver(index: DriverIndex, identifier):
+    """번호 / 약어 / 성 / 풀네임 / 별명 → 정식 드라이버 번호 (없으면 None)"""
+    if identifier is None:
+        return None
+    return index.lookup.get(_key(identifier))
+
+
+def resolve_abbreviation(index: DriverIndex, identifier):
+    """번호 / 약어 / 성 / 풀네임 / 별명 → 드라이버 약어 (없으면 None)"""
+    number = resolve_driver(index, identifier)
+    return index.abbreviations.get(number) if number else None
@@ -0,0 +1,42 @@
+# data_pipeline/driver_mapping.py
+#
+# 드라이버 이름(한글/영문/별명) → 3글자 약어 매핑
+# telemetry_data(matplotlib/fastf1 plotting 포함) 전체를 import하지 않고도
+# Streamlit 드롭다운 / 드라이버 인덱스(driver_index) 등에서 쓸 수 있도록 분리한 경량 모듈
+# (data_pipeline이 app에 의존하지 않도록 여기 두고 app.tools.driver_mapping은 재노출만 함)
+
+DRIVER_MAPPING = {
+    # Red Bull
+    '베르스타펜': 'VER', '막스': 'VER', 'Verstappen': 'VER', 'Max': 'VER',
+    '츠노다': 'TSU', 'Tsunoda': 'TSU',
+    # Cadillac
+    '보타스': 'BOT', 'Bottas': 'BOT', 'Valteri': 'BOT',
+    '페레즈': 'PER', '체코': 'PER', 'Perez': 'PER', 'Sergio': 'PER',
+    # McLaren
+    '노리스': 'NOR', '랜도': 'NOR', 'Norris': 'NOR', 'Lando': 'NOR',
+    '피아스트리': 'PIA', '오스카': 'PIA', 'Piastri': 'PIA', 'Oscar': 'PIA',
+    # Ferrari
+    '르클레르': 'LEC', '샤를': 'LEC', 'Leclerc': 'LEC', 'Charles': 'LEC',
+    '해밀턴': 'HAM', '루이스': 'HAM', 'Hamilton': 'HAM', 'Lewis': 'HAM',
+    # Williams
+    '알본': 'ALB', 'Albon': 'ALB',
+    '사인츠': 'SAI', '카를로스': 'SAI', 'Sainz': 'SAI', 'Carlos': 'SAI',
+    # Mercedes
+    '안토넬리': 'ANT', 'Antonelli': 'ANT',
+    '러셀': 'RUS', '조지': 'RUS', 'Russell': 'RUS', 'George': 'RUS',
+    # Aston Martin
+    '알론소': 'ALO', 'Alonso': 'ALO',
+    '스트롤': 'STR', 'Stroll': 'STR',
+    # Alpine
+    '가슬리': 'GAS', 'Pierre': 'GAS',
+    '콜라핀토': 'COL' , '콜라': 'COL',
+    # Haas
+    '베어만': 'BEA' , '올리' : 'BEA',
+    '오콘': 'OCO', '에스테반':'OCO',
+    # VCAR
+    '로슨': 'LAW', '리암 로슨': 'LAW',
+    '린드블라드': 'LIN' , '린블': 'LIN',
+    # Audi
+    '휠켄버그': 'HUL' , '헐크': 'HUL' , '니코 휠켄버그': 'HUL',
+    '보톨레토': 'BOR' , '가비': 'BOR'
+}
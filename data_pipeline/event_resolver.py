@@ -0,0 +1,253 @@
+# data_pipeline/event_resolver.py
+#
+# 그랑프리 이름 통합 리졸버
+#
+# 배경:
+#   - TRACK_ALIASES + os.listdir(year_dir) 부분 문자열 스캔이 analytics / telemetry_data /
+#     streamlit_app / 도미넌스 폴백 경로에 복붙되어 있었고, GP_MAPPING / GP_MAP 도 따로 존재
+#   - 요청마다 디렉토리를 스캔하고, 살짝 틀린 이름은 FastF1 네트워크 로드로 새어 나감
+#   - 여기서 캐시 트리 + 각 레이스의 session_info(이벤트 스케줄 정보)로 인덱스를 한 번 만들고
+#     정식 명칭 / 국가명 / 서킷 별명 / 한글 라벨 / 악센트 제거 형태를 O(1)로 조회
+#     (완전 일치 실패 시에만 퍼지 매칭)
+
+import os
+import re
+import pickle
+import difflib
+import logging
+import threading
+import functools
+import unicodedata
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+SOURCE_CACHE_DIR = os.path.join(PROJECT_ROOT, 'data', 'cache')
+
+# year: 시즌, event_name: 'British Grand Prix', folder: '2024-07-07_British_Grand_Prix'
+EventRecord = namedtuple('EventRecord', ['year', 'event_name', 'folder', 'country', 'location'])
+
+# 별명 / 국가 형용사 / 한글 라벨 → 정식 이름 ('Grand Prix' 제외)
+EVENT_ALIASES = {
+    # 국가명 → 그랑프리 형용사 (구 GP_MAPPING)
+    "Hungary": "Hungarian", "Spain": "Spanish", "Italy": "Italian", "Netherlands": "Dutch",
+    "Holland": "Dutch", "Brazil": "São Paulo", "Japan": "Japanese", "China": "Chinese",
+    "Australia": "Australian", "Austria": "Austrian", "Great Britain": "British",
+    "Britain": "British", "UK": "British", "England": "British", "Belgium": "Belgian",
+    "Saudi Arabia": "Saudi Arabian", "Saudi": "Saudi Arabian", "Canada": "Canadian",
+    "Mexico": "Mexico City", "Mexican": "Mexico City", "France": "French",
+    "Portugal": "Portuguese", "Turkey": "Turkish", "Russia": "Russian",
+    "USA": "United States", "US": "United States", "America": "United States",
+    "UAE": "Abu Dhabi", "Imola": "Emilia Romagna", "Sao Paulo": "São Paulo",
+    "S o Paulo": "São Paulo",  # 예전 깨진 폴더명
+    # 서킷 / 도시 별명
+    "Silverstone": "British", "Monza": "Italian", "Spa": "Belgian", "Interlagos": "São Paulo",
+    "Zandvoort": "Dutch", "Suzuka": "Japanese", "Shanghai": "Chinese", "COTA": "United States",
+    "Austin": "United States", "Albert Park": "Australian", "Melbourne": "Australian",
+    "Red Bull Ring": "Austrian", "Spielberg": "Austrian", "Hungaroring": "Hungarian",
+    "Budapest": "Hungarian", "Barcelona": "Spanish", "Catalunya": "Spanish",
+    "Montreal": "Canadian", "Monte Carlo": "Monaco", "Baku": "Azerbaijan",
+    "Marina Bay": "Singapore", "Jeddah": "Saudi Arabian", "Sakhir": "Bahrain",
+    "Yas Marina": "Abu Dhabi", "Lusail": "Qatar", "Losail": "Qatar", "Vegas": "Las Vegas",
+    "Paul Ricard": "French", "Portimao": "Portuguese", "Istanbul": "Turkish", "Sochi": "Russian",
+    "Hermanos Rodriguez": "Mexico City",
+    # 한글 라벨 (UI GP_MAP 및 사용자 입력)
+    "바레인": "Bahrain", "사우디": "Saudi Arabian", "사우디아라비아": "Saudi Arabian",
+    "제다": "Saudi Arabian", "호주": "Australian", "멜버른": "Australian", "일본": "Japanese",
+    "스즈카": "Japanese", "중국": "Chinese", "상하이": "Chinese", "마이애미": "Miami",
+    "이몰라": "Emilia Romagna", "에밀리아로마냐": "Emilia Romagna", "모나코": "Monaco",
+    "캐나다": "Canadian", "몬트리올": "Canadian", "스페인": "Spanish", "바르셀로나": "Spanish",
+    "오스트리아": "Austrian", "스티리아": "Styrian", "영국": "British", "실버스톤": "British",
+    "헝가리": "Hungarian", "벨기에": "Belgian", "스파": "Belgian", "네덜란드": "Dutch",
+    "잔드보르트": "Dutch", "이탈리아": "Italian", "몬자": "Italian", "아제르바이잔": "Azerbaijan",
+    "바쿠": "Azerbaijan", "싱가포르": "Singapore", "미국": "United States", "오스틴": "United States",
+    "멕시코": "Mexico City", "브라질": "São Paulo", "상파울루": "São Paulo",
+    "인터라고스": "São Paulo", "라스베이거스": "Las Vegas", "카타르": "Qatar",
+    "아부다비": "Abu Dhabi", "프랑스": "French", "포르투갈": "Portuguese", "터키": "Turkish",
+    "러시아": "Russian",
+}
+
+_FUZZY_CUTOFF = 0.8
+RESOLVE_CACHE_SIZE = 4096       # (입력 문자열, 연도) 조회 결과 캐시 상한
+_SPLIT_PATTERN = re.compile(r"\s+-\s+|[/|,()]")
+
+
+def normalize_event_name(name) -> str:
+    """악센트 제거 + 소문자 + 영숫자(한글 포함)만 남기고 'Grand Prix' / 'GP' 꼬리 제거"""
+    text = unicodedata.normalize('NFKD', str(name))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = ''.join(ch for ch in text.lower() if ch.isalnum())
+    for suffix in ('grandprix', '그랑프리', 'gp'):
+        if text.endswith(suffix) and len(text) > len(suffix):
+            text = text[:-len(suffix)]
+            break
+    return text
+
+
+class EventResolver:
+    """캐시 트리에서 한 번 만든 인덱스로 그랑프리 이름을 정식 EventName으로 변환합니다."""
+
+    def __init__(self, cache_dir: str = SOURCE_CACHE_DIR):
+        self._by_year = {}      # year -> {정규화 키: EventRecord}
+        self._latest = {}       # 정규화 키 -> EventRecord (연도 미지정/캐시에 없는 연도용)
+        self._build(cache_dir)
+
+    # -------------------------------------------------------------------------
+    # Public
+    # -------------------------------------------------------------------------
+    def resolve(self, name, year: int = None):
+        """이름 → EventRecord (못 찾으면 None). 해당 시즌 캐시에 없으면 다른 시즌 레코드로 답합니다."""
+        if name is None or not str(name).strip():
+            return None
+        index = self._by_year.get(int(year), {}) if year is not None else {}
+
+        # 1) O(1) 완전 일치 (전체 문자열 → 'Hungary - 헝가리' 같은 라벨은 조각별로)
+        candidates = [str(name)] + [p for p in _SPLIT_PATTERN.split(str(name)) if p.strip()]
+        for candidate in candidates:
+            record = self._lookup(normalize_event_name(candidate), index)
+            if record is not None:
+                return record
+
+        # 2) 퍼지 폴백 (오타, 부분 입력)
+        key = normalize_event_name(name)
+        if len(key) < 3:
+            return None
+        for pool in (index, self._latest):
+            prefixed = {r for k, r in pool.items() if k.startswith(key)}
+            if len(prefixed) == 1:
+                return prefixed.pop()
+            match = difflib.get_close_matches(key, list(pool), n=1, cutoff=_FUZZY_CUTOFF)
+            if match:
+                return pool[match[0]]
+        return None
+
+    def events(self, year: int = None) -> list:
+        """캐시에 있는 레이스 목록 (날짜순)"""
+        years = [int(year)] if year is not None else sorted(self._by_year)
+        records = {r for y in years for r in self._by_year.get(y, {}).values()}
+        return sorted(records, key=lambda r: (r.year, r.folder))
+
+    # -------------------------------------------------------------------------
+    # Internal
+    # -------------------------------------------------------------------------
+    def _lookup(self, key: str, index: dict):
+        if not key:
+            return None
+        alias = EVENT_ALIASES_NORMALIZED.get(key)
+        # 해당 시즌 인덱스 우선, 없으면 다른 시즌의 정식 이름 (캐시에 아직 없는 레이스용)
+        for pool in (index, self._latest):
+            for k in (key, alias):
+                if k is not None and k in pool:
+                    return pool[k]
+        return None
+
+    def _build(self, cache_dir: str):
+        if not os.path.isdir(cache_dir):
+            return
+        for year_name in sorted(os.listdir(cache_dir)):
+            if not year_name.isdigit():
+                continue
+            year = int(year_name)
+            year_dir = os.path.join(cache_dir, year_name)
+            records = []
+            for folder_name in sorted(os.listdir(year_dir)):
+                if '_' not in folder_name or not os.path.isdir(os.path.join(year_dir, folder_name)):
+                    continue
+                records.append(self._read_record(year, year_dir, folder_name))
+
+            index = {}
+            # 우선순위: 정식 이름 > 장소/서킷 (연도 내 유일할 때만) > 국가 (유일할 때만)
+            for record in records:
+                index[normalize_event_name(record.event_name)] = record
+            for field in ('location', 'country'):
+                counts = {}
+                for record in records:
+                    for value in getattr(record, field):
+                        key = normalize_event_name(value)
+                        counts.setdefault(key, set()).add(record)
+                for key, matched in counts.items():
+                    if key and len(matched) == 1 and key not in index:
+                        index[key] = next(iter(matched))
+
+            self._by_year[year] = index
+            self._latest.update(index)
+
+    @staticmethod
+    def _read_record(year: int, year_dir: str, folder_name: str) -> EventRecord:
+        """폴더명 + session_info.ff1pkl(Meeting 정보)에서 레코드 생성"""
+        date, event_part = folder_name.split('_', 1)
+        event_name = event_part.replace('_', ' ')
+        country, location = (), ()
+        info_path = os.path.join(year_dir, folder_name, f"{date}_Race", 'session_info.ff1pkl')
+        try:
+            with open(info_path, 'rb') as f:
+                meeting = pickle.load(f)['data']['Meeting']
+            country = (meeting['Country']['Name'], meeting['Country'].get('Code', ''))
+            location = (meeting['Location'], meeting['Circuit']['ShortName'])
+        except Exception as e:
+            logger.debug(f"[EventResolver] session_info 읽기 실패 ({folder_name}): {e}")
+        return EventRecord(year, event_name, folder_name, country, location)
+
+
+EVENT_ALIASES_NORMALIZED = {
+    normalize_event_name(alias): normalize_event_name(target) for alias, target in EVENT_ALIASES.items()
+}
+
+
+# =============================================================================
+# 전역 인스턴스 (첫 사용 시 1회 빌드)
+# =============================================================================
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_resolver() -> EventResolver:
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = EventResolver()
+    return _resolver
+
+
+def resolve_event_record(name, year: int = None):
+    if name is None:
+        return None
+    return _resolve_cached(str(name), int(year) if year is not None else None)
+
+
+@functools.lru_cache(maxsize=RESOLVE_CACHE_SIZE)
+def _resolve_cached(name: str, year):
+    return get_resolver().resolve(name, year)
+
+
+def resolve_event(name, year: int = None):
+    """'Silverstone' / '영국' / 'British - 영국' → 'British Grand Prix' (못 찾으면 None)"""
+    record = resolve_event_record(name, year)
+    return record.event_name if record else None
+
+
+def resolve_event_name(name, year: int = None) -> str:
+    """resolve_event()와 같지만 못 찾으면 입력을 그대로 반환 (FastF1 자체 매칭에 맡김)"""
+    return resolve_event(name, year) or name
+
+
+def event_key(name, year: int = None) -> str:
+    """
+    DB 조회 키: 정식 EventName의 정규화 형태 ('Hungary - 헝가리' / 'Hungarian Grand Prix' → 'hungarian').
+    캐시에 없는 이벤트는 별명 표(EVENT_ALIASES)까지만 적용 ('Brazil' → 'saopaulo')
+    """
+    record = resolve_event_record(name, year)
+    if record is not None:
+        return normalize_event_name(record.event_name)
+    key = normalize_event_name(name)
+    return EVENT_ALIASES_NORMALIZED.get(key, key)
+
+
+def resolve_event_folder(year: int, name):
+    """캐시 폴더명 반환: (2024, 'Silverstone') → '2024-07-07_British_Grand_Prix'"""
+    record = resolve_event_record(name, year)
+    if record is None or record.year != int(year):
+        return None
+    return record.folder
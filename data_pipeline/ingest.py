@@ -0,0 +1,365 @@
+# data_pipeline/ingest.py
+#
+# 레이스 결과 DB(data/f1_data.db) 적재 엔진 — 결과 / 랩 / 날씨
+#
+# 배경:
+#   - init_historical 이 라운드를 하나씩 순서대로 로드하고 매번 10초 고정 대기 → 2021~2025 적재에 몇 시간
+#   - update_db.save_to_sqlite 는 테이블마다 연결을 새로 열고 to_sql append (중복 방지 없음)
+#   → 세션 로드 + 테이블 변환은 프로세스 풀에서 미리 가져오고(prefetch, 동시 요청 수 제한),
+#     FastF1 API 호출은 고정 대기 대신 토큰 버킷으로 제한 (메인 프로세스가 제출 시점에 토큰 사용)
+#     (로컬 ff1pkl 캐시에 있는 레이스는 네트워크를 안 타므로 토큰 없이 바로 제출)
+#   - 쓰기는 메인 스레드 연결 하나에서 레이스당 트랜잭션 1개: 기존 행 삭제 + executemany 삽입 + 진행 기록
+#   - ingest_progress 테이블에 완료된 레이스를 기록해서 중단 후 다시 실행하면 남은 레이스만 처리
+#   - --cached: FastF1 스케줄 대신 로컬 캐시에 있는 레이스(lap_store.iter_cached_races)를 이벤트 이름으로
+#     공유 세션 로더(session_registry)에서 로드 → API 호출 없이 적재 (tests/check_ingest.py)
+#
+# 사용: python -m data_pipeline.ingest --years 2021 2025 [--workers 4] [--rate 0.2] [--overwrite] [--cached]
+
+import os
+import sys
+import time
+import logging
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from data_pipeline import race_db
+from data_pipeline.event_resolver import resolve_event_folder, event_key
+
+logger = logging.getLogger(__name__)
+
+# FastF1 API 세션 로드 속도 제한 (초당 로드 수 / 연속 허용 수). 캐시에 있는 레이스는 제한 없음
+INGEST_RATE = float(os.getenv("PITWALL_INGEST_RATE", "0.2"))
+INGEST_BURST = int(os.getenv("PITWALL_INGEST_BURST", "3"))
+INGEST_WORKERS = 4
+INGEST_PREFETCH = 2     # 워커당 미리 제출해 둘 레이스 수 (결과 DataFrame이 메모리에 쌓이는 상한)
+
+# 테이블별 컬럼: 기존 DB(tests/f1_test.db)와 같은 이름 / 순서 (시간은 초 단위 *_Sec)
+# + race_db 마이그레이션 스키마의 Year / event_key / round
+TABLE_COLUMNS = {
+    'race_results': {
+        'RaceID': 'TEXT', 'Year': 'INTEGER', 'Circuit': 'TEXT', 'Driver': 'TEXT', 'TeamName': 'TEXT',
+        'Position': 'INTEGER', 'GridPosition': 'INTEGER', 'Points': 'REAL', 'Status': 'TEXT',
+        'event_key': 'TEXT', 'round': 'INTEGER',
+    },
+    'lap_times': {
+        'RaceID': 'TEXT', 'Driver': 'TEXT', 'LapNumber': 'INTEGER', 'Stint': 'INTEGER', 'Compound': 'TEXT',
+        'TyreLife': 'INTEGER', 'FreshTyre': 'TEXT', 'LapTime_Sec': 'REAL', 'Sector1_Sec': 'REAL',
+        'Sector2_Sec': 'REAL', 'Sector3_Sec': 'REAL', 'IsAccurate': 'TEXT',
+        'Year': 'INTEGER', 'event_key': 'TEXT', 'round': 'INTEGER',
+    },
+    'weather_data': {
+        'RaceID': 'TEXT', 'Time_Sec': 'REAL', 'AirTemp': 'REAL', 'Humidity': 'REAL', 'Pressure': 'REAL',
+        'Rainfall': 'TEXT', 'TrackTemp': 'REAL', 'WindDirection': 'INTEGER', 'WindSpeed': 'REAL',
+        'Year': 'INTEGER', 'event_key': 'TEXT', 'round': 'INTEGER',
+    },
+}
+
+# FastF1 날씨 컬럼 (Time → Time_Sec 는 초 단위로 변환)
+WEATHER_COLUMNS = ['Time', 'AirTemp', 'Humidity', 'Pressure', 'Rainfall', 'TrackTemp', 'WindDirection', 'WindSpeed']
+
+PROGRESS_TABLE = 'ingest_progress'
+PROGRESS_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {PROGRESS_TABLE} (
+        Year INTEGER NOT NULL,
+        event_key TEXT NOT NULL,
+        RaceID TEXT,
+        round INTEGER,
+        Status TEXT NOT NULL,
+        Rows INTEGER,
+        Error TEXT,
+        UpdatedAt TEXT,
+        PRIMARY KEY (Year, event_key)
+    )
+"""
+
+
+class TokenBucket:
+    """초당 rate개씩 토큰이 차는 버킷 (최대 burst개, rate <= 0 이면 제한 없음). acquire()는 토큰이 생길 때까지 대기 (스레드 안전)"""
+
+    def __init__(self, rate: float = INGEST_RATE, burst: int = INGEST_BURST):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """토큰 1개 사용. return: 대기한 시간 (s)"""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+# =============================================================================
+# 대상 레이스 / 세션 → 테이블 행
+# =============================================================================
+def season_races(year: int) -> list:
+    """이미 끝난 시즌 레이스 [(year, round, EventName)] (FastF1 이벤트 스케줄, 테스트 세션 제외)"""
+    import fastf1
+    from data_pipeline.cache_setup import ensure_cache
+
+    ensure_cache()
+    schedule = fastf1.get_event_schedule(int(year), include_testing=False)
+    finished = schedule[(schedule['EventDate'] < datetime.now()) & (schedule['RoundNumber'] > 0)]
+    return [(int(year), int(r), name) for r, name in zip(finished['RoundNumber'], finished['EventName'])]
+
+
+def cached_races(years=None) -> list:
+    """로컬 ff1pkl 캐시에 있는 레이스 [(year, None, EventName)] (라운드는 세션을 로드할 때 채움)"""
+    from data_pipeline.lap_store import iter_cached_races
+
+    return [(int(year), None, event_name) for year, event_name in iter_cached_races(years)]
+
+
+def _seconds(series):
+    return series.dt.total_seconds() if pd.api.types.is_timedelta64_dtype(series) else series
+
+
+def race_frames(session, year: int, round_number: int) -> dict:
+    """로드된 레이스 세션 → {테이블: DataFrame} (TABLE_COLUMNS 컬럼 순서, RaceID는 기존 '2023_Las_Vegas_Grand_Prix_R' 형식)"""
+    event_name = session.event['EventName']
+    results = pd.DataFrame(session.results)
+    laps = pd.DataFrame(session.laps)
+    try:
+        weather = pd.DataFrame(session.weather_data)
+    except Exception as e:   # 날씨 피드가 없는 세션은 결과 / 랩만 적재
+        logger.warning(f"[Ingest] {year} {event_name} 날씨 데이터 없음: {e}")
+        weather = pd.DataFrame()
+    weather = weather.reindex(columns=WEATHER_COLUMNS)
+
+    frames = {
+        'race_results': pd.DataFrame({
+            'Circuit': session.event['Location'],
+            'Position': results['Position'],
+            'Driver': results['Abbreviation'],
+            'TeamName': results['TeamName'],
+            'GridPosition': results['GridPosition'],
+            'Points': results['Points'],
+            'Status': results['Status'],
+        }),
+        'lap_times': pd.DataFrame({
+            'Driver': laps['Driver'],
+            'LapNumber': laps['LapNumber'],
+            'Stint': laps['Stint'],
+            'Compound': laps['Compound'],
+            'TyreLife': laps['TyreLife'],
+            'FreshTyre': laps['FreshTyre'],
+            'LapTime_Sec': _seconds(laps['LapTime']),
+            'Sector1_Sec': _seconds(laps['Sector1Time']),
+            'Sector2_Sec': _seconds(laps['Sector2Time']),
+            'Sector3_Sec': _seconds(laps['Sector3Time']),
+            'IsAccurate': laps['IsAccurate'],
+        }),
+        'weather_data': weather.drop(columns='Time').assign(Time_Sec=_seconds(weather['Time'])),
+    }
+    race_id = race_db.race_id(year, event_name)
+    for table, df in frames.items():
+        df = race_db.tag_event_columns(df.assign(Year=int(year), RaceID=race_id), year, event_name, round_number)
+        frames[table] = df[list(TABLE_COLUMNS[table])]
+    return frames
+
+
+def fetch_race(year: int, round_number: int, event_name: str):
+    """
+    레이스 1개를 FastF1 API(라운드 번호)로 로드해서 테이블 행으로 변환 (워커 프로세스에서 실행).
+    return: (frames, 라운드, 소요 시간)
+    """
+    import fastf1
+    from data_pipeline.cache_setup import ensure_cache
+
+    ensure_cache()
+    start = time.perf_counter()
+    session = fastf1.get_session(int(year), int(round_number), 'R')
+    session.load(laps=True, telemetry=False, weather=True, messages=False)
+    frames = race_frames(session, year, round_number)
+    return frames, round_number, time.perf_counter() - start
+
+
+def fetch_cached_race(year: int, round_number, event_name: str):
+    """
+    로컬 캐시에 있는 레이스 1개를 이벤트 이름으로 로드해서 테이블 행으로 변환 (워커 프로세스에서 실행).
+    return: (frames, 라운드, 소요 시간)
+    """
+    from data_pipeline.session_registry import load_session
+
+    if not is_cached(year, event_name):
+        raise ValueError(f"로컬 캐시에 없는 레이스: {year} {event_name}")
+    start = time.perf_counter()
+    session = load_session(int(year), event_name, 'R', laps=True, weather=True)
+    if round_number is None:
+        round_number = int(session.event['RoundNumber'])
+    frames = race_frames(session, year, round_number)
+    return frames, round_number, time.perf_counter() - start
+
+
+def is_cached(year: int, event_name: str) -> bool:
+    """로컬 ff1pkl 캐시에 있는 레이스인지 (있으면 API 호출 없이 로드되므로 속도 제한 제외)"""
+    return resolve_event_folder(year, event_name) is not None
+
+
+# =============================================================================
+# 쓰기 (레이스당 트랜잭션 1개)
+# =============================================================================
+def ensure_tables(conn):
+    """
+    적재 테이블 / 진행 테이블 생성, 기존 테이블에 없는 컬럼(Year / event_key / round) 추가 후 마이그레이션.
+    마이그레이션이 기존 행의 Year / event_key 를 채우므로 write_race의 삭제가 이전에 적재된 행에도 걸림
+    """
+    for table, columns in TABLE_COLUMNS.items():
+        definition = ', '.join(f'"{col}" {sql_type}' for col, sql_type in columns.items())
+        conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({definition})')
+        existing = {row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+        for col, sql_type in columns.items():
+            if col not in existing:
+                conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{col}" {sql_type}')
+    conn.execute(PROGRESS_SQL)
+    race_db.migrate_schema(conn)
+
+
+def write_race(conn, race, frames: dict) -> int:
+    """
+    레이스 1개((year, round, EventName))의 결과 / 랩 / 날씨를 한 트랜잭션으로 교체
+    (같은 Year + event_key 행 삭제 → executemany 삽입 → 진행 기록). 결과 행이 없는 레이스도 기록됨.
+    return: 삽입한 행 수
+    """
+    year, round_number, event_name = int(race[0]), race[1], race[2]
+    key, race_id = event_key(event_name, year), race_db.race_id(year, event_name)
+    rows = 0
+    with conn:
+        for table, df in frames.items():
+            columns = list(TABLE_COLUMNS[table])
+            conn.execute(f'DELETE FROM "{table}" WHERE Year = ? AND event_key = ?', (year, key))
+            placeholders = ', '.join('?' * len(columns))
+            names = ', '.join(f'"{col}"' for col in columns)
+            values = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+            conn.executemany(f'INSERT INTO "{table}" ({names}) VALUES ({placeholders})', values)
+            rows += len(df)
+        _record_progress(conn, year, key, race_id, round_number, 'done', rows)
+    return rows
+
+
+def _record_progress(conn, year, key, race_id, round_number, status, rows=None, error=None):
+    conn.execute(
+        f'INSERT OR REPLACE INTO {PROGRESS_TABLE} (Year, event_key, RaceID, round, Status, Rows, Error, UpdatedAt) '
+        f'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        (int(year), key, race_id, None if round_number is None or pd.isna(round_number) else int(round_number),
+         status, rows, error, datetime.now().isoformat(timespec='seconds')),
+    )
+
+
+def completed_races(conn) -> set:
+    """진행 테이블에서 완료된 (Year, event_key)"""
+    return set(conn.execute(f"SELECT Year, event_key FROM {PROGRESS_TABLE} WHERE Status = 'done'").fetchall())
+
+
+# =============================================================================
+# 오케스트레이션
+# =============================================================================
+def ingest_races(races, db_path: str = race_db.DB_FILE_PATH, workers: int = INGEST_WORKERS,
+                 rate: float = INGEST_RATE, overwrite: bool = False, fetch=fetch_race) -> dict:
+    """
+    [(year, round, EventName)] 를 적재합니다. 완료 기록이 있는 레이스는 건너뜀 (overwrite=True면 다시 적재).
+    fetch: 워커에서 실행할 로더 (fetch_race: API 라운드 번호 / fetch_cached_race: 로컬 캐시 이벤트 이름)
+    return: {'done': n, 'skipped': n, 'failed': n, 'rows': n}
+    """
+    conn = race_db.open_writer(db_path)
+    stats = {'done': 0, 'skipped': 0, 'failed': 0, 'rows': 0}
+    try:
+        ensure_tables(conn)
+        done = set() if overwrite else completed_races(conn)
+        todo = [race for race in races if (race[0], event_key(race[2], race[0])) not in done]
+        stats['skipped'] = len(races) - len(todo)
+        print(f" [Ingest] 대상 {len(races)}개 레이스 중 {stats['skipped']}개 완료됨 → {len(todo)}개 적재")
+        if not todo:
+            return stats
+
+        limiter = TokenBucket(rate)
+        waiting = iter(todo)
+        pending = {}
+        batch_start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                # 제한된 개수만 미리 제출 (API를 타는 레이스는 토큰이 있을 때만)
+                while len(pending) < workers * INGEST_PREFETCH:
+                    race = next(waiting, None)
+                    if race is None:
+                        break
+                    if not is_cached(race[0], race[2]):
+                        limiter.acquire()
+                    pending[pool.submit(fetch, *race)] = race
+                if not pending:
+                    break
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    year, round_number, event_name = pending.pop(future)
+                    try:
+                        frames, round_number, elapsed = future.result()
+                        rows = write_race(conn, (year, round_number, event_name), frames)
+                        stats['done'] += 1
+                        stats['rows'] += rows
+                        print(f"   ✅ {year} R{round_number} {event_name} ({rows:,}행, {elapsed:.2f}s)")
+                    except Exception as e:
+                        stats['failed'] += 1
+                        with conn:
+                            _record_progress(conn, year, event_key(event_name, year),
+                                             race_db.race_id(year, event_name),
+                                             round_number, 'failed', error=str(e)[:500])
+                        print(f"   ❌ {year} R{round_number or '?'} {event_name}: {e}")
+
+        print(f"\n [Ingest] 완료: 적재 {stats['done']} / 실패 {stats['failed']} / {stats['rows']:,}행 "
+              f"(총 {time.perf_counter() - batch_start:.1f}s) → {db_path}")
+        return stats
+    finally:
+        conn.close()
+
+
+def ingest_seasons(years, **kwargs) -> dict:
+    """시즌 단위 적재 (각 시즌의 이미 끝난 레이스 전체)"""
+    races = []
+    for year in sorted(years):
+        try:
+            races.extend(season_races(year))
+        except Exception as e:
+            print(f" {year}년 스케줄 로드 실패: {e}")
+    return ingest_races(races, **kwargs)
+
+
+def ingest_cached(years=None, **kwargs) -> dict:
+    """로컬 캐시에 있는 레이스 전체 적재 (API / 스케줄 호출 없음)"""
+    return ingest_races(cached_races(years), fetch=fetch_cached_race, **kwargs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="레이스 결과 / 랩 / 날씨 DB 적재 (중단 후 이어서 실행 가능)")
+    parser.add_argument('--years', type=int, nargs=2, metavar=('START', 'END'), required=True,
+                        help="대상 연도 범위 (예: --years 2021 2025)")
+    parser.add_argument('--workers', type=int, default=INGEST_WORKERS, help="세션 로드 워커 프로세스 수")
+    parser.add_argument('--rate', type=float, default=INGEST_RATE, help="API 세션 로드 속도 제한 (초당, 0이면 제한 없음)")
+    parser.add_argument('--db', default=race_db.DB_FILE_PATH, help="DB 파일 경로 (기본: data/f1_data.db)")
+    parser.add_argument('--overwrite', action='store_true', help="완료 기록이 있는 레이스도 다시 적재")
+    parser.add_argument('--cached', action='store_true', help="로컬 캐시에 있는 레이스만 이벤트 이름으로 적재 (API 호출 없음)")
+    args = parser.parse_args()
+
+    years = range(args.years[0], args.years[1] + 1)
+    options = dict(db_path=args.db, workers=args.workers, rate=args.rate, overwrite=args.overwrite)
+    if args.cached:
+        ingest_cached(set(years), **options)
+    else:
+        ingest_seasons(years, **options)
@@ -0,0 +1,189 @@
+# data_pipeline/lap_store.py
+#
+# ff1pkl 캐시에서 파생한 레이스별 컬럼형(Parquet) 랩 테이블
+#
+# 배경:
+#   - 도구 호출마다 _extended_timing_data / timing_app_data pickle을 풀고
+#     FastF1 전체 파싱 경로로 session.laps를 다시 만든다 (콜드 스틴트 차트 로드의 대부분)
+#   - 실제로 읽는 컬럼은 몇 개 안 됨 → 1회 빌드로 필요한 컬럼만 Parquet에 저장하고
+#     전략/스틴트 코드는 컬럼 프로젝션으로 읽어서 FastF1 load를 건너뛴다
+#
+# 저장 위치: data/lap_store/<year>/<Event_Name>.parquet          (랩 테이블)
+#            data/lap_store/<year>/<Event_Name>.results.parquet  (드라이버/결과 테이블)
+#            data/lap_store/<year>/<Event_Name>.matrix.npz       (누적 레이스 시간 행렬, race_matrix.py)
+#
+# 빌드: python -m data_pipeline.lap_store --years 2021 2025
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+import pandas as pd
+from fastf1.core import Laps
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from data_pipeline.session_registry import load_session
+from data_pipeline.event_resolver import resolve_event, get_resolver, SOURCE_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+LAP_STORE_DIR = os.path.join(PROJECT_ROOT, 'data', 'lap_store')
+
+# 랩 테이블 컬럼 (session.laps와 같은 이름/타입 → 기존 pick_* 코드 그대로 사용 가능)
+LAP_COLUMNS = [
+    'Driver', 'DriverNumber', 'Team', 'LapNumber', 'LapTime',
+    'Time', 'LapStartTime',                   # 랩 종료/시작 세션 시각
+    'Stint', 'Compound', 'TyreLife', 'FreshTyre',
+    'TrackStatus', 'PitInTime', 'PitOutTime',
+    'Position', 'IsAccurate',
+]
+
+RESULT_COLUMNS = [
+    'DriverNumber', 'Abbreviation', 'FirstName', 'LastName', 'FullName',
+    'TeamName', 'Position', 'ClassifiedPosition', 'GridPosition', 'Status', 'Points',
+]
+
+
+# =============================================================================
+# 경로 / 조회
+# =============================================================================
+def lap_store_path(year: int, event_name: str, kind: str = 'laps', ext: str = 'parquet') -> str:
+    """('British Grand Prix', 'laps') -> data/lap_store/2024/British_Grand_Prix.parquet"""
+    stem = str(event_name).strip().replace(' ', '_')
+    suffix = f'.{ext}' if kind == 'laps' else f'.{kind}.{ext}'
+    return os.path.join(LAP_STORE_DIR, str(year), stem + suffix)
+
+
+def _find_stored_event(year: int, event: str):
+    """입력 이름(별명/한글 포함)에 해당하는 저장된 레이스 이름을 찾습니다."""
+    event_name = resolve_event(event, year)
+    if event_name is None or not os.path.exists(lap_store_path(year, event_name)):
+        return None
+    return event_name
+
+
+def read_laps(year: int, event: str, columns: list = None):
+    """
+    저장된 랩 테이블을 읽습니다 (없으면 None → 호출 측에서 FastF1 로드로 폴백).
+    columns를 주면 해당 컬럼만 디스크에서 읽습니다.
+    반환 타입은 fastf1.core.Laps 라서 pick_driver / pick_quicklaps 등이 그대로 동작합니다.
+    """
+    event_name = _find_stored_event(year, event)
+    if event_name is None:
+        return None
+    try:
+        df = pd.read_parquet(lap_store_path(year, event_name), columns=columns)
+    except Exception as e:
+        logger.warning(f"[LapStore] 읽기 실패 ({year} {event_name}): {e}")
+        return None
+    return Laps(df)
+
+
+def read_results(year: int, event: str, columns: list = None):
+    """저장된 드라이버/결과 테이블 (결과 순서 유지). 없으면 None."""
+    event_name = _find_stored_event(year, event)
+    if event_name is None:
+        return None
+    path = lap_store_path(year, event_name, kind='results')
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path, columns=columns)
+    except Exception as e:
+        logger.warning(f"[LapStore] 결과 읽기 실패 ({year} {event_name}): {e}")
+        return None
+
+
+# =============================================================================
+# 빌드
+# =============================================================================
+def _laps_frame(session) -> pd.DataFrame:
+    laps = pd.DataFrame(session.laps)
+    df = laps[[c for c in LAP_COLUMNS if c in laps.columns]].copy()
+    for col in ('Driver', 'DriverNumber', 'Team', 'Compound', 'TrackStatus'):
+        if col in df.columns:
+            df[col] = df[col].astype('string')
+    for col in ('LapNumber', 'Stint', 'TyreLife', 'Position'):
+        if col in df.columns:
+            df[col] = df[col].astype('float32')
+    return df.reset_index(drop=True)
+
+
+def _results_frame(session) -> pd.DataFrame:
+    results = pd.DataFrame(session.results)
+    df = results[[c for c in RESULT_COLUMNS if c in results.columns]].copy()
+    df['DriverNumber'] = df['DriverNumber'].astype(str)
+    return df.reset_index(drop=True)
+
+
+def build_race(year: int, event_name: str, overwrite: bool = False) -> bool:
+    """
+    레이스 1개를 로드해서 랩/결과 Parquet과 레이스 시간 행렬을 씁니다. 이미 있으면 건너뜁니다.
+    (랩/결과만 있고 행렬이 없는 레이스는 저장된 Parquet에서 행렬만 만듭니다)
+    """
+    from data_pipeline import race_matrix
+
+    laps_path = lap_store_path(year, event_name)
+    results_path = lap_store_path(year, event_name, kind='results')
+    if not overwrite and os.path.exists(laps_path) and os.path.exists(results_path):
+        if not os.path.exists(race_matrix.matrix_path(year, event_name)):
+            race_matrix.build_stored_matrix(year, event_name,
+                                            pd.read_parquet(laps_path, columns=race_matrix.MATRIX_LAP_COLUMNS),
+                                            pd.read_parquet(results_path))
+        return False
+
+    session = load_session(year, event_name, 'R')
+    os.makedirs(os.path.dirname(laps_path), exist_ok=True)
+    laps, results = _laps_frame(session), _results_frame(session)
+    laps.to_parquet(laps_path, index=False, compression='zstd')
+    results.to_parquet(results_path, index=False, compression='zstd')
+    race_matrix.build_stored_matrix(year, event_name, laps, results)
+    return True
+
+
+def iter_cached_races(years=None):
+    """
+    캐시에 있는 레이스를 순회합니다 (이벤트 리졸버 인덱스 사용, <date>_Race 세션 폴더가 있는 이벤트만).
+    yield: (year, 'British Grand Prix')
+    """
+    for record in get_resolver().events():
+        if years and record.year not in years:
+            continue
+        event_dir = os.path.join(SOURCE_CACHE_DIR, str(record.year), record.folder)
+        if not any(name.endswith('_Race') for name in os.listdir(event_dir)):
+            continue
+        yield record.year, record.event_name
+
+
+def build_lap_store(years=None, overwrite: bool = False):
+    """캐시에 있는 모든 레이스의 랩 테이블을 빌드합니다 (1회성)."""
+    built, skipped, failed = 0, 0, 0
+    for year, event_name in iter_cached_races(years):
+        start = time.perf_counter()
+        try:
+            if build_race(year, event_name, overwrite=overwrite):
+                built += 1
+                print(f"   ✅ {year} {event_name} ({time.perf_counter() - start:.2f}s)")
+            else:
+                skipped += 1
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {year} {event_name}: {e}")
+    print(f"\n [LapStore] 완료: 빌드 {built} / 건너뜀 {skipped} / 실패 {failed}")
+
+
+if __name__ == "__main__":
+    from data_pipeline.cache_setup import ensure_cache
+
+    parser = argparse.ArgumentParser(description="ff1pkl 캐시 → Parquet 랩 테이블 빌드")
+    parser.add_argument('--years', type=int, nargs=2, metavar=('START', 'END'),
+                        help="빌드할 연도 범위 (예: --years 2021 2025)")
+    parser.add_argument('--overwrite', action='store_true', help="이미 있는 테이블도 다시 빌드")
+    args = parser.parse_args()
+
+    ensure_cache()
+    target_years = set(range(args.years[0], args.years[1] + 1)) if args.years else None
+    build_lap_store(target_years, overwrite=args.overwrite)
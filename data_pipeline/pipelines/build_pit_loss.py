@@ -0,0 +1,33 @@
+## 캐시된 전체 레이스의 피트 스탑별 손실 시간(인 랩 + 아웃 랩 - 필드 기준)을 계산해
+# 서킷 × 시즌 × 상황(그린 / SC / VSC) 피트 로스 표(data/pit_loss/pit_loss.parquet)로 저장하는 배치 잡
+#
+# 사용: python -m data_pipeline.pipelines.build_pit_loss [--years 2021 2026] [--workers 4] [--overwrite]
+# 이미 표에 있는 레이스는 건너뛰고 새 레이스만 계산해서 기존 표에 합침 (data_pipeline/pipelines/race_table_batch.py)
+import sys
+import os
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from data_pipeline import pit_loss
+from data_pipeline.pipelines.race_table_batch import build_race_table, build_arg_parser, target_years
+
+
+def pit_loss_race_rows(year, event_name, circuit):
+    """레이스 1개의 상황별 피트 로스 행을 계산합니다 (워커 프로세스에서 실행)."""
+    from data_pipeline.race_matrix import get_race_matrix
+
+    return pit_loss.race_rows(get_race_matrix(year, event_name), year, event_name, circuit)
+
+
+def describe(rows):
+    return ' / '.join(f"{r.Condition} {r.Pit_Loss}s ({r.Stops})" for r in rows.itertuples()) or '스탑 없음'
+
+
+def build_pit_loss(years=None, workers: int = None, overwrite: bool = False):
+    build_race_table(pit_loss.PIT_LOSS_TABLE, pit_loss_race_rows, describe,
+                     years=years, workers=workers, overwrite=overwrite)
+
+
+if __name__ == "__main__":
+    args = build_arg_parser("서킷 × 시즌 × 상황 피트 로스 표 빌드").parse_args()
+    build_pit_loss(target_years(args), workers=args.workers, overwrite=args.overwrite)
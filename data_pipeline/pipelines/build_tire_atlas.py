@@ -0,0 +1,64 @@
+## 캐시된 전체 레이스(2021~2026)의 컴파운드별 페이스 / 스틴트 길이 / 보정 마모율을 계산해
+# 서킷 × 시즌 × 컴파운드 아틀라스(data/tire_atlas/tire_atlas.parquet)로 저장하는 배치 잡
+#
+# 사용: python -m data_pipeline.pipelines.build_tire_atlas [--years 2021 2026] [--workers 4] [--overwrite]
+# 이미 아틀라스에 있는 레이스는 건너뛰고 새 레이스만 계산해서 기존 표에 합침 (data_pipeline/pipelines/race_table_batch.py)
+import sys
+import os
+
+import pandas as pd
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from data_pipeline import tire_atlas
+from data_pipeline.pipelines.race_table_batch import build_race_table, build_arg_parser, target_years
+
+
+def atlas_race_rows(year, event_name, circuit):
+    """레이스 1개의 컴파운드별 아틀라스 행을 계산합니다 (워커 프로세스에서 실행)."""
+    from data_pipeline import analytics
+
+    all_laps, _ = analytics._load_race_laps(year, event_name, analytics.DEG_LAP_COLUMNS)
+    laps = analytics._degradation_laps(all_laps)
+    model = analytics.fit_degradation_model(laps)
+    life = analytics._get_global_tire_stats(all_laps)
+    pace = laps.groupby('Compound')['Time'].mean()
+
+    rows = []
+    for deg in model.compounds.to_dict('records'):
+        compound = deg['Compound']
+        stats = life.get(compound, {})
+        rows.append({
+            'Circuit': circuit,
+            'Year': int(year),
+            'EventName': event_name,
+            'Compound': compound,
+            'Stints': int(deg['Stints']),
+            'Laps': int(deg['Laps']),
+            'Avg_Pace': round(float(pace.get(compound, float('nan'))), 3),
+            'Deg_per_Lap': deg['Deg_per_Lap'],
+            'CI_Low': deg['CI_Low'],
+            'CI_High': deg['CI_High'],
+            'Avg_Stint': round(stats.get('avg', float('nan')), 1),
+            'Max_Stint': stats.get('max'),
+            'P50_Stint': stats.get('p50'),
+            'P75_Stint': stats.get('p75'),
+            'P90_Stint': stats.get('p90'),
+            'Track_Evolution': model.track_evolution,
+            'Version': tire_atlas.ATLAS_VERSION,
+        })
+    return pd.DataFrame(rows, columns=tire_atlas.ATLAS_COLUMNS)
+
+
+def describe(rows):
+    return f"{len(rows)}개 컴파운드"
+
+
+def build_tire_atlas(years=None, workers: int = None, overwrite: bool = False):
+    build_race_table(tire_atlas.ATLAS_TABLE, atlas_race_rows, describe,
+                     years=years, workers=workers, overwrite=overwrite)
+
+
+if __name__ == "__main__":
+    args = build_arg_parser("서킷 × 시즌 × 컴파운드 타이어 아틀라스 빌드").parse_args()
+    build_tire_atlas(target_years(args), workers=args.workers, overwrite=args.overwrite)
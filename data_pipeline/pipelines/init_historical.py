@@ -1,55 +1,34 @@
 ## 2021 ~ 2025 시즌의 FastF1 Hard Data 전원을 DB에 채우는 스크립트
-# 단 1회만 사용
+# 세션 로드는 워커 풀 + 토큰 버킷 속도 제한, 쓰기는 레이스당 트랜잭션 1개 (data_pipeline/ingest.py)
+# 중단돼도 다시 실행하면 ingest_progress 테이블 기준으로 남은 레이스만 적재
 import sys
 import os
-import fastf1
-import time
-from datetime import datetime
+import argparse
 
 # 프로젝트 루트 경로 설정
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
-from data_pipeline.pipelines.update_db import update_race_data
+from data_pipeline import ingest
 
-def init_historical_data_by_year(target_year):
+def init_historical_data_by_year(target_year, workers: int = ingest.INGEST_WORKERS,
+                                 rate: float = ingest.INGEST_RATE, overwrite: bool = False):
     print(f" [History Init] {target_year}년 데이터 적재 시작...")
-    
-    # 캐시 설정
-    if not os.path.exists('./cache'):
-        os.makedirs('./cache')
-    fastf1.Cache.enable_cache('./cache')
-
-    try:
-        schedule = fastf1.get_event_schedule(target_year)
-        completed_races = schedule[schedule['EventDate'] < datetime.now()]
-        
-        print(f"\n {target_year}년 시즌: 총 {len(completed_races)}개 경기 처리 예정")
-        
-        for _, row in completed_races.iterrows():
-            round_num = row['RoundNumber']
-            event_name = row['EventName']
-            
-            if round_num == 0: continue
-                
-            print(f"    Round {round_num}: {event_name} 업데이트 중...")
-            
-            try:
-                update_race_data(target_year, round_num, session='R')
-                
-                # ★ 대기 시간 10초로 증가 (안전빵)
-                print("      API 과부하 방지를 위해 10초 대기...")
-                time.sleep(10) 
-                
-            except Exception as e:
-                print(f"       실패: {e}")
-                time.sleep(10)
-                
-    except Exception as e:
-        print(f" {target_year}년 스케줄 로드 실패: {e}")
-
-    print(f"\n {target_year}년 적재 완료!")
+    stats = ingest.ingest_seasons([target_year], workers=workers, rate=rate, overwrite=overwrite)
+    print(f"\n {target_year}년 적재 완료! (적재 {stats['done']} / 건너뜀 {stats['skipped']} / 실패 {stats['failed']})")
+    return stats
 
 if __name__ == "__main__":
-    # 사용자가 연도를 직접 입력하게 함
-    print("다운로드할 연도를 입력하세요 (예: 2021)")
-    year_input = int(input("Year: "))
-    init_historical_data_by_year(year_input)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="시즌 전체 레이스 결과 / 랩 / 날씨 DB 적재")
+    parser.add_argument('--years', type=int, nargs=2, metavar=('START', 'END'),
+                        help="대상 연도 범위 (예: --years 2021 2025, 없으면 입력받음)")
+    parser.add_argument('--workers', type=int, default=ingest.INGEST_WORKERS, help="세션 로드 워커 프로세스 수")
+    parser.add_argument('--rate', type=float, default=ingest.INGEST_RATE, help="API 세션 로드 속도 제한 (초당, 0이면 제한 없음)")
+    parser.add_argument('--overwrite', action='store_true', help="완료 기록이 있는 레이스도 다시 적재")
+    args = parser.parse_args()
+
+    if args.years:
+        years = range(args.years[0], args.years[1] + 1)
+    else:
+        # 사용자가 연도를 직접 입력하게 함
+        print("다운로드할 연도를 입력하세요 (예: 2021)")
+        years = [int(input("Year: "))]
+    ingest.ingest_seasons(years, workers=args.workers, rate=args.rate, overwrite=args.overwrite)
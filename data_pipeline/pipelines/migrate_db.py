@@ -0,0 +1,38 @@
+## 레이스 결과 DB(data/f1_data.db) 스키마 마이그레이션
+# race_results / lap_times / weather_data 에 event_key / round 컬럼을 추가해서 채우고
+# (Year 컬럼이 없는 lap_times / weather_data 는 RaceID '2023_Las_Vegas_R' 연도 접두어로 Year도 추가)
+# (Year, event_key) / (Year, event_key, Driver) 복합 인덱스를 만든다 (여러 번 실행해도 안전)
+#
+# 사용: python -m data_pipeline.pipelines.migrate_db [--db data/f1_data.db]
+import sys
+import os
+import time
+import argparse
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from data_pipeline import race_db
+
+
+def migrate_db(path: str = race_db.DB_FILE_PATH):
+    if not os.path.exists(path):
+        print(f" [MigrateDB] DB 파일 없음: {path}")
+        return
+
+    start = time.perf_counter()
+    conn = race_db.open_writer(path)
+    try:
+        filled = race_db.migrate_schema(conn)
+    finally:
+        conn.close()
+
+    for table, rows in filled.items():
+        print(f"   ✅ {table}: event_key / round {rows}행 채움")
+    print(f"\n [MigrateDB] 완료: 스키마 v{race_db.SCHEMA_VERSION} ({time.perf_counter() - start:.2f}s) → {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="레이스 결과 DB event_key / round 마이그레이션")
+    parser.add_argument('--db', default=race_db.DB_FILE_PATH, help="DB 파일 경로 (기본: data/f1_data.db)")
+    args = parser.parse_args()
+    migrate_db(args.db)
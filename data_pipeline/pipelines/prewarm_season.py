@@ -0,0 +1,115 @@
+## 레이스 위크엔드 트래픽 전에 캐시된 레이스의 파생 결과를 미리 계산해 두는 스크립트
+# 레이스마다 (스틴트 테이블 / 스틴트 길이·타이어 통계 / 드라이버별 전략 감사 / 몬테카를로 전략 입력)을
+# 워커 프로세스에서 병렬 계산해 data/artifacts 에 저장 → 앱은 아티팩트를 먼저 읽음
+#
+# 사용: python -m data_pipeline.pipelines.prewarm_season --years 2021 2025 [--workers 4] [--overwrite]
+# 중간에 멈춰도 다시 실행하면 완료된 레이스(manifest 있음)는 건너뛰고 이어서 진행
+import sys
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from data_pipeline import artifact_store
+from data_pipeline.event_resolver import get_resolver
+
+
+def prewarm_race(year, event_name):
+    """
+    레이스 1개의 아티팩트를 계산/저장합니다 (워커 프로세스에서 실행).
+    return: (year, event_name, 단계별 소요 시간 dict)
+    """
+    from data_pipeline.cache_setup import ensure_cache
+    from data_pipeline import analytics, pit_loss, strategy_sim
+    from data_pipeline.race_matrix import get_race_matrix
+    from data_pipeline.traffic import get_race_traffic
+
+    ensure_cache()
+    timings = {}
+
+    start = time.perf_counter()
+    all_laps, results = analytics._load_race_laps(year, event_name, None)
+    results = results.reset_index(drop=True)
+    results['DriverNumber'] = results['DriverNumber'].astype(str)
+    timings['load'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    drivers = results[analytics.RESULT_LOOKUP_COLUMNS].fillna('').to_dict('records')
+    stints = analytics.get_stint_table(all_laps, results['Abbreviation'].tolist())
+    timings['stints'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stint_lengths = analytics._stint_lengths(all_laps)
+    tire_stats = analytics._summarize_stint_lengths(stint_lengths)
+    timings['tire_stats'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pit_stops = pit_loss.stop_losses(get_race_matrix(year, event_name))
+    field = analytics._audit_field_stints(all_laps, tire_stats, results, pit_stops,
+                                         pit_loss.circuit_pit_loss(event_name, year),
+                                         get_race_traffic(year, event_name))
+    audits = {
+        driver_number: rows[analytics.AUDIT_COLUMNS].to_dict('records')
+        for driver_number, rows in field.groupby('DriverNumber', sort=False)
+    }
+    timings['audits'] = time.perf_counter() - start
+
+    # 서킷의 이 시즌까지 레이스로 적합한 전략 입력 (드라이 랩이 부족한 레이스는 None → 앱에서 같은 에러)
+    start = time.perf_counter()
+    try:
+        strategy_inputs = strategy_sim.inputs_to_artifact(strategy_sim.fit_strategy_inputs(event_name, year))
+    except ValueError:
+        strategy_inputs = None
+    timings['strategy_inputs'] = time.perf_counter() - start
+
+    artifact_store.write_race_artifacts(year, event_name, {
+        'stints': stints,
+        'drivers': drivers,
+        'stint_lengths': stint_lengths,
+        'tire_stats': tire_stats,
+        'audits': audits,
+        'strategy_inputs': strategy_inputs,
+    }, timings=timings)
+    return year, event_name, timings
+
+
+def prewarm_season(years=None, workers: int = None, overwrite: bool = False):
+    races = [(r.year, r.event_name) for r in get_resolver().events()
+             if not years or r.year in years]
+    todo = [(y, e) for y, e in races if overwrite or not artifact_store.is_complete(y, e)]
+
+    print(f" [Prewarm] 대상 {len(races)}개 레이스 중 {len(races) - len(todo)}개 완료됨 → {len(todo)}개 계산")
+    if not todo:
+        return
+
+    built, failed = 0, 0
+    season_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(prewarm_race, y, e): (y, e) for y, e in todo}
+        for future in as_completed(futures):
+            year, event_name = futures[future]
+            try:
+                _, _, timings = future.result()
+                built += 1
+                detail = ' / '.join(f"{k} {v:.2f}s" for k, v in timings.items())
+                print(f"   ✅ {year} {event_name} ({sum(timings.values()):.2f}s: {detail})")
+            except Exception as e:
+                failed += 1
+                print(f"   ❌ {year} {event_name}: {e}")
+
+    print(f"\n [Prewarm] 완료: 계산 {built} / 실패 {failed} "
+          f"(총 {time.perf_counter() - season_start:.1f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="시즌 프리웜: 캐시된 레이스의 파생 아티팩트를 병렬 계산")
+    parser.add_argument('--years', type=int, nargs=2, metavar=('START', 'END'),
+                        help="대상 연도 범위 (예: --years 2021 2025)")
+    parser.add_argument('--workers', type=int, default=None, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument('--overwrite', action='store_true', help="이미 완료된 레이스도 다시 계산")
+    args = parser.parse_args()
+
+    target_years = set(range(args.years[0], args.years[1] + 1)) if args.years else None
+    prewarm_season(target_years, workers=args.workers, overwrite=args.overwrite)
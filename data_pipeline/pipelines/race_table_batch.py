@@ -0,0 +1,77 @@
+## 캐시된 레이스를 워커 프로세스에서 계산해 VersionedRaceTable(data_pipeline/race_table.py)에 합치는 공용 배치 실행기
+# build_tire_atlas / build_pit_loss 가 레이스 1개 계산 함수와 출력 형식만 넘겨서 사용
+#
+# 이미 표에 현재 버전으로 있는 레이스는 건너뛰고 새 레이스만 계산해서 기존 표에 합침
+import sys
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from data_pipeline.event_resolver import get_resolver
+from data_pipeline.tire_atlas import circuit_key
+
+
+def _race_rows(race_rows, year, event_name, circuit):
+    """
+    레이스 1개의 표 행을 계산합니다 (워커 프로세스에서 실행).
+    return: (year, event_name, DataFrame, 소요 시간)
+    """
+    from data_pipeline.cache_setup import ensure_cache
+
+    ensure_cache()
+    start = time.perf_counter()
+    rows = race_rows(year, event_name, circuit)
+    return year, event_name, rows, time.perf_counter() - start
+
+
+def build_race_table(table, race_rows, describe, years=None, workers: int = None, overwrite: bool = False):
+    """
+    table: VersionedRaceTable
+    race_rows(year, event_name, circuit) -> DataFrame  (모듈 최상위 함수, 워커 프로세스로 넘어감)
+    describe(rows) -> 진행 로그에 붙일 요약 문자열
+    """
+    races = [(r.year, r.event_name, circuit_key(r)) for r in get_resolver().events()
+             if not years or r.year in years]
+    done = set() if overwrite else table.built_races()
+    todo = [race for race in races if (race[0], race[1]) not in done]
+
+    print(f" [{table.tag}] 대상 {len(races)}개 레이스 중 {len(races) - len(todo)}개 완료됨 → {len(todo)}개 계산")
+    if not todo:
+        return
+
+    frames, built, failed = [], set(), 0
+    batch_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_race_rows, race_rows, *race): race for race in todo}
+        for future in as_completed(futures):
+            year, event_name, _ = futures[future]
+            try:
+                _, _, rows, elapsed = future.result()
+                frames.append(rows)
+                built.add((year, event_name))
+                print(f"   ✅ {year} {event_name} ({describe(rows)}, {elapsed:.2f}s)")
+            except Exception as e:
+                failed += 1
+                print(f"   ❌ {year} {event_name}: {e}")
+
+    # 기존 표에서 다시 계산한 레이스를 빼고 새 행을 합쳐서 저장
+    table.replace_races(frames, built)
+
+    print(f"\n [{table.tag}] 완료: 계산 {len(built)} / 실패 {failed} "
+          f"(총 {time.perf_counter() - batch_start:.1f}s) → {table.path}")
+
+
+def build_arg_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--years', type=int, nargs=2, metavar=('START', 'END'),
+                        help="대상 연도 범위 (예: --years 2021 2026)")
+    parser.add_argument('--workers', type=int, default=None, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument('--overwrite', action='store_true', help="이미 계산된 레이스도 다시 계산")
+    return parser
+
+
+def target_years(args):
+    return set(range(args.years[0], args.years[1] + 1)) if args.years else None
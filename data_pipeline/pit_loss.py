@@ -0,0 +1,215 @@
+# data_pipeline/pit_loss.py
+#
+# 서킷 × 시즌 피트 로스 인덱스 (그린 / SC / VSC)
+#
+# 배경:
+#   - calculate_pit_loss_baseline은 시뮬레이션마다 세션 1개로 다시 계산하고, PitInTime과 PitOutTime이
+#     같은 랩 행에 있어야 해서(실제로는 인 랩 / 아웃 랩에 나뉘어 있음) 거의 항상 22.0s 기본값
+#     + 가감속 보정도 3.5s 고정값
+#   → 피트 스탑마다 (인 랩 + 아웃 랩) - 같은 두 랩의 필드 중앙값 - 2 × 드라이버 페이스 차이 = 피트 로스
+#     를 RaceMatrix에서 계산하고, 상황(그린 / SC / VSC)별로 MAD 이상치를 걸러낸 중앙값을 표로 저장
+#   - 시뮬레이터 / 전략 감사는 이 표를 조회만 함 (표에 없는 레이스만 그 자리에서 계산)
+#
+# 저장 위치: data/pit_loss/pit_loss.parquet  (레이스 × 상황 1행)
+# 빌드: python -m data_pipeline.pipelines.build_pit_loss
+
+import os
+import logging
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from data_pipeline.bounded_cache import BoundedCache
+from data_pipeline.race_table import VersionedRaceTable
+from data_pipeline.race_matrix import get_race_matrix, TRACK_GREEN, TRACK_VSC, TRACK_SC
+from data_pipeline.event_resolver import resolve_event_name, resolve_event_record
+from data_pipeline.tire_atlas import circuit_key
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+PIT_LOSS_DIR = os.path.join(PROJECT_ROOT, 'data', 'pit_loss')
+PIT_LOSS_PATH = os.path.join(PIT_LOSS_DIR, 'pit_loss.parquet')
+
+# 계산 방식이 바뀌면 올려서 배치 잡이 전체를 다시 계산하도록 함
+PIT_LOSS_VERSION = 1
+
+CONDITIONS = ('GREEN', 'SC', 'VSC')
+CONDITION_OF = {TRACK_GREEN: 'GREEN', TRACK_VSC: 'VSC', TRACK_SC: 'SC'}
+
+DEFAULT_PIT_LOSS = 22.0
+SC_PIT_LOSS_FACTOR = 0.55       # SC 표본이 없을 때: 다른 차도 느리게 달려서 그린 대비 약 절반
+VSC_PIT_LOSS_FACTOR = 0.7
+OUTLIER_MAD = 3.0               # 중앙값에서 3 × (1.4826 × MAD) 밖이면 이상치 (긴 정차 / 수리 / 페널티)
+MIN_MAD = 0.5                   # 표본이 고르게 몰려 MAD가 0에 가까울 때 하한 (s)
+MIN_STOPS = 3                   # 상황별 값으로 쓰기 위한 최소 스탑 수
+
+STOP_COLUMNS = ['Driver', 'Lap', 'Condition', 'Loss', 'Pit_Lane']
+PIT_LOSS_COLUMNS = [
+    'Circuit', 'Year', 'EventName', 'Condition',
+    'Stops', 'Rejected', 'Pit_Loss', 'Pit_Lane', 'Spread', 'Version',
+]
+
+PIT_LOSS_TABLE = VersionedRaceTable(PIT_LOSS_PATH, PIT_LOSS_COLUMNS, ['Circuit', 'Year', 'Condition'],
+                                    PIT_LOSS_VERSION, 'PitLoss')
+
+# 피트 로스 표 전체 (없으면 None) / 표 전체 교체 저장 / 현재 버전으로 들어 있는 (year, event_name)
+read_pit_loss_table = PIT_LOSS_TABLE.read
+write_pit_loss_table = PIT_LOSS_TABLE.write
+built_races = PIT_LOSS_TABLE.built_races
+
+_race_rows_cache = BoundedCache()
+
+
+# =============================================================================
+# 스탑별 피트 로스 (RaceMatrix)
+# =============================================================================
+def stop_losses(matrix) -> pd.DataFrame:
+    """
+    RaceMatrix → 피트 스탑별 손실 시간.
+      - 필드 기준 랩타임: 피트 인 / 아웃 랩을 뺀 같은 랩의 전체 중앙값 (SC 랩이면 SC 페이스)
+      - 드라이버 페이스 차이: 그린 플래그 클린 랩에서 (내 랩타임 - 필드 기준) 중앙값
+      - 손실 = (인 랩 + 아웃 랩) - (두 랩의 필드 기준) - 2 × 페이스 차이
+    상황은 인 랩 기준 (SC / VSC 중에 피트 인 했는지)
+    """
+    lap_times, pit_in = matrix.lap_times, matrix.pit_in
+    n_drivers, n_laps = lap_times.shape
+    if n_laps < 3:
+        return pd.DataFrame(columns=STOP_COLUMNS)
+
+    out_lap = np.zeros_like(pit_in)
+    out_lap[:, 1:] = pit_in[:, :-1]
+    clean = np.isfinite(lap_times) & ~pit_in & ~out_lap
+    clean[:, 0] = False
+    green = (matrix.track_status == TRACK_GREEN)[None, :]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)   # 전부 NaN인 랩 / 드라이버
+        field = np.nanmedian(np.where(clean, lap_times, np.nan), axis=0)
+        pace_delta = np.nanmedian(np.where(clean & green, lap_times - field, np.nan), axis=1)
+
+    d, p = np.nonzero(pit_in[:, :-1])
+    loss = lap_times[d, p] + lap_times[d, p + 1] - field[p] - field[p + 1] - 2 * pace_delta[d]
+    condition = matrix.track_status[p]
+
+    valid = np.isfinite(loss)
+    df = pd.DataFrame({
+        'Driver': np.array(matrix.drivers)[d[valid]],
+        'Lap': p[valid] + 1,
+        'Condition': [CONDITION_OF[c] for c in condition[valid]],
+        'Loss': loss[valid].round(3),
+        'Pit_Lane': matrix.pit_lane[d[valid], p[valid]].round(3),
+    })
+    return df[STOP_COLUMNS]
+
+
+def summarize_stops(stops) -> pd.DataFrame:
+    """스탑별 손실 → 상황별 (스탑 수, 제외 수, 중앙값, 피트 레인 중앙값, 분산) — MAD 이상치 제외"""
+    rows = []
+    for condition in CONDITIONS:
+        values = stops.loc[stops['Condition'] == condition, 'Loss'].to_numpy(dtype=float)
+        lanes = stops.loc[stops['Condition'] == condition, 'Pit_Lane'].to_numpy(dtype=float)
+        if values.size == 0:
+            continue
+        keep = _inliers(values)
+        if not keep.any():
+            continue
+        kept = values[keep]
+        spread = 1.4826 * np.median(np.abs(kept - np.median(kept)))
+        rows.append({
+            'Condition': condition,
+            'Stops': int(keep.sum()),
+            'Rejected': int((~keep).sum()),
+            'Pit_Loss': round(float(np.median(kept)), 2),
+            'Pit_Lane': round(float(np.nanmedian(lanes[keep])), 2) if np.isfinite(lanes[keep]).any() else np.nan,
+            'Spread': round(float(spread), 2),
+        })
+    return pd.DataFrame(rows, columns=PIT_LOSS_COLUMNS[3:9])
+
+
+def race_rows(matrix, year: int, event_name: str, circuit: str) -> pd.DataFrame:
+    """RaceMatrix → 피트 로스 표 형식의 레이스 행 (상황별 1행)"""
+    rows = summarize_stops(stop_losses(matrix))
+    rows.insert(0, 'EventName', event_name)
+    rows.insert(0, 'Year', int(year))
+    rows.insert(0, 'Circuit', circuit)
+    rows['Version'] = PIT_LOSS_VERSION
+    return rows[PIT_LOSS_COLUMNS]
+
+
+def _inliers(values) -> np.ndarray:
+    positive = values > 0
+    if not positive.any():
+        return positive
+    median = np.median(values[positive])
+    mad = max(1.4826 * np.median(np.abs(values[positive] - median)), MIN_MAD)
+    return positive & (np.abs(values - median) <= OUTLIER_MAD * mad)
+
+
+# =============================================================================
+# 조회
+# =============================================================================
+def race_pit_loss_rows(year: int, event_name: str, circuit: str = None) -> pd.DataFrame:
+    """레이스 1개의 상황별 피트 로스 행 (표 → 없으면 RaceMatrix에서 계산, 레이스 단위 프로세스 캐시)"""
+    key = (int(year), event_name)
+    table = read_pit_loss_table()
+    if table is not None:
+        rows = table[(table['Year'] == int(year)) & (table['EventName'] == event_name)
+                     & (table['Version'] == PIT_LOSS_VERSION)]
+        if not rows.empty:
+            return rows.reset_index(drop=True)
+
+    def compute():
+        name = circuit
+        if name is None:
+            record = resolve_event_record(event_name, year)
+            name = circuit_key(record) if record else event_name
+        return race_rows(get_race_matrix(year, event_name), year, event_name, name)
+
+    return _race_rows_cache.get_or_load(key, compute)
+
+
+def race_pit_loss(year: int, circuit: str) -> float:
+    """레이스 그린 플래그 피트 로스 (스탑이 MIN_STOPS 미만이면 서킷 기준값)"""
+    event_name = resolve_event_name(circuit, year)
+    rows = race_pit_loss_rows(year, event_name)
+    green = rows[rows['Condition'] == 'GREEN']
+    if not green.empty and green['Stops'].iloc[0] >= MIN_STOPS:
+        return float(green['Pit_Loss'].iloc[0])
+    return circuit_pit_loss(circuit, year)['GREEN']
+
+
+def circuit_pit_loss(circuit: str, year: int = None, load_missing: bool = False) -> dict:
+    """
+    서킷의 상황별 피트 로스 {'GREEN': s, 'SC': s, 'VSC': s} — year 이하 시즌 레이스 값을 스탑 수로 가중 평균.
+    표에 없는 레이스는 year 시즌만 계산하고 (load_missing=True면 전부 계산) 나머지는 건너뜁니다.
+    표본이 MIN_STOPS 미만인 SC / VSC는 그린 값 × 기본 비율, 그린보다 크게 나오면 (표본 노이즈) 그린 값으로 자름
+    """
+    from data_pipeline.analytics import circuit_races
+
+    races = [(y, e) for y, e in circuit_races(circuit, year) if year is None or y <= int(year)]
+    table = read_pit_loss_table()
+    built = set() if table is None else set(zip(table['Year'].astype(int), table['EventName']))
+
+    frames = []
+    for race_year, event_name in races:
+        if (race_year, event_name) in built or load_missing or (year is not None and race_year == int(year)):
+            try:
+                frames.append(race_pit_loss_rows(race_year, event_name))
+            except Exception as e:
+                logger.warning(f"[PitLoss] {race_year} {event_name} 계산 실패: {e}")
+    rows = pd.concat(frames, ignore_index=True) if frames else PIT_LOSS_TABLE.empty()
+
+    losses = {}
+    for condition in CONDITIONS:
+        sample = rows[rows['Condition'] == condition]
+        if sample['Stops'].sum() >= MIN_STOPS:
+            losses[condition] = round(float(np.average(sample['Pit_Loss'], weights=sample['Stops'])), 2)
+    green = losses.get('GREEN', DEFAULT_PIT_LOSS)
+    return {
+        'GREEN': green,
+        'SC': min(losses.get('SC', round(green * SC_PIT_LOSS_FACTOR, 2)), green),
+        'VSC': min(losses.get('VSC', round(green * VSC_PIT_LOSS_FACTOR, 2)), green),
+    }
+
@@ -0,0 +1,364 @@
+# data_pipeline/race_db.py
+#
+# 레이스 결과 DB(data/f1_data.db) 읽기 전용 접근 계층
+#
+# 배경:
+#   - get_race_standings 가 브리핑 / 채팅 도구 호출마다 sqlite3.connect → pandas.read_sql_query → close
+#     → 매번 파일 오픈 + 스키마 파싱 + SQL 컴파일 + DataFrame 생성, Streamlit 워커가 동시에 브리핑하면 그만큼 반복
+#   → 읽기 전용 연결을 풀에 보관해서 재사용 (mode=ro, 쓰기 불가능한 파일이면 immutable, mmap / 페이지 캐시 튜닝)
+#   - SQL은 모듈 상수 문자열로 두고 연결별 statement 캐시(cached_statements)로 한 번만 컴파일
+#   - 결과는 DataFrame 없이 (컬럼, 행 튜플)로 받아서 바로 마크다운 표로 렌더링
+#
+# DB 파일이 교체 / 갱신되면 (mtime, 크기) 변화로 감지해서 기존 연결을 버리고 새로 엽니다.
+#
+# 스키마: race_results / lap_times / weather_data 에 event_key(정규화된 정식 EventName) + round 컬럼,
+#         (Year, event_key) / (Year, event_key, Driver) 복합 인덱스 → 이름 조회는 인덱스 정확 일치
+#         (migrate_schema, 기존 DB는 python -m data_pipeline.pipelines.migrate_db 1회)
+
+import os
+import re
+import queue
+import logging
+import pathlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from data_pipeline.event_resolver import event_key, normalize_event_name
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+DB_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'f1_data.db')
+
+# 유휴 상태로 보관할 최대 연결 수 (동시 요청이 더 많으면 임시 연결을 열고 반납 시 닫음)
+DB_POOL_SIZE = int(os.getenv("PITWALL_DB_POOL_SIZE", "8"))
+DB_MMAP_BYTES = 256 * 1024 * 1024       # 파일 전체를 mmap으로 읽음 (DB는 수십 MB 수준)
+DB_CACHE_KIB = 16 * 1024                # 연결당 페이지 캐시 16MB
+DB_STATEMENT_CACHE = 64                 # 연결당 컴파일된 SQL 캐시 개수
+
+
+class ReadOnlyPool:
+    """
+    SQLite 읽기 전용 연결 풀 (스레드 안전).
+    connection() 컨텍스트로 빌려 쓰고 반납하며, 연결은 check_same_thread=False라 어느 스레드에서든 재사용됩니다.
+    """
+
+    def __init__(self, path: str = DB_FILE_PATH, size: int = DB_POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()      # (generation, connection), 최근 반납한 연결부터 사용
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._signature = None
+        self._columns = {}                  # (generation, table) -> 컬럼명 튜플
+
+    # -------------------------------------------------------------------------
+    # Public
+    # -------------------------------------------------------------------------
+    @contextmanager
+    def connection(self):
+        generation = self._check_file()
+        conn = None
+        while conn is None:
+            try:
+                conn_generation, conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn_generation, conn = generation, self._open()
+                break
+            if conn_generation != generation:
+                conn.close()
+                conn = None
+        try:
+            yield conn
+        finally:
+            self._release(conn_generation, conn)
+
+    def fetch(self, sql: str, params=()):
+        """SQL 실행 → (컬럼명 리스트, 행 튜플 리스트)"""
+        with self.connection() as conn:
+            cursor = conn.execute(sql, params)
+            columns = [col[0] for col in cursor.description]
+            return columns, cursor.fetchall()
+
+    def table_columns(self, table: str) -> tuple:
+        """테이블 컬럼명 (DB 파일 세대마다 PRAGMA table_info 한 번, 테이블이 없으면 빈 튜플)"""
+        generation = self._check_file()
+        with self._lock:
+            columns = self._columns.get((generation, table))
+        if columns is None:
+            with self.connection() as conn:
+                columns = tuple(_table_columns(conn, table))
+            with self._lock:
+                self._columns = {k: v for k, v in self._columns.items() if k[0] == generation}
+                self._columns[(generation, table)] = columns
+        return columns
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def close(self):
+        """유휴 연결을 모두 닫습니다 (DB 파일 교체 직전 등)"""
+        with self._lock:
+            self._generation += 1
+        self._drain()
+
+    # -------------------------------------------------------------------------
+    # Internal
+    # -------------------------------------------------------------------------
+    def _open(self):
+        # 프로세스가 쓸 수 없는 파일(배포 이미지 등)은 immutable: 잠금 / 변경 감지 없이 읽음
+        immutable = os.getenv("PITWALL_DB_IMMUTABLE") == "1" or not os.access(self.path, os.W_OK)
+        uri = pathlib.Path(self.path).resolve().as_uri() + "?mode=ro" + ("&immutable=1" if immutable else "")
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=DB_STATEMENT_CACHE)
+        conn.execute(f"PRAGMA mmap_size = {DB_MMAP_BYTES}")
+        conn.execute(f"PRAGMA cache_size = -{DB_CACHE_KIB}")
+        conn.execute("PRAGMA query_only = 1")
+        return conn
+
+    def _release(self, generation, conn):
+        with self._lock:
+            keep = generation == self._generation and self._idle.qsize() < self.size
+        if keep:
+            self._idle.put((generation, conn))
+        else:
+            conn.close()
+
+    def _check_file(self) -> int:
+        """DB 파일이 바뀌었으면 세대를 올려서 기존 연결을 무효화 (이전 세대 연결은 꺼낼 때 닫음). return: 현재 세대"""
+        try:
+            stat = os.stat(self.path)
+            signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except OSError:
+            signature = None
+        with self._lock:
+            if signature != self._signature:
+                if self._signature is not None:
+                    logger.info(f"[RaceDB] DB 파일 변경 감지 → 연결 재생성: {self.path}")
+                    self._generation += 1
+                self._signature = signature
+            return self._generation
+
+    def _drain(self):
+        while True:
+            try:
+                _, conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+
+# =============================================================================
+# 마크다운 렌더링 (DataFrame / tabulate 없이)
+# =============================================================================
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return "" if value != value else format(value, 'g')
+    return str(value)
+
+
+def rows_to_markdown(columns, rows) -> str:
+    """(컬럼, 행 튜플) → 파이프 마크다운 표 (숫자 컬럼 오른쪽 정렬, 구분선은 '|---' 로 시작)"""
+    cells = [[_cell(v) for v in row] for row in rows]
+    widths = [max([len(str(col))] + [len(row[i]) for row in cells]) for i, col in enumerate(columns)]
+    numeric = [bool(rows) and all(isinstance(row[i], (int, float)) or row[i] is None for row in rows)
+               for i in range(len(columns))]
+
+    def line(values):
+        return "| " + " | ".join(
+            v.rjust(w) if num else v.ljust(w) for v, w, num in zip(values, widths, numeric)) + " |"
+
+    separator = "|" + "|".join("-" * (w + 1) + (":" if num else "-") for w, num in zip(widths, numeric)) + "|"
+    return "\n".join([line([str(c) for c in columns]), separator] + [line(row) for row in cells])
+
+
+# =============================================================================
+# 스키마 마이그레이션 (쓰기 쪽: 적재 스크립트 / pipelines/migrate_db.py)
+# =============================================================================
+# RaceID LIKE '%Hungarian%' 는 앞쪽 와일드카드라 인덱스를 못 타고 매번 테이블 전체를 스캔
+# → 정규화된 event_key + round 컬럼을 채우고 복합 인덱스로 정확 일치 조회
+# 기존 적재 행의 RaceID는 '2025_São_Paulo_Grand_Prix_R' / '2023_Las_Vegas_R' 형식
+# → 연도 접두어 / 세션 접미어를 떼고 이벤트 리졸버로 정식 이름을 찾아서 조회 쪽과 같은 키를 만듦
+# (v1은 RaceID 전체를 정규화해서 '2025saopaulograndprixr' 같은 키가 들어갔으므로 v2에서 전부 다시 계산)
+SCHEMA_VERSION = 2
+EVENT_TABLES = ('race_results', 'lap_times', 'weather_data')
+EVENT_NAME_COLUMNS = ('RaceID', 'EventName')     # event_key를 만들 원본 이름 컬럼 (먼저 있는 것 사용)
+SESSION_SUFFIXES = ('R', 'Q', 'S', 'SQ', 'SS', 'FP1', 'FP2', 'FP3')
+_RACE_ID_PATTERN = re.compile(r'^(\d{4})[_ ]+(.+)$')
+
+_round_cache = {}
+
+
+def open_writer(path: str = DB_FILE_PATH):
+    """적재 / 마이그레이션용 쓰기 연결 (DB 폴더 자동 생성)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return sqlite3.connect(path)
+
+
+def split_race_id(race_id):
+    """
+    RaceID → (연도, 이벤트 이름, 세션)
+    '2025_São_Paulo_Grand_Prix_R' → (2025, 'São Paulo Grand Prix', 'R'), 'British Grand Prix' → (None, 'British Grand Prix', None)
+    """
+    text = str(race_id).strip()
+    year = None
+    match = _RACE_ID_PATTERN.match(text)
+    if match:
+        year, text = int(match.group(1)), match.group(2)
+    session = None
+    head, _, tail = text.rpartition('_')
+    if head and tail.upper() in SESSION_SUFFIXES:
+        text, session = head, tail.upper()
+    return year, text.replace('_', ' ').strip(), session
+
+
+def race_id(year: int, event_name: str, session: str = 'R') -> str:
+    """기존 적재 형식 RaceID: (2025, 'São Paulo Grand Prix') → '2025_São_Paulo_Grand_Prix_R' (split_race_id의 역)"""
+    return f"{int(year)}_{'_'.join(str(event_name).split())}_{session}"
+
+
+def legacy_race_ids(year: int, event_name: str, session: str = 'R') -> tuple:
+    """
+    마이그레이션 전 DB를 정확 일치로 조회할 RaceID 후보 (적재 시기에 따라 ' Grand Prix' 접미어가 빠진 행이 있음)
+    (2023, 'Las Vegas Grand Prix') → ('2023_Las_Vegas_Grand_Prix_R', '2023_Las_Vegas_R')
+    """
+    short = re.sub(r'\s+Grand Prix$', '', str(event_name).strip())
+    return race_id(year, event_name, session), race_id(year, short, session)
+
+
+def race_id_event_key(race_id, year: int = None) -> str:
+    """RaceID → 조회 쪽과 같은 event_key ('2025_São_Paulo_Grand_Prix_R' → 'saopaulo')"""
+    parsed_year, name, _ = split_race_id(race_id)
+    year = year if year is not None else parsed_year
+    return event_key(name, int(year) if year is not None else None)
+
+
+def migrate_schema(conn) -> dict:
+    """
+    Year(없으면 RaceID 연도 접두어에서) / event_key / round 컬럼 추가 → 행 채우기 → 복합 인덱스 생성 (여러 번 실행해도 안전).
+    return: {테이블: 채운 행 수}
+    """
+    rekey = conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION
+    filled = {}
+    for table in EVENT_TABLES:
+        columns = _table_columns(conn, table)
+        if not columns:
+            continue
+        if 'Year' not in columns:
+            if 'RaceID' not in columns:
+                logger.warning(f"[RaceDB] {table}: Year / RaceID 컬럼이 없어 마이그레이션 건너뜀")
+                continue
+            conn.execute(f'ALTER TABLE "{table}" ADD COLUMN Year INTEGER')
+            columns.append('Year')
+        if 'RaceID' in columns:
+            # 연도 컬럼이 없던 테이블(lap_times / weather_data) → RaceID '2023_Las_Vegas_R' 접두어
+            conn.execute(f"UPDATE \"{table}\" SET Year = CAST(substr(RaceID, 1, 4) AS INTEGER) "
+                         f"WHERE Year IS NULL AND RaceID GLOB '[0-9][0-9][0-9][0-9][_ ]*'")
+        for column, sql_type in (('event_key', 'TEXT'), ('round', 'INTEGER')):
+            if column not in columns:
+                conn.execute(f'ALTER TABLE "{table}" ADD COLUMN {column} {sql_type}')
+        filled[table] = _backfill_event_keys(conn, table, columns, rekey)
+
+        conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_year_event" ON "{table}" (Year, event_key)')
+        if 'Driver' in columns:
+            conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_year_event_driver" '
+                         f'ON "{table}" (Year, event_key, Driver)')
+
+    if any(filled.values()):
+        conn.execute("ANALYZE")   # 쿼리 플래너 통계 갱신
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.commit()
+    return filled
+
+
+def tag_event_columns(df, year: int, event_name: str, round_number=None):
+    """적재할 DataFrame에 event_key / round 컬럼을 붙입니다 (마이그레이션된 스키마와 같은 값)"""
+    return df.assign(event_key=event_key(event_name, year),
+                     round=int(round_number) if round_number is not None else None)
+
+
+def season_rounds(year: int) -> dict:
+    """{event_key: RoundNumber} (FastF1 이벤트 스케줄, 못 읽으면 빈 dict → round는 NULL로 남음)"""
+    year = int(year)
+    if year not in _round_cache:
+        try:
+            import fastf1
+            from data_pipeline.cache_setup import ensure_cache
+
+            ensure_cache()
+            schedule = fastf1.get_event_schedule(year, include_testing=False)
+            _round_cache[year] = {
+                normalize_event_name(name): int(number)
+                for name, number in zip(schedule['EventName'], schedule['RoundNumber'])
+            }
+        except Exception as e:
+            logger.warning(f"[RaceDB] {year} 스케줄 로드 실패 (round 비워 둠): {e}")
+            _round_cache[year] = {}
+    return _round_cache[year]
+
+
+def _table_columns(conn, table: str) -> list:
+    return [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+
+
+def _backfill_event_keys(conn, table: str, columns: list, rekey: bool = False) -> int:
+    """event_key / round 가 빈 행 채우기 (rekey=True면 이전 스키마 버전 키도 전부 다시 계산)"""
+    source = next((c for c in EVENT_NAME_COLUMNS if c in columns), None)
+    if source is None:
+        logger.warning(f"[RaceDB] {table}: 이벤트 이름 컬럼({EVENT_NAME_COLUMNS})이 없어 event_key를 채우지 못함")
+        return 0
+
+    condition = "" if rekey else "WHERE event_key IS NULL OR round IS NULL"
+    missing = conn.execute(
+        f'SELECT DISTINCT Year, "{source}", event_key, round IS NULL FROM "{table}" {condition}'
+    ).fetchall()
+    updates = []
+    for year, name, old_key, no_round in missing:
+        if year is None or name is None:
+            continue
+        key = race_id_event_key(name, int(year))
+        round_number = season_rounds(year).get(key)
+        # 스케줄이 없어 round만 비어 있는 행은 다시 쓰지 않음
+        if key != old_key or (no_round and round_number is not None):
+            updates.append((key, round_number, year, name))
+
+    before = conn.total_changes
+    conn.executemany(
+        f'UPDATE "{table}" SET event_key = ?, round = COALESCE(round, ?) WHERE Year = ? AND "{source}" = ?',
+        updates,
+    )
+    return conn.total_changes - before
+
+
+# =============================================================================
+# 전역 인스턴스
+# =============================================================================
+_pool = ReadOnlyPool()
+_legacy_warned = set()
+
+
+def fetch(sql: str, params=()):
+    """공유 풀로 SQL 실행 → (컬럼명 리스트, 행 튜플 리스트)"""
+    return _pool.fetch(sql, params)
+
+
+def has_event_keys(table: str = 'race_results') -> bool:
+    """
+    event_key 컬럼이 있는 (마이그레이션된) DB인지. 없으면 DB 파일 세대마다 한 번 migrate_db 안내를 남깁니다.
+    (조회 쪽은 False면 RaceID 정확 일치로 대신 조회)
+    """
+    if 'event_key' in _pool.table_columns(table):
+        return True
+    warned = (_pool.path, _pool.generation, table)
+    if warned not in _legacy_warned:
+        _legacy_warned.add(warned)
+        logger.warning(f"[RaceDB] {table}에 event_key 컬럼이 없음 → RaceID로 조회합니다. "
+                       f"python -m data_pipeline.pipelines.migrate_db 를 한 번 실행하세요.")
+    return False
+
+
+def close_pool():
+    _pool.close()
@@ -0,0 +1,279 @@
+# data_pipeline/race_matrix.py
+#
+# 레이스 랩 행렬 (드라이버 × 랩)
+#
+# 배경:
+#   - 전술 시뮬레이터가 피트 스탑 하나, 라이벌 하나마다 랩 테이블을 boolean mask로 다시 뒤짐
+#   → 레이스마다 한 번만 [드라이버, 랩] 배열(랩타임 / 누적 레이스 시간 / 피트 인·아웃)을 만들어 두고
+#     간격 / 언더컷 계산은 배열 인덱싱으로 처리
+#   - 누적 레이스 시간에서 순위 / 선두와의 간격 / 앞차와의 간격(인터벌)을 빌드 시점에 한 번 계산
+#     → 임의 랩의 gap / interval / position 조회는 배열 원소 하나 읽기 (O(1))
+#
+# 인덱스 규칙: lap_times[d, l] = 드라이버 d의 (l + 1)번째 랩, 값이 없으면 NaN
+#              조회 함수(gap / interval / position ...)의 lap 인자는 LapNumber (1부터)
+#
+# 저장 위치: data/lap_store/<year>/<Event_Name>.matrix.npz  (랩 스토어 옆, 랩 테이블보다 오래되면 다시 빌드)
+
+import os
+import logging
+from collections import namedtuple
+
+import numpy as np
+
+from data_pipeline import lap_store
+from data_pipeline.bounded_cache import BoundedCache
+from data_pipeline.event_resolver import resolve_event_name
+
+logger = logging.getLogger(__name__)
+
+MATRIX_LAP_COLUMNS = [
+    'Driver', 'DriverNumber', 'LapNumber', 'LapTime',
+    'Time', 'LapStartTime', 'PitInTime', 'PitOutTime', 'TrackStatus',
+]
+
+# 배열 구성이 바뀌면 올려서 저장된 .npz를 다시 빌드하도록 함
+MATRIX_VERSION = 2
+
+# track_status 코드 (랩 동안 한 차라도 겪은 가장 강한 상황)
+TRACK_GREEN, TRACK_VSC, TRACK_SC = 0, 1, 2
+
+RaceMatrix = namedtuple('RaceMatrix', [
+    'drivers',        # 드라이버 약어 (결과 순서)
+    'numbers',        # 드라이버 번호 (문자열, drivers와 같은 순서)
+    'lap_times',      # 랩타임 (s), shape [D, L]
+    'race_time',      # 레이스 스타트부터 랩 종료까지 누적 시간 (s), shape [D, L]
+    'pit_in',         # 해당 랩이 피트 인 랩인지, shape [D, L] bool
+    'pit_lane',       # 피트 레인 소요 시간 (s, 인 랩 위치에 기록), shape [D, L]
+    'position',       # 랩 종료 시점 순위 (1부터, 랩을 못 마쳤으면 NaN), shape [D, L]
+    'gap_to_leader',  # 같은 랩을 마친 선두와의 간격 (s), shape [D, L]
+    'interval',       # 바로 앞 차와의 간격 (s, 선두는 NaN), shape [D, L]
+    'track_status',   # 랩별 트랙 상태 (TRACK_GREEN / TRACK_VSC / TRACK_SC), shape [L] int8
+])
+
+_ARRAY_FIELDS = [f for f in RaceMatrix._fields if f not in ('drivers', 'numbers')]
+
+_matrix_cache = BoundedCache()
+
+
+def _seconds(series) -> np.ndarray:
+    return series.dt.total_seconds().to_numpy(dtype=float)
+
+
+# =============================================================================
+# 빌드
+# =============================================================================
+def build_race_matrix(all_laps, results) -> RaceMatrix:
+    """랩 테이블 + 결과 테이블 → RaceMatrix (결과 순서, 결과에 없는 드라이버는 뒤에 추가)"""
+    laps = all_laps[all_laps['LapNumber'].notna() & all_laps['Driver'].notna()]
+    drivers = [d for d in results['Abbreviation'] if d in set(laps['Driver'])]
+    drivers += sorted(set(laps['Driver']) - set(drivers))
+    number_of = dict(zip(laps['Driver'], laps['DriverNumber'].astype(str)))
+    number_of.update(zip(results['Abbreviation'], results['DriverNumber'].astype(str)))
+
+    n_laps = int(laps['LapNumber'].max()) if not laps.empty else 0
+    shape = (len(drivers), n_laps)
+    d = laps['Driver'].map({drv: i for i, drv in enumerate(drivers)}).to_numpy()
+    l = laps['LapNumber'].to_numpy(dtype=int) - 1
+
+    lap_times = np.full(shape, np.nan)
+    lap_end = np.full(shape, np.nan)
+    pit_in_time = np.full(shape, np.nan)
+    pit_out_time = np.full(shape, np.nan)
+    lap_times[d, l] = _seconds(laps['LapTime'])
+    lap_end[d, l] = _seconds(laps['Time'])
+    pit_in_time[d, l] = _seconds(laps['PitInTime'])
+    pit_out_time[d, l] = _seconds(laps['PitOutTime'])
+
+    # 피트 인 랩의 PitInTime ~ 다음 랩(아웃 랩)의 PitOutTime (마지막 랩의 피트 인은 레이스 종료 후라 제외)
+    pit_in = ~np.isnan(pit_in_time)
+    pit_in[:, -1:] = False
+    pit_lane = np.full(shape, np.nan)
+    pit_lane[:, :-1] = pit_out_time[:, 1:] - pit_in_time[:, :-1]
+    pit_lane[~pit_in] = np.nan
+
+    race_time = _race_time(lap_end, lap_times, _race_start(laps))
+    position, gap_to_leader, interval = _standings(race_time)
+
+    return RaceMatrix(drivers, [number_of.get(drv, '') for drv in drivers],
+                      lap_times, race_time, pit_in, pit_lane,
+                      position, gap_to_leader, interval, _track_status(laps, n_laps))
+
+
+def _track_status(laps, n_laps: int) -> np.ndarray:
+    """랩 테이블의 TrackStatus 문자열('4' SC, '6'/'7' VSC) → 랩별 상황 코드 [L]"""
+    codes = np.full(n_laps, TRACK_GREEN, dtype=np.int8)
+    if 'TrackStatus' not in laps.columns or n_laps == 0:
+        return codes
+    status = laps['TrackStatus'].fillna('').astype(str)
+    l = laps['LapNumber'].to_numpy(dtype=int) - 1
+    np.maximum.at(codes, l[status.str.contains('[67]').to_numpy()], TRACK_VSC)
+    np.maximum.at(codes, l[status.str.contains('4').to_numpy()], TRACK_SC)
+    return codes
+
+
+def _race_start(laps) -> float:
+    """레이스 스타트 세션 시각 (1랩 LapStartTime, 없으면 1랩 종료 시각 - 랩타임)"""
+    first = laps[laps['LapNumber'] == 1]
+    if first.empty:
+        return np.nan
+    if 'LapStartTime' in first.columns:
+        start = _seconds(first['LapStartTime'])
+        if np.isfinite(start).any():
+            return float(np.nanmin(start))
+    start = _seconds(first['Time']) - _seconds(first['LapTime'])
+    return float(np.nanmin(start)) if np.isfinite(start).any() else np.nan
+
+
+def _race_time(lap_end, lap_times, start: float) -> np.ndarray:
+    """랩 종료 세션 시각 → 스타트 기준 누적 시간. 종료 시각이 빠진 랩은 직전 누적 시간 + 랩타임으로 채움"""
+    race_time = lap_end - start
+    missing = np.nonzero(np.isnan(race_time).any(axis=0))[0]
+    for l in missing:
+        previous = race_time[:, l - 1] if l > 0 else np.zeros(race_time.shape[0])
+        race_time[:, l] = np.where(np.isnan(race_time[:, l]), previous + lap_times[:, l], race_time[:, l])
+    return race_time
+
+
+def _standings(race_time):
+    """
+    랩별로 누적 시간을 정렬해서 순위 / 선두와의 간격 / 앞 차와의 간격을 한 번에 계산합니다.
+    같은 랩을 마친 차끼리만 비교하므로 랩 다운 차량은 해당 랩을 마친 시점으로 비교됩니다.
+    """
+    finished = np.isfinite(race_time)
+    order = np.argsort(np.where(finished, race_time, np.inf), axis=0, kind='stable')
+    ranks = np.broadcast_to(np.arange(1, race_time.shape[0] + 1, dtype=float)[:, None], race_time.shape)
+
+    position = np.empty_like(race_time)
+    np.put_along_axis(position, order, ranks, axis=0)
+    position[~finished] = np.nan
+
+    with np.errstate(invalid='ignore'):
+        leader = np.nanmin(np.where(finished, race_time, np.nan), axis=0) if race_time.size else race_time
+        gap_to_leader = race_time - leader
+
+        ordered = np.take_along_axis(race_time, order, axis=0)
+        ordered_interval = np.full_like(ordered, np.nan)
+        ordered_interval[1:] = ordered[1:] - ordered[:-1]
+    interval = np.empty_like(race_time)
+    np.put_along_axis(interval, order, ordered_interval, axis=0)
+    interval[~finished] = np.nan
+    return position, gap_to_leader, interval
+
+
+# =============================================================================
+# 저장 / 로드 (랩 스토어 옆 .npz)
+# =============================================================================
+def matrix_path(year: int, event_name: str) -> str:
+    return lap_store.lap_store_path(year, event_name, kind='matrix', ext='npz')
+
+
+def write_race_matrix(year: int, event_name: str, matrix: RaceMatrix):
+    """임시 파일에 쓴 뒤 교체 (읽는 쪽은 항상 완성된 파일만 봄)"""
+    path = matrix_path(year, event_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}.npz"
+    np.savez_compressed(
+        tmp_path,
+        version=np.array(MATRIX_VERSION),
+        drivers=np.array(matrix.drivers, dtype=str),
+        numbers=np.array(matrix.numbers, dtype=str),
+        **{field: getattr(matrix, field) for field in _ARRAY_FIELDS},
+    )
+    os.replace(tmp_path, path)
+
+
+def read_race_matrix(year: int, event_name: str):
+    """저장된 RaceMatrix (없거나 랩 테이블보다 오래됐거나 버전이 다르면 None)"""
+    path = matrix_path(year, event_name)
+    laps_path = lap_store.lap_store_path(year, event_name)
+    try:
+        if os.path.getmtime(path) < os.path.getmtime(laps_path):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != MATRIX_VERSION:
+                return None
+            arrays = {field: data[field] for field in _ARRAY_FIELDS}
+            return RaceMatrix(data['drivers'].tolist(), data['numbers'].tolist(), **arrays)
+    except OSError:
+        return None
+    except Exception as e:
+        logger.warning(f"[RaceMatrix] 읽기 실패 ({year} {event_name}): {e}")
+        return None
+
+
+def build_stored_matrix(year: int, event_name: str, all_laps, results) -> RaceMatrix:
+    """랩 스토어 빌드 시 함께 호출: 행렬을 만들어 .npz로 저장"""
+    matrix = build_race_matrix(all_laps, results)
+    write_race_matrix(year, event_name, matrix)
+    return matrix
+
+
+def get_race_matrix(year: int, circuit: str) -> RaceMatrix:
+    """
+    레이스 1개의 RaceMatrix (저장된 .npz → 랩 스토어 / 세션에서 빌드, 레이스 단위 프로세스 캐시).
+    랩 스토어에 있는 레이스는 빌드한 행렬을 .npz로 남겨서 다음 프로세스부터 바로 읽음
+    """
+    event_name = resolve_event_name(circuit, year)
+    return _matrix_cache.get_or_load((int(year), event_name), lambda: _load_race_matrix(year, event_name))
+
+
+def _load_race_matrix(year, event_name):
+    from data_pipeline.analytics import _load_race_laps
+
+    matrix = read_race_matrix(year, event_name)
+    if matrix is None:
+        all_laps, results = _load_race_laps(year, event_name, MATRIX_LAP_COLUMNS)
+        matrix = build_race_matrix(all_laps, results)
+        if os.path.exists(lap_store.lap_store_path(year, event_name)):
+            try:
+                write_race_matrix(year, event_name, matrix)
+            except OSError as e:
+                logger.warning(f"[RaceMatrix] 저장 실패 ({year} {event_name}): {e}")
+    return matrix
+
+
+# =============================================================================
+# 조회 (O(1))
+# =============================================================================
+def driver_index(matrix: RaceMatrix, driver: str):
+    """약어 또는 번호 → 행 인덱스 (없으면 None)"""
+    driver = str(driver).strip().upper()
+    if driver in matrix.drivers:
+        return matrix.drivers.index(driver)
+    if driver in matrix.numbers:
+        return matrix.numbers.index(driver)
+    return None
+
+
+def _cell(matrix: RaceMatrix, values, driver, lap: int):
+    d = driver_index(matrix, driver)
+    l = int(lap) - 1
+    if d is None or not 0 <= l < values.shape[1]:
+        return None
+    value = values[d, l]
+    return float(value) if np.isfinite(value) else None
+
+
+def gap(matrix: RaceMatrix, driver: str, rival: str, lap: int):
+    """lap 종료 시점 driver - rival 누적 시간 차 (s, +면 driver가 뒤). 둘 중 하나라도 랩을 못 마쳤으면 None"""
+    mine = _cell(matrix, matrix.race_time, driver, lap)
+    theirs = _cell(matrix, matrix.race_time, rival, lap)
+    if mine is None or theirs is None:
+        return None
+    return mine - theirs
+
+
+def interval(matrix: RaceMatrix, driver: str, lap: int):
+    """lap 종료 시점 바로 앞 차와의 간격 (s, 선두면 None)"""
+    return _cell(matrix, matrix.interval, driver, lap)
+
+
+def gap_to_leader(matrix: RaceMatrix, driver: str, lap: int):
+    """lap 종료 시점 선두와의 간격 (s)"""
+    return _cell(matrix, matrix.gap_to_leader, driver, lap)
+
+
+def position(matrix: RaceMatrix, driver: str, lap: int):
+    """lap 종료 시점 순위 (1부터, 랩을 못 마쳤으면 None)"""
+    value = _cell(matrix, matrix.position, driver, lap)
+    return int(value) if value is not None else None
@@ -0,0 +1,87 @@
+# data_pipeline/race_table.py
+#
+# 레이스 단위 행으로 쌓는 버전 관리 parquet 표 (타이어 아틀라스 / 피트 로스 공용)
+#
+# 배경:
+#   - tire_atlas / pit_loss 가 같은 코드(mtime 캐시 읽기 / 임시 파일 교체 쓰기 / 현재 버전 레이스 목록)를
+#     각자 복사해서 들고 있었음
+#   → 경로 / 컬럼 / 정렬 키 / 버전만 받는 표 객체 하나로 통일
+#     (배치 잡 쪽 공용 실행기는 data_pipeline/pipelines/race_table_batch.py)
+#
+# 모든 표는 'Year', 'EventName', 'Version' 컬럼을 가져야 함
+
+import os
+import logging
+import threading
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedRaceTable:
+    """
+    레이스 × (컴파운드 / 상황 …) 1행 parquet 표.
+    읽기는 파일이 바뀌었을 때만 다시 읽고, 쓰기는 임시 파일에 쓴 뒤 교체합니다.
+    """
+
+    def __init__(self, path: str, columns, sort_keys, version: int, tag: str):
+        self.path = path
+        self.columns = list(columns)
+        self.sort_keys = list(sort_keys)
+        self.version = int(version)
+        self.tag = tag                  # 로그 접두어 (예: 'TireAtlas')
+        self._mtime = None
+        self._table = None
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------------------------------
+    # 조회
+    # -------------------------------------------------------------------------
+    def read(self):
+        """표 전체 (없으면 None). 파일이 바뀌었을 때만 다시 읽습니다."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return None
+        with self._lock:
+            if self._mtime != mtime:
+                try:
+                    self._table = pd.read_parquet(self.path)
+                    self._mtime = mtime
+                except Exception as e:
+                    logger.warning(f"[{self.tag}] 읽기 실패: {e}")
+                    return None
+            return self._table
+
+    def empty(self) -> pd.DataFrame:
+        return pd.DataFrame(columns=self.columns)
+
+    def built_races(self) -> set:
+        """현재 버전으로 표에 들어 있는 (year, event_name)"""
+        table = self.read()
+        if table is None or table.empty:
+            return set()
+        current = table[table['Version'] == self.version]
+        return set(zip(current['Year'].astype(int), current['EventName']))
+
+    # -------------------------------------------------------------------------
+    # 기록
+    # -------------------------------------------------------------------------
+    def write(self, table: pd.DataFrame):
+        """표 전체를 임시 파일에 쓴 뒤 교체 (읽는 쪽은 항상 완성된 파일만 봄)"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp-{os.getpid()}"
+        table = table[self.columns].sort_values(self.sort_keys).reset_index(drop=True)
+        table.to_parquet(tmp_path, index=False, compression='zstd')
+        os.replace(tmp_path, self.path)
+
+    def replace_races(self, frames, races):
+        """기존 표에서 races(다시 계산한 (year, event_name))의 행을 빼고 frames를 합쳐서 저장"""
+        races = set(races)
+        tables = [frame for frame in frames if frame is not None and not frame.empty]
+        existing = self.read()
+        if existing is not None and not existing.empty:
+            keep = [(int(y), e) not in races for y, e in zip(existing['Year'], existing['EventName'])]
+            tables.insert(0, existing[keep])
+        self.write(pd.concat(tables, ignore_index=True) if tables else self.empty())
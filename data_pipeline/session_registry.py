@@ -0,0 +1,222 @@
+# data_pipeline/session_registry.py
+#
+# 프로세스 전역 FastF1 세션 레지스트리
+#
+# 배경:
+#   - analytics / telemetry_data / tactic_simulation_agent / streamlit_app 이
+#     각자 fastf1.get_session(...).load() 를 호출 → 버튼 한 번에 같은 레이스 pickle을 2~3번 파싱
+#   - 여기서 한 번 로드한 Session 객체를 (year, event, session type, 로드한 데이터 종류) 기준으로 공유
+#   - 나중에 텔레메트리가 필요해지면 같은 객체를 제자리에서 업그레이드(re-load)
+#   - 메모리 상한(PITWALL_SESSION_CACHE_MB)을 넘으면 가장 오래 안 쓴 세션부터 LRU 방출
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+import fastf1
+
+from data_pipeline.event_resolver import resolve_event_name
+from data_pipeline.cache_setup import ensure_cache
+
+logger = logging.getLogger(__name__)
+
+# 세션 캐시 메모리 상한 (MB). 텔레메트리 포함 레이스 1개 ≈ 150~300MB
+SESSION_CACHE_MAX_MB = float(os.getenv("PITWALL_SESSION_CACHE_MB", "1024"))
+
+# session.load() 인자로 넘기는 데이터 종류
+DATA_KINDS = ('laps', 'telemetry', 'weather', 'messages')
+
+# 동시 로드 방지용 락 개수 (입력 키 해시로 나눠 씀 → 레이스가 늘어도 락 수는 고정)
+LOAD_LOCK_STRIPES = 64
+
+
+class _Entry:
+    """레지스트리에 보관되는 세션 1개 + 메타데이터"""
+
+    def __init__(self, session, kinds: frozenset):
+        self.session = session
+        self.kinds = kinds
+        self.nbytes = _estimate_session_bytes(session)
+
+
+class SessionRegistry:
+    """
+    로드된 FastF1 Session을 프로세스 안에서 공유하는 LRU 레지스트리.
+    Streamlit 워커 스레드에서 동시에 불려도 같은 세션을 두 번 로드하지 않습니다.
+    """
+
+    def __init__(self, max_mb: float = SESSION_CACHE_MAX_MB):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._entries = OrderedDict()   # (year, EventName, SessionName) -> _Entry
+        self._aliases = {}              # (year, 입력 문자열, 입력 세션 타입) -> 정식 키
+        self._lock = threading.RLock()
+        self._load_locks = [threading.Lock() for _ in range(LOAD_LOCK_STRIPES)]
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'upgrades': 0,
+            'evictions': 0,
+            'load_seconds': 0.0,
+        }
+
+    # -------------------------------------------------------------------------
+    # Public
+    # -------------------------------------------------------------------------
+    def get(self, year: int, event, session_type: str = 'R', laps: bool = True,
+            telemetry: bool = False, weather: bool = False, messages: bool = False):
+        """
+        요청한 데이터 종류가 모두 로드된 Session을 반환합니다.
+        - 이미 같은(또는 더 많은) 데이터로 로드된 세션이 있으면 그대로 반환 (hit)
+        - 있는데 데이터가 부족하면 같은 객체에 session.load()를 다시 걸어 업그레이드
+        - 없으면 새로 로드 (miss)
+        """
+        requested = frozenset(
+            kind for kind, flag in zip(DATA_KINDS, (laps, telemetry, weather, messages)) if flag
+        )
+        event = resolve_event_name(event, year)
+        alias = (int(year), str(event).strip().lower(), str(session_type).upper())
+
+        load_lock = self._load_locks[hash(alias) % len(self._load_locks)]
+
+        # 같은 입력에 대한 동시 로드는 한 번만 수행 (다른 스트라이프의 레이스는 병렬 로드 가능)
+        with load_lock:
+            with self._lock:
+                key = self._aliases.get(alias)
+                entry = self._entries.get(key) if key else None
+                if entry is not None and requested <= entry.kinds:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return entry.session
+
+            if entry is not None:
+                # 텔레메트리 등이 나중에 요청된 경우 → 제자리 업그레이드
+                kinds = entry.kinds | requested
+                self._load(entry.session, kinds)
+                with self._lock:
+                    entry.kinds = kinds
+                    entry.nbytes = _estimate_session_bytes(entry.session)
+                    self._entries.move_to_end(key)
+                    self._stats['upgrades'] += 1
+                    self._evict()
+                return entry.session
+
+            ensure_cache()  # 첫 로드 시점에 1회만 캐시 부트스트랩
+            session = fastf1.get_session(year, event, session_type)
+            key = (int(year), session.event['EventName'], session.name)
+
+            with self._lock:
+                entry = self._entries.get(key)
+                self._aliases[alias] = key
+                if entry is not None and requested <= entry.kinds:
+                    # 다른 별칭(예: 'Silverstone' vs 'British')으로 이미 로드된 세션
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return entry.session
+
+            kinds = requested | (entry.kinds if entry is not None else frozenset())
+            if entry is not None:
+                session = entry.session
+            self._load(session, kinds)
+
+            with self._lock:
+                self._entries[key] = _Entry(session, kinds)
+                self._entries.move_to_end(key)
+                self._stats['misses'] += 1
+                self._evict()
+            _index_drivers(session)
+            return session
+
+    def stats(self) -> dict:
+        """hit / miss / 업그레이드 / 방출 횟수와 누적 로드 시간을 반환합니다."""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats['hits'] + stats['misses'] + stats['upgrades']
+            loads = stats['misses'] + stats['upgrades']
+            stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+            stats['avg_load_seconds'] = round(stats['load_seconds'] / loads, 3) if loads else 0.0
+            stats['load_seconds'] = round(stats['load_seconds'], 3)
+            stats['entries'] = len(self._entries)
+            stats['memory_mb'] = round(sum(e.nbytes for e in self._entries.values()) / 1024 / 1024, 1)
+            stats['max_memory_mb'] = round(self.max_bytes / 1024 / 1024, 1)
+            return stats
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+
+    # -------------------------------------------------------------------------
+    # Internal
+    # -------------------------------------------------------------------------
+    def _load(self, session, kinds: frozenset):
+        start = time.perf_counter()
+        session.load(**{kind: kind in kinds for kind in DATA_KINDS})
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._stats['load_seconds'] += elapsed
+        logger.info(f"[SessionRegistry] {session.event['EventName']} {session.name} "
+                    f"로드 {elapsed:.2f}s ({', '.join(sorted(kinds))})")
+
+    def _evict(self):
+        """메모리 상한을 넘으면 가장 오래 안 쓴 세션부터 방출 (최근 1개는 항상 유지)"""
+        total = sum(e.nbytes for e in self._entries.values())
+        while total > self.max_bytes and len(self._entries) > 1:
+            key, entry = self._entries.popitem(last=False)
+            total -= entry.nbytes
+            self._stats['evictions'] += 1
+            for alias in [a for a, k in self._aliases.items() if k == key]:
+                del self._aliases[alias]
+            logger.info(f"[SessionRegistry] LRU 방출: {key}")
+
+
+def _index_drivers(session):
+    """레이스 세션이면 드라이버 식별자 인덱스를 로드 시점에 1회 빌드 (data_pipeline.driver_index)"""
+    if session.name != 'Race':
+        return
+    try:
+        from data_pipeline.driver_index import index_session
+        index_session(session)
+    except Exception as e:
+        logger.warning(f"[SessionRegistry] 드라이버 인덱스 빌드 실패: {e}")
+
+
+def _estimate_session_bytes(session) -> int:
+    """세션이 들고 있는 주요 DataFrame들의 메모리 사용량 추정치"""
+    frames = []
+    for attr in ('laps', 'weather_data'):
+        try:
+            frames.append(getattr(session, attr))
+        except Exception:
+            pass  # 로드되지 않은 데이터는 DataNotLoadedError
+    for attr in ('car_data', 'pos_data'):
+        try:
+            frames.extend(getattr(session, attr).values())
+        except Exception:
+            pass
+
+    total = 0
+    for df in frames:
+        try:
+            total += int(df.memory_usage(index=True, deep=False).sum())
+        except Exception:
+            pass
+    return total
+
+
+# =============================================================================
+# 전역 인스턴스
+# =============================================================================
+_registry = SessionRegistry()
+
+
+def load_session(year: int, event, session_type: str = 'R', laps: bool = True,
+                 telemetry: bool = False, weather: bool = False, messages: bool = False):
+    """fastf1.get_session(...).load(...) 대신 사용하는 공유 세션 로더"""
+    return _registry.get(year, event, session_type, laps=laps, telemetry=telemetry,
+                         weather=weather, messages=messages)
+
+
+def registry_stats() -> dict:
+    return _registry.stats()
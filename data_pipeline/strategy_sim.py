@@ -0,0 +1,483 @@
+# data_pipeline/strategy_sim.py
+#
+# 피트 전략 시뮬레이션 엔진 (언더컷 / 오버컷 탐색)
+#
+# 배경:
+#   - 전술 시뮬레이터는 피트 스탑 1개 × 라이벌 1명씩 iterrows 루프로 인/아웃 랩을 찾고,
+#     피트 직전 간격은 "복잡해서 생략" → 라이벌을 LLM이 골라야 하고 간격을 고려하지 못함
+#   → RaceMatrix(드라이버 × 랩)에서 모든 피트 스탑 × 모든 차량의 간격 / 대응 피트 / 피트 후 간격을
+#     [피트 스탑, 드라이버] 배열 한 번으로 계산해서 실제로 순위가 걸린 대결만 골라 순위를 매김
+#
+# 부호 규칙: Gap_Before / Margin > 0 이면 피트한 차가 라이벌 뒤, < 0 이면 앞
+#
+#   - 2025년 이후 레이스는 LLM에게 가상 수치를 지어내게 했음
+#   → 서킷의 캐시된 레이스들로 페이스 / 마모 / 피트 로스 / SC·VSC 확률을 적합하고
+#     1~3 스탑 전략 수만 개를 NumPy 배치 롤아웃으로 평가하는 몬테카를로 시뮬레이터 (아래 섹션)
+#   - 입력 적합(레이스마다 마모 모델 + 최소제곱)은 서킷당 수 초 → 시즌 프리웜이 레이스마다 'strategy_inputs'
+#     아티팩트로 저장해 두고 앱은 그것을 읽어서 롤아웃만 실행
+
+from collections import namedtuple
+from itertools import combinations, product
+
+import numpy as np
+import pandas as pd
+
+from data_pipeline import artifact_store
+from data_pipeline.bounded_cache import BoundedCache
+from data_pipeline.race_matrix import get_race_matrix, TRACK_VSC, TRACK_SC
+from data_pipeline.pit_loss import race_pit_loss, circuit_pit_loss, DEFAULT_PIT_LOSS
+from data_pipeline.event_resolver import event_key
+
+UNDERCUT_GAP_WINDOW = 3.0   # 피트 직전 랩 종료 시점 간격 (s) 이내 차량만 평가
+RESPONSE_LAPS = 5           # 라이벌의 대응 피트를 기다리는 랩 수
+
+PIT_BATTLE_COLUMNS = [
+    'Driver', 'Pit_Lap', 'Rival', 'Rival_Pit_Lap', 'Move',
+    'Gap_Before', 'Margin', 'Swing', 'InOut_Delta', 'Result',
+]
+
+
+# =============================================================================
+# 언더컷 / 오버컷 탐색
+# =============================================================================
+def undercut_search(year: int, circuit: str, gap_window: float = UNDERCUT_GAP_WINDOW,
+                    response_laps: int = RESPONSE_LAPS, pit_loss: float = None) -> pd.DataFrame:
+    """
+    레이스 전체 피트 스탑 × 간격 창 안의 모든 차량에 대해 언더컷 / 오버컷 결과를 계산합니다.
+    return: 순위가 바뀐 대결 → 시간 이득(Swing) 큰 순으로 정렬된 DataFrame
+    """
+    matrix = get_race_matrix(year, circuit)
+    if pit_loss is None:
+        pit_loss = race_pit_loss(year, circuit)
+    return evaluate_pit_battles(matrix, gap_window, response_laps, pit_loss)
+
+
+def evaluate_pit_battles(matrix, gap_window: float = UNDERCUT_GAP_WINDOW,
+                         response_laps: int = RESPONSE_LAPS, pit_loss: float = DEFAULT_PIT_LOSS) -> pd.DataFrame:
+    """
+    RaceMatrix → 피트 대결 테이블.
+      - 먼저 피트한 차(Driver)가 라이벌 뒤에 있었으면 UNDERCUT, 앞에 있었으면 COVER(라이벌의 오버컷 방어)
+      - 라이벌이 response_laps 안에 피트하면 라이벌 아웃 랩 종료 시점 간격으로 판정
+      - 끝까지 남아 있으면 창 마지막 랩 간격에서 라이벌이 앞으로 낼 피트 로스를 뺀 값으로 판정
+    """
+    race_time, lap_times, pit_in = matrix.race_time, matrix.lap_times, matrix.pit_in
+    n_drivers, n_laps = race_time.shape
+    if n_laps < 3:
+        return pd.DataFrame(columns=PIT_BATTLE_COLUMNS)
+    laps = np.arange(n_laps)
+
+    # 드라이버별 랩 l 기준 다음 피트 인 랩 / 직전 피트 인 랩 (없으면 n_laps / -n_laps)
+    next_pit = np.minimum.accumulate(np.where(pit_in, laps, n_laps)[:, ::-1], axis=1)[:, ::-1]
+    last_pit = np.maximum.accumulate(np.where(pit_in, laps, -n_laps), axis=1)
+
+    # 피트 스탑 목록 (인 랩 전 랩과 아웃 랩이 있어야 평가 가능)
+    stop_d, stop_l = np.nonzero(pit_in)
+    valid = (stop_l >= 1) & (stop_l + 1 < n_laps)
+    stop_d, stop_l = stop_d[valid], stop_l[valid]
+    if stop_d.size == 0:
+        return pd.DataFrame(columns=PIT_BATTLE_COLUMNS)
+    before = stop_l - 1
+
+    # [피트 스탑, 라이벌] 행렬
+    rivals = np.arange(n_drivers)[None, :]
+    gap_before = race_time[stop_d, before][:, None] - race_time[:, before].T
+    rival_pit = next_pit[:, stop_l].T
+    rival_recent = last_pit[:, before].T >= (stop_l - response_laps)[:, None]
+
+    candidate = (
+        (np.abs(gap_before) <= gap_window)
+        & (rivals != stop_d[:, None])
+        & ~rival_recent                      # 라이벌이 먼저 피트한 경우는 라이벌 쪽 스탑에서 평가
+    )
+    responded = rival_pit <= (stop_l + response_laps)[:, None]
+    eval_lap = np.where(responded, rival_pit + 1, np.minimum(stop_l + response_laps, n_laps - 1)[:, None])
+    eval_lap = np.minimum(eval_lap, n_laps - 1)
+
+    gap_after = race_time[stop_d[:, None], eval_lap] - race_time[rivals, eval_lap]
+    margin = np.where(responded, gap_after, gap_after - pit_loss)
+
+    # 기존 방식 비교값: (내 인 랩 + 아웃 랩) - (라이벌의 같은 두 랩)
+    in_out = lap_times[stop_d, stop_l] + lap_times[stop_d, stop_l + 1]
+    rival_in_out = lap_times[:, stop_l].T + lap_times[:, stop_l + 1].T
+    in_out_delta = in_out[:, None] - rival_in_out
+
+    keep = candidate & np.isfinite(gap_before) & np.isfinite(margin)
+    s, r = np.nonzero(keep)
+    if s.size == 0:
+        return pd.DataFrame(columns=PIT_BATTLE_COLUMNS)
+
+    drivers = np.array(matrix.drivers)
+    behind = gap_before[s, r] > 0
+    ahead_after = margin[s, r] < 0
+    df = pd.DataFrame({
+        'Driver': drivers[stop_d[s]],
+        'Pit_Lap': stop_l[s] + 1,
+        'Rival': drivers[r],
+        'Rival_Pit_Lap': np.where(responded[s, r], rival_pit[s, r] + 1, -1),
+        'Move': np.where(behind, "UNDERCUT", "COVER"),
+        'Gap_Before': gap_before[s, r].round(3),
+        'Margin': margin[s, r].round(3),
+        'Swing': (gap_before[s, r] - margin[s, r]).round(3),
+        'InOut_Delta': in_out_delta[s, r].round(3),
+        'Result': np.select(
+            [behind & ahead_after, behind, ahead_after],
+            ["✅ UNDERCUT SUCCESS", "❌ UNDERCUT FAILED", "🛡️ POSITION HELD"],
+            default="⚠️ OVERCUT BY RIVAL",
+        ),
+    })
+    df['Rival_Pit_Lap'] = df['Rival_Pit_Lap'].where(df['Rival_Pit_Lap'] > 0).astype('Int64')
+
+    # 순위가 바뀐 대결 먼저, 그 안에서 피트한 차의 시간 이득이 큰 순
+    df['Position_Change'] = behind == ahead_after
+    df = df.sort_values(['Position_Change', 'Swing'], ascending=[False, False], kind='stable')
+    return df[PIT_BATTLE_COLUMNS].reset_index(drop=True)
+
+
+def undercut_probability(margin: float) -> int:
+    """피트 후 간격(Margin) → 성공 확률 등급 (전술 시뮬레이터 기존 기준)"""
+    if margin < -2.0: return 90     # 2초 이상 앞섬
+    if margin < -0.5: return 60     # 근소하게 앞섬
+    if margin < 0: return 40        # 거의 비슷함
+    return 10                       # 뒤짐
+
+
+# =============================================================================
+# 몬테카를로 피트 전략 시뮬레이션 (1~3 스탑)
+# =============================================================================
+# 완주 시간 = Σ 랩 (기본 페이스 + 컴파운드 오프셋 + 마모율 × 타이어 수명 - 추세 × (랩 - 1))
+#            + Σ 피트 로스 (SC/VSC 중이면 감소) + SC/VSC 감속 + 랩 / 피트 작업 오차
+#   - 전략마다 컴파운드별 랩 수 L[s, c]와 타이어 수명 합 A[s, c] = Σ n(n+1)/2 만 있으면
+#     마모 항은 [전략, 컴파운드] @ [컴파운드, 롤아웃] 행렬곱 한 번
+#   - 롤아웃마다 마모율 / SC·VSC 발생 랩을 한 번 뽑고 모든 전략이 같은 표본을 공유 (전략 간 비교 분산 감소)
+#   - 추세는 연료 + 트랙 에볼루션 (마모 모델과 같은 값), 랩 번호에만 의존하므로 전략 간 차이에는 영향 없음
+DRY_COMPOUNDS = ['SOFT', 'MEDIUM', 'HARD']
+MIN_COMPOUND_LAPS = 30          # 서킷 전체에서 이 랩 수 미만인 컴파운드는 전략 후보에서 제외
+MAX_STOPS = 3
+MIN_STINT_LAPS = 5
+PIT_LAP_STEP = {1: 1, 2: 1, 3: 2}   # 스탑 수별 피트 랩 격자 간격 (3스탑은 2랩 간격)
+MAX_STRATEGIES = 60000
+MC_ROLLOUTS = 200
+
+SC_PACE_FACTOR = 1.4            # SC 랩 = 기본 페이스 × 1.4
+VSC_PACE_FACTOR = 1.3
+DEFAULT_SC_LAPS = 4             # 관측된 SC/VSC가 없을 때 지속 랩 수
+DEFAULT_VSC_LAPS = 2
+PIT_STOP_SIGMA = 0.8            # 피트 작업 시간 오차 (s, 스탑당)
+
+STRATEGY_COLUMNS = ['Strategy', 'Stops', 'Pit_Laps', 'Race_Time', 'Delta', 'Std', 'P10', 'P50', 'P90', 'P_Best']
+
+StrategyInputs = namedtuple('StrategyInputs', [
+    'races',          # 적합에 사용한 레이스 [(year, event_name)]
+    'laps',           # 레이스 랩 수 (가장 최근 레이스)
+    'base_pace',      # 기준 컴파운드 새 타이어 / 1랩 연료 기준 랩타임 (s, 최근 레이스 중간 드라이버)
+    'trend',          # 랩당 빨라지는 추세 (연료 + 트랙 에볼루션, s/lap)
+    'compounds',      # 전략 후보 컴파운드 (DRY_COMPOUNDS 순서)
+    'offset',         # 컴파운드별 페이스 오프셋 (s, 첫 컴파운드 = 0)
+    'deg',            # 컴파운드별 마모율 (s/lap)
+    'deg_se',         # 마모율 표준오차 (롤아웃 표본 분산)
+    'max_stint',      # 컴파운드별 관측 최장 스틴트 (랩)
+    'pit_loss',       # 그린 플래그 피트 로스 (s)
+    'sc_pit_loss',
+    'vsc_pit_loss',
+    'sc_rate',        # 랩당 SC 발동 확률
+    'vsc_rate',       # 랩당 VSC 발동 확률
+    'sc_laps',        # SC 평균 지속 랩 수
+    'vsc_laps',
+    'lap_sigma',      # 랩타임 잔차 표준편차 (s)
+])
+
+# StrategyInputs 중 numpy 배열 필드 (아티팩트 JSON ↔ 배열 변환)
+_INPUT_ARRAYS = ('offset', 'deg', 'deg_se', 'max_stint')
+STRATEGY_ARTIFACT = 'strategy_inputs'
+
+_inputs_cache = BoundedCache()
+
+
+def simulate_race_strategies(year: int, circuit: str, n_rollouts: int = MC_ROLLOUTS,
+                             max_stops: int = MAX_STOPS, top_n: int = 15, seed: int = 0):
+    """
+    서킷의 캐시된 레이스(year 시즌까지)로 입력을 적합하고 1~max_stops 스탑 전략을 몬테카를로로 평가합니다.
+    return: (StrategyInputs, 기대 완주 시간 순 상위 전략 DataFrame)
+    """
+    inputs = fit_strategy_inputs(circuit, year)
+    return inputs, simulate_strategies(inputs, n_rollouts, max_stops, top_n, seed)
+
+
+def fit_strategy_inputs(circuit: str, year: int = None) -> StrategyInputs:
+    """
+    같은 서킷의 캐시된 레이스(year 이하 시즌)를 합쳐서 시뮬레이션 입력을 적합합니다 (서킷 × 시즌 단위 캐시).
+      - 마모율: 레이스별 마모 모델(analytics)의 컴파운드 기울기를 랩 수로 가중 평균
+      - 오프셋 / 기본 페이스: 마모 + 추세를 뺀 랩타임 = (레이스, 드라이버) 절편 + 컴파운드 오프셋 최소제곱
+      - SC/VSC: RaceMatrix 랩별 트랙 상태에서 발동 횟수 / 지속 랩 수
+      - 피트 로스: 서킷 피트 로스 표(pit_loss.py)의 그린 / SC / VSC 값
+    가장 최근 레이스의 프리웜 아티팩트가 같은 레이스 목록으로 적합된 것이면 적합 없이 그대로 사용합니다.
+    """
+    from data_pipeline import analytics
+
+    races = [(y, e) for y, e in analytics.circuit_races(circuit, year) if year is None or y <= int(year)]
+    if not races:
+        raise ValueError(f"'{circuit}' 서킷의 캐시된 레이스가 없습니다.")
+    return _inputs_cache.get_or_load(
+        tuple(races), lambda: _stored_inputs(races) or _fit_inputs(circuit, year, races))
+
+
+def inputs_to_artifact(inputs: StrategyInputs) -> dict:
+    """StrategyInputs → JSON 아티팩트 dict (프리웜 저장용)"""
+    data = inputs._asdict()
+    for field in _INPUT_ARRAYS:
+        data[field] = np.asarray(data[field]).tolist()
+    data['races'] = [list(race) for race in inputs.races]
+    return data
+
+
+def inputs_from_artifact(data: dict) -> StrategyInputs:
+    """JSON 아티팩트 dict → StrategyInputs"""
+    values = dict(data)
+    values['races'] = [tuple(race) for race in data['races']]
+    values['offset'] = np.asarray(data['offset'], dtype=float)
+    values['deg'] = np.asarray(data['deg'], dtype=float)
+    values['deg_se'] = np.asarray(data['deg_se'], dtype=float)
+    values['max_stint'] = np.asarray(data['max_stint'], dtype=int)
+    return StrategyInputs(**{field: values[field] for field in StrategyInputs._fields})
+
+
+def _stored_inputs(races):
+    """가장 최근 레이스의 프리웜 아티팩트 (적합에 쓴 레이스 목록이 같을 때만, 없으면 None)"""
+    year, event_name = races[-1]
+    stored = artifact_store.read_artifact(year, event_name, STRATEGY_ARTIFACT)
+    if not stored or [tuple(race) for race in stored.get('races', [])] != list(races):
+        return None
+    return inputs_from_artifact(stored)
+
+
+def _fit_inputs(circuit, year, races) -> StrategyInputs:
+    from data_pipeline import analytics
+
+    frames, compound_tables, neutral, trends = [], [], [], []
+    for race_year, event_name in races:
+        model, laps, _ = analytics._get_degradation_model(race_year, event_name)
+        trend = model.fuel_effect + model.track_evolution
+        race = _race_label(race_year, event_name)
+        laps = laps[laps['Compound'].isin(DRY_COMPOUNDS)].copy()
+        laps['Race'] = race
+        laps['Corrected'] = laps['Time'] + trend * (laps['LapNumber'] - 1)
+        frames.append(laps)
+        compound_tables.append(model.compounds.assign(Race=race))
+        trends.append(trend)
+        neutral.append(_neutralisations(get_race_matrix(race_year, event_name).track_status))
+
+    laps = pd.concat(frames, ignore_index=True)
+    lap_counts = laps['Compound'].value_counts()
+    compounds = [c for c in DRY_COMPOUNDS if lap_counts.get(c, 0) >= MIN_COMPOUND_LAPS]
+    if not compounds:
+        raise ValueError(f"'{circuit}' 서킷에 드라이 컴파운드 랩 데이터가 부족합니다.")
+    laps = laps[laps['Compound'].isin(compounds)]
+
+    deg, deg_se = _pooled_degradation(pd.concat(compound_tables, ignore_index=True), compounds)
+    offset, base_pace, lap_sigma = _fit_compound_offsets(laps, compounds, deg, latest=_race_label(*races[-1]))
+    max_stint = laps.groupby('Compound')['TyreLife'].max().reindex(compounds).to_numpy(dtype=int)
+
+    total_laps = sum(n[0] for n in neutral)
+    sc_deploy, sc_laps = sum(n[1] for n in neutral), sum(n[2] for n in neutral)
+    vsc_deploy, vsc_laps = sum(n[3] for n in neutral), sum(n[4] for n in neutral)
+    pit_loss = circuit_pit_loss(circuit, year, load_missing=True)
+
+    return StrategyInputs(
+        races=races, laps=neutral[-1][0], base_pace=round(base_pace, 3),
+        trend=round(float(trends[-1]), 4), compounds=compounds,
+        offset=offset, deg=deg, deg_se=deg_se, max_stint=max_stint,
+        pit_loss=pit_loss['GREEN'], sc_pit_loss=pit_loss['SC'], vsc_pit_loss=pit_loss['VSC'],
+        sc_rate=sc_deploy / total_laps if total_laps else 0.0,
+        vsc_rate=vsc_deploy / total_laps if total_laps else 0.0,
+        sc_laps=max(1, round(sc_laps / sc_deploy)) if sc_deploy else DEFAULT_SC_LAPS,
+        vsc_laps=max(1, round(vsc_laps / vsc_deploy)) if vsc_deploy else DEFAULT_VSC_LAPS,
+        lap_sigma=round(lap_sigma, 3),
+    )
+
+
+def _race_label(year: int, event_name: str) -> str:
+    """레이스 구분 키 '2021_styrian' (같은 시즌 같은 서킷 더블헤더도 이벤트 이름이 달라서 구분됨)"""
+    return f"{int(year)}_{event_key(event_name, year)}"
+
+
+def _neutralisations(track_status):
+    """랩별 트랙 상태 [L] → (레이스 랩 수, SC 발동 횟수, SC 랩 수, VSC 발동 횟수, VSC 랩 수)"""
+    if len(track_status) == 0:
+        return 0, 0, 0, 0, 0
+    sc = track_status == TRACK_SC
+    vsc = track_status == TRACK_VSC
+
+    def runs(flags):
+        return int(np.count_nonzero(flags[1:] & ~flags[:-1]) + flags[0]), int(flags.sum())
+
+    return (len(track_status),) + runs(sc) + runs(vsc)
+
+
+def _pooled_degradation(compound_tables, compounds):
+    """레이스별 컴파운드 마모율 → 랩 수 가중 평균 + 표준오차 (신뢰구간 폭과 레이스 간 편차 중 큰 값)"""
+    table = compound_tables[compound_tables['Compound'].isin(compounds)].dropna(subset=['Deg_per_Lap'])
+    table = table.assign(SE=(table['CI_High'] - table['CI_Low']) / (2 * 1.96))
+    deg, deg_se = [], []
+    for compound in compounds:
+        rows = table[table['Compound'] == compound]
+        if rows.empty:
+            deg.append(0.0)
+            deg_se.append(0.0)
+            continue
+        weights = rows['Laps'].to_numpy(dtype=float)
+        values = rows['Deg_per_Lap'].to_numpy(dtype=float)
+        mean = float(np.average(values, weights=weights))
+        pooled_se = float(np.sqrt(np.nansum((weights * rows['SE'].to_numpy()) ** 2)) / weights.sum())
+        spread = float(np.sqrt(np.average((values - mean) ** 2, weights=weights)))
+        deg.append(max(mean, 0.0))
+        deg_se.append(max(pooled_se, spread))
+    return np.array(deg), np.array(deg_se)
+
+
+def _fit_compound_offsets(laps, compounds, deg, latest):
+    """
+    마모를 뺀 보정 랩타임 = (레이스, 드라이버) 절편 + 컴파운드 오프셋 (첫 컴파운드 기준) 최소제곱.
+    latest: 기본 페이스를 잡을 최근 레이스 키 (_race_label)
+    return: (오프셋 배열, 최근 레이스 중간 드라이버 절편 = 기본 페이스, 잔차 표준편차)
+    """
+    deg_of = dict(zip(compounds, deg))
+    y = (laps['Corrected'] - laps['Compound'].map(deg_of) * laps['TyreLife']).to_numpy(dtype=float)
+    entrants = laps['Race'].astype(str) + '_' + laps['Driver'].astype(str)
+    entrant_dummies = pd.get_dummies(entrants, dtype=float)
+    compound_dummies = pd.get_dummies(laps['Compound'], dtype=float).reindex(columns=compounds[1:], fill_value=0.0)
+    design = np.hstack([entrant_dummies.to_numpy(), compound_dummies.to_numpy()])
+
+    coef, _, _, _ = np.linalg.lstsq(design, y, rcond=None)
+    n_entrants = entrant_dummies.shape[1]
+    offset = np.concatenate([[0.0], coef[n_entrants:]])
+    latest_entrants = [i for i, name in enumerate(entrant_dummies.columns) if name.startswith(f"{latest}_")]
+    base_pace = float(np.median(coef[latest_entrants])) if latest_entrants else float(np.median(coef[:n_entrants]))
+    residual = y - design @ coef
+    return offset.round(3), base_pace, float(np.std(residual))
+
+
+def enumerate_strategies(n_laps: int, max_stint, max_stops: int = MAX_STOPS, min_stint: int = MIN_STINT_LAPS):
+    """
+    1~max_stops 스탑 전략 전체 (피트 랩 격자 × 컴파운드 순서).
+      - 스틴트는 min_stint 이상, 컴파운드별 max_stint 이하
+      - 컴파운드가 2종 이상이면 2종 이상 사용 (드라이 레이스 규정)
+      - 스탑 수별로 남은 MAX_STRATEGIES 몫을 넘으면 피트 랩 격자 간격을 넓혀서 다시 만듦
+    return: (pit_laps [S, max_stops] 피트 인 랩 (안 쓰는 자리 0),
+             sequence [S, max_stops + 1] 컴파운드 인덱스 (안 쓰는 자리 -1),
+             lengths [S, max_stops + 1] 스틴트 랩 수 (안 쓰는 자리 0))
+    """
+    max_stint = np.asarray(max_stint)
+    all_pits, all_seq, all_len = [], [], []
+    budget = MAX_STRATEGIES
+    for stops in range(1, max_stops + 1):
+        step = PIT_LAP_STEP.get(stops, 1)
+        while True:
+            pits, seqs, lengths = _strategy_grid(n_laps, max_stint, stops, step, min_stint)
+            if len(pits) <= budget // (max_stops - stops + 1) or step >= n_laps:
+                break
+            step += 1
+        budget -= len(pits)
+
+        pad = max_stops - stops
+        all_pits.append(np.pad(pits, ((0, 0), (0, pad))))
+        all_seq.append(np.pad(seqs, ((0, 0), (0, pad)), constant_values=-1))
+        all_len.append(np.pad(lengths, ((0, 0), (0, pad))))
+    return np.vstack(all_pits), np.vstack(all_seq), np.vstack(all_len)
+
+
+def _strategy_grid(n_laps, max_stint, stops, step, min_stint):
+    """스탑 수 하나의 (피트 랩 조합 × 컴파운드 순서) 중 스틴트 길이 조건을 만족하는 전략"""
+    n_compounds = len(max_stint)
+    grid = np.arange(min_stint, n_laps - min_stint + 1, step)
+    pits = np.array(list(combinations(grid, stops)), dtype=int).reshape(-1, stops)
+    bounds = np.column_stack([np.zeros(len(pits), dtype=int), pits, np.full(len(pits), n_laps)])
+    lengths = np.diff(bounds, axis=1).reshape(-1, stops + 1)
+    keep = (lengths >= min_stint).all(axis=1)
+    pits, lengths = pits[keep], lengths[keep]
+
+    seqs = np.array(list(product(range(n_compounds), repeat=stops + 1)), dtype=int)
+    if n_compounds > 1:
+        seqs = seqs[(seqs != seqs[:, :1]).any(axis=1)]
+    fits = (lengths[:, None, :] <= max_stint[seqs][None, :, :]).all(axis=2)   # [피트 조합, 컴파운드 순서]
+    p, q = np.nonzero(fits)
+    return pits[p], seqs[q], lengths[p]
+
+
+def simulate_strategies(inputs: StrategyInputs, n_rollouts: int = MC_ROLLOUTS, max_stops: int = MAX_STOPS,
+                        top_n: int = 15, seed: int = 0) -> pd.DataFrame:
+    """
+    StrategyInputs → 전략 × 롤아웃 완주 시간 [S, R] 배치 계산.
+    return: 기대 완주 시간 순 상위 top_n 전략 + 스탑 수별 최선 전략 (분위수 / 최선일 확률 포함)
+    """
+    rng = np.random.default_rng(seed)
+    n_laps, n_compounds = inputs.laps, len(inputs.compounds)
+    pits, seq, lengths = enumerate_strategies(n_laps, inputs.max_stint, max_stops)
+    if len(pits) == 0:
+        return pd.DataFrame(columns=STRATEGY_COLUMNS)
+    stops = (pits > 0).sum(axis=1)
+
+    # 전략별 컴파운드 랩 수 / 타이어 수명 합 [S, C]
+    onehot = seq[:, :, None] == np.arange(n_compounds)
+    laps_on = (onehot * lengths[:, :, None]).sum(axis=1).astype(np.float32)
+    age_sum = (onehot * (lengths * (lengths + 1) / 2)[:, :, None]).sum(axis=1).astype(np.float32)
+
+    # 롤아웃 표본: 마모율 [C, R], SC/VSC 랩 [R, L]
+    deg = np.maximum(rng.normal(inputs.deg[:, None], inputs.deg_se[:, None], (n_compounds, n_rollouts)), 0)
+    sc_on = _neutral_laps(rng.random((n_rollouts, n_laps)) < inputs.sc_rate, inputs.sc_laps)
+    vsc_on = _neutral_laps(rng.random((n_rollouts, n_laps)) < inputs.vsc_rate, inputs.vsc_laps) & ~sc_on
+
+    fixed = n_laps * inputs.base_pace - inputs.trend * n_laps * (n_laps - 1) / 2
+    neutral_time = inputs.base_pace * ((SC_PACE_FACTOR - 1) * sc_on.sum(axis=1)
+                                       + (VSC_PACE_FACTOR - 1) * vsc_on.sum(axis=1))
+    strategy_time = fixed + laps_on @ inputs.offset.astype(np.float32) + stops * inputs.pit_loss
+
+    times = age_sum @ deg.astype(np.float32)                       # [S, R]
+    times += (strategy_time[:, None] + neutral_time[None, :]).astype(np.float32)
+
+    # SC/VSC 중 피트 인 → 피트 로스 감소 (피트 랩 l은 인덱스 l - 1, 안 쓰는 자리 0은 마지막 0 열)
+    pit_gain = np.zeros((n_rollouts, n_laps + 1), dtype=np.float32)
+    pit_gain[:, :n_laps] = ((inputs.pit_loss - inputs.sc_pit_loss) * sc_on
+                            + (inputs.pit_loss - inputs.vsc_pit_loss) * vsc_on)
+    for k in range(pits.shape[1]):
+        times -= pit_gain[:, pits[:, k] - 1].T
+
+    # 랩 오차는 롤아웃 공통, 피트 작업 오차는 k번째 스탑마다 공통 (전략 간 차이는 마모 / SC 타이밍에서만 생김)
+    lap_noise = rng.normal(0, inputs.lap_sigma * np.sqrt(n_laps), n_rollouts)
+    stop_noise = np.vstack([np.zeros((1, n_rollouts)),
+                            np.cumsum(rng.normal(0, PIT_STOP_SIGMA, (max_stops, n_rollouts)), axis=0)])
+    times += (lap_noise[None, :] + stop_noise[stops]).astype(np.float32)
+
+    # 요약: 기대값 순위 + 롤아웃별 최선 전략 비율, 분위수는 보고할 전략만
+    mean = times.mean(axis=1)
+    best_share = np.bincount(times.argmin(axis=0), minlength=len(times)) / n_rollouts
+    order = np.argsort(mean, kind='stable')
+    chosen = list(order[:top_n])
+    for n_stops in range(1, max_stops + 1):
+        of_count = order[stops[order] == n_stops]
+        if of_count.size and of_count[0] not in chosen:
+            chosen.append(of_count[0])
+    chosen = np.array(chosen)
+
+    chosen_times = times[chosen].astype(float)
+    p10, p50, p90 = np.percentile(chosen_times, [10, 50, 90], axis=1)
+    initials = np.array([c[0] for c in inputs.compounds])
+    df = pd.DataFrame({
+        'Strategy': ['-'.join(initials[seq[i][seq[i] >= 0]]) for i in chosen],
+        'Stops': stops[chosen],
+        'Pit_Laps': [', '.join(str(p) for p in pits[i][pits[i] > 0]) for i in chosen],
+        'Race_Time': chosen_times.mean(axis=1).round(2),
+        'Delta': (chosen_times.mean(axis=1) - chosen_times[0].mean()).round(2),
+        'Std': chosen_times.std(axis=1).round(2),
+        'P10': p10.round(2), 'P50': p50.round(2), 'P90': p90.round(2),
+        'P_Best': best_share[chosen].round(3),
+    })
+    return df[STRATEGY_COLUMNS].reset_index(drop=True)
+
+
+def _neutral_laps(starts, duration: int) -> np.ndarray:
+    """발동 랩 [R, L] → 발동 후 duration 랩 동안 True (누적 합 차분)"""
+    counts = np.cumsum(starts, axis=1)
+    shifted = np.zeros_like(counts)
+    if duration < counts.shape[1]:
+        shifted[:, duration:] = counts[:, :-duration]
+    return (counts - shifted) > 0
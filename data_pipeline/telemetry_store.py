@@ -0,0 +1,197 @@
+# data_pipeline/telemetry_store.py
+#
+# 레이스별 드라이버 최속 랩(Fastest Lap) 텔레메트리 저장소
+#
+# 배경:
+#   - 도미넌스 맵 / 스피드 트레이스는 두 드라이버의 pick_fastest().get_telemetry()만 쓰는데
+#     매번 세션 전체 텔레메트리(car_data + pos_data)를 로드함
+#   - 커밋된 캐시에는 car/pos 데이터가 없어서 임시 캐시로 우회해 다시 다운로드까지 함
+#   → 텔레메트리를 한 번이라도 확보했을 때 드라이버별 최속 랩만 float32 배열로 저장하고
+#     차트는 필요한 두 드라이버 파일만 memory-map으로 읽는다
+#
+# 저장 위치: data/telemetry_store/<year>/<Event_Name>/<DRV>.npy   (shape: [채널, 샘플], float32)
+#            data/telemetry_store/<year>/<Event_Name>/index.json  (채널 순서, 랩 정보, 드라이버 색상)
+#
+# 빌드: python -m data_pipeline.telemetry_store --years 2024 2025  (텔레메트리 다운로드 가능한 환경에서)
+
+import os
+import sys
+import json
+import shutil
+import logging
+import argparse
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from data_pipeline.event_resolver import resolve_event, get_resolver
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+TELEMETRY_STORE_DIR = os.path.join(PROJECT_ROOT, 'data', 'telemetry_store')
+
+# 저장 채널 (get_telemetry().add_distance() 컬럼명 그대로)
+CHANNELS = ('Distance', 'Speed', 'X', 'Y', 'Throttle', 'Brake', 'nGear')
+
+INDEX_FILE = 'index.json'
+DEFAULT_COLOR = '#ffffff'
+
+
+# =============================================================================
+# 경로 / 조회
+# =============================================================================
+def telemetry_store_dir(year: int, event_name: str) -> str:
+    """(2024, 'British Grand Prix') -> data/telemetry_store/2024/British_Grand_Prix"""
+    return os.path.join(TELEMETRY_STORE_DIR, str(year), str(event_name).strip().replace(' ', '_'))
+
+
+def read_index(year: int, event: str):
+    """저장된 레이스의 index.json (없으면 None). event는 별명/한글 허용."""
+    event_name = resolve_event(event, year)
+    if event_name is None:
+        return None
+    path = os.path.join(telemetry_store_dir(year, event_name), INDEX_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"[TelemetryStore] index 읽기 실패 ({year} {event_name}): {e}")
+        return None
+
+
+def read_fastest_lap(year: int, event: str, driver: str):
+    """
+    드라이버 1명의 최속 랩 텔레메트리를 {채널: 배열} 로 반환합니다 (없으면 None).
+    배열은 memory-map 뷰라서 실제로 접근한 부분만 디스크에서 읽힙니다.
+    """
+    index = read_index(year, event)
+    if index is None or driver not in index['drivers']:
+        return None
+    path = os.path.join(telemetry_store_dir(year, index['event_name']), f"{driver}.npy")
+    try:
+        data = np.load(path, mmap_mode='r')
+    except Exception as e:
+        logger.warning(f"[TelemetryStore] 읽기 실패 ({year} {index['event_name']} {driver}): {e}")
+        return None
+    return dict(zip(index['channels'], data))
+
+
+def has_race(year: int, event: str) -> bool:
+    return read_index(year, event) is not None
+
+
+# =============================================================================
+# 기록
+# =============================================================================
+def fastest_lap_arrays(lap) -> np.ndarray:
+    """fastf1 Lap → [채널, 샘플] float32 배열"""
+    tel = lap.get_telemetry().add_distance()
+    return np.vstack([tel[channel].to_numpy(dtype='float32') for channel in CHANNELS])
+
+
+def _write_driver_arrays(session, out_dir: str) -> dict:
+    """드라이버별 최속 랩 배열을 <DRV>.npy로 쓰고 index용 메타데이터를 반환합니다."""
+    import fastf1.plotting
+
+    year = int(session.event['EventDate'].year)
+    event_name = session.event['EventName']
+    drivers = {}
+    for driver in session.laps['Driver'].dropna().unique():
+        try:
+            lap = session.laps.pick_drivers(driver).pick_fastest()
+            if lap is None:
+                continue
+            np.save(os.path.join(out_dir, f"{driver}.npy"), fastest_lap_arrays(lap))
+        except Exception as e:
+            logger.debug(f"[TelemetryStore] {year} {event_name} {driver} 건너뜀: {e}")
+            continue
+        try:
+            color = fastf1.plotting.get_driver_color(driver, session=session)
+        except Exception:
+            color = DEFAULT_COLOR
+        drivers[driver] = {
+            'lap_number': int(lap['LapNumber']),
+            'lap_time': lap['LapTime'].total_seconds(),
+            'color': color,
+        }
+
+    return drivers
+
+
+def write_race_telemetry(session, overwrite: bool = False) -> bool:
+    """
+    텔레메트리가 로드된 세션에서 드라이버별 최속 랩을 저장합니다 (레이스당 1회).
+    index.json을 마지막에 써서, 중간에 실패한 레이스는 저장되지 않은 것으로 취급합니다.
+    """
+    year = int(session.event['EventDate'].year)
+    event_name = session.event['EventName']
+    target_dir = telemetry_store_dir(year, event_name)
+    if not overwrite and os.path.exists(os.path.join(target_dir, INDEX_FILE)):
+        return False
+
+    tmp_dir = f"{target_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    try:
+        drivers = _write_driver_arrays(session, tmp_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    if not drivers:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return False
+
+    shutil.rmtree(target_dir, ignore_errors=True)
+    os.replace(tmp_dir, target_dir)
+    index = {
+        'year': year,
+        'event_name': event_name,
+        'channels': list(CHANNELS),
+        'drivers': drivers,
+    }
+    with open(os.path.join(target_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    return True
+
+
+def build_telemetry_store(years=None, overwrite: bool = False):
+    """캐시에 있는 레이스의 텔레메트리를 로드해서 저장합니다 (텔레메트리 확보 가능한 환경용)."""
+    from data_pipeline.session_registry import load_session
+
+    built, skipped, failed = 0, 0, 0
+    for record in get_resolver().events():
+        if years and record.year not in years:
+            continue
+        if not overwrite and has_race(record.year, record.event_name):
+            skipped += 1
+            continue
+        try:
+            session = load_session(record.year, record.event_name, 'R', telemetry=True)
+            if write_race_telemetry(session, overwrite=overwrite):
+                built += 1
+                print(f"   ✅ {record.year} {record.event_name}")
+            else:
+                failed += 1
+                print(f"   ⚠️ {record.year} {record.event_name}: 텔레메트리 없음")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {record.year} {record.event_name}: {e}")
+    print(f"\n [TelemetryStore] 완료: 저장 {built} / 건너뜀 {skipped} / 실패 {failed}")
+
+
+if __name__ == "__main__":
+    from data_pipeline.cache_setup import ensure_cache
+
+    parser = argparse.ArgumentParser(description="레이스별 최속 랩 텔레메트리 저장소 빌드")
+    parser.add_argument('--years', type=int, nargs=2, metavar=('START', 'END'),
+                        help="빌드할 연도 범위 (예: --years 2024 2025)")
+    parser.add_argument('--overwrite', action='store_true', help="이미 저장된 레이스도 다시 저장")
+    args = parser.parse_args()
+
+    ensure_cache()
+    target_years = set(range(args.years[0], args.years[1] + 1)) if args.years else None
+    build_telemetry_store(target_years, overwrite=args.overwrite)
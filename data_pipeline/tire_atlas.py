@@ -0,0 +1,72 @@
+# data_pipeline/tire_atlas.py
+#
+# 서킷 × 시즌 × 컴파운드 타이어 아틀라스 (페이스 / 스틴트 길이 / 보정 마모율)
+#
+# 배경:
+#   - "실버스톤 5시즌 타이어 비교" 같은 질문은 calculate_tire_degradation을 시즌마다 호출해서
+#     LLM 도구 호출 한 번 안에 세션 로드가 5번 일어남
+#   → 배치 잡(data_pipeline/pipelines/build_tire_atlas.py)이 캐시된 전체 레이스를 미리 계산해 표 하나로 저장하고
+#     전략 도구 / UI는 이 표를 필터링만 한다
+#
+# 저장 위치: data/tire_atlas/tire_atlas.parquet  (레이스 × 컴파운드 1행)
+
+import os
+
+import pandas as pd
+
+from data_pipeline.event_resolver import resolve_event_record
+from data_pipeline.race_table import VersionedRaceTable
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+TIRE_ATLAS_DIR = os.path.join(PROJECT_ROOT, 'data', 'tire_atlas')
+TIRE_ATLAS_PATH = os.path.join(TIRE_ATLAS_DIR, 'tire_atlas.parquet')
+
+# 계산 방식이 바뀌면 올려서 배치 잡이 전체를 다시 계산하도록 함
+ATLAS_VERSION = 1
+
+ATLAS_COLUMNS = [
+    'Circuit', 'Year', 'EventName', 'Compound',
+    'Stints', 'Laps', 'Avg_Pace',
+    'Deg_per_Lap', 'CI_Low', 'CI_High',
+    'Avg_Stint', 'Max_Stint', 'P50_Stint', 'P75_Stint', 'P90_Stint',
+    'Track_Evolution', 'Version',
+]
+
+ATLAS_TABLE = VersionedRaceTable(TIRE_ATLAS_PATH, ATLAS_COLUMNS, ['Circuit', 'Year', 'Compound'],
+                                 ATLAS_VERSION, 'TireAtlas')
+
+# 아틀라스 전체 표 (없으면 None) / 표 전체 교체 저장 / 현재 버전으로 들어 있는 (year, event_name)
+read_atlas = ATLAS_TABLE.read
+write_atlas = ATLAS_TABLE.write
+built_races = ATLAS_TABLE.built_races
+
+
+# =============================================================================
+# 조회
+# =============================================================================
+def circuit_key(record) -> str:
+    """EventRecord → 서킷 식별자 (Circuit ShortName, 이벤트명이 바뀐 해도 같은 값)"""
+    return record.location[1] if record.location else record.event_name
+
+
+def query_atlas(circuit: str = None, years=None, compound: str = None) -> pd.DataFrame:
+    """
+    아틀라스 필터링. circuit은 별명/국가명/한글 허용 (같은 서킷의 모든 시즌 반환).
+    return: 시즌 → 컴파운드 순으로 정렬된 DataFrame (아틀라스가 없으면 빈 DataFrame)
+    """
+    table = read_atlas()
+    if table is None:
+        return ATLAS_TABLE.empty()
+
+    mask = pd.Series(True, index=table.index)
+    if circuit:
+        record = resolve_event_record(circuit)
+        if record is None:
+            return ATLAS_TABLE.empty()
+        mask &= table['Circuit'] == circuit_key(record)
+    if years:
+        mask &= table['Year'].isin(list(years))
+    if compound:
+        mask &= table['Compound'] == str(compound).strip().upper()
+    return table[mask].sort_values(['Year', 'Compound']).reset_index(drop=True)
+
@@ -0,0 +1,156 @@
+# data_pipeline/traffic.py
+#
+# 간격 기반 트래픽(더티 에어) 엔진
+#
+# 배경:
+#   - 전략 감사는 TimeDiffToAhead 컬럼이 있을 때만 트래픽을 판정하는데 FastF1 랩 테이블에는 이 컬럼이 없어서
+#     거의 모든 레이스가 "트래픽 0%"로 나옴
+#   → 레이스 시간 행렬(race_matrix)의 랩 종료 시각을 전체 그리드에 대해 한 번 정렬해서
+#     각 랩 종료 시점에 바로 앞에서 컨트롤 라인을 지난 차(순위와 무관, 랩 다운 차량 포함)와의 간격을 구하고
+#     임계값 이내면 더티 에어 랩으로 판정
+#   - 트래픽 손실 = 트래픽 랩타임 - 같은 스틴트 클린 에어 랩으로 적합한 기대 랩타임 (랩 번호 1차 추세)
+#     스틴트 그룹 합계(Σx, Σy, Σxx, Σxy)로 전체 그리드를 한 번에 계산
+#
+# 판정 대상 랩: 그린 랩 중 1랩 / 피트 인·아웃 랩 / 레이스 최속 랩 107% 초과 랩 제외
+
+import os
+import logging
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from data_pipeline.bounded_cache import BoundedCache
+from data_pipeline.event_resolver import resolve_event_name
+from data_pipeline.race_matrix import get_race_matrix, TRACK_GREEN
+
+logger = logging.getLogger(__name__)
+
+# 앞 차와 이 간격(s) 이내로 라인을 지나면 더티 에어 랩
+TRAFFIC_GAP = float(os.getenv("PITWALL_TRAFFIC_GAP", "1.0"))
+QUICKLAP_THRESHOLD = 1.07       # 레이스 최속 랩 대비 107% 이내 랩만 판정
+MIN_TREND_LAPS = 3              # 스틴트 기대 랩타임에 추세(기울기)를 쓸 최소 클린 랩 수
+
+TRAFFIC_STINT_COLUMNS = ['Driver', 'Stint', 'Racing_Laps', 'Traffic_Laps', 'Time_Lost']
+
+TrafficResult = namedtuple('TrafficResult', [
+    'drivers',      # 드라이버 약어 (race_matrix와 같은 순서)
+    'gap_ahead',    # 랩 종료 시점 트랙 위 바로 앞 차와의 간격 (s), shape [D, L]
+    'racing',       # 판정 대상 랩, shape [D, L] bool
+    'dirty_air',    # 더티 에어 랩 (racing & gap_ahead < 임계값), shape [D, L] bool
+    'stint',        # 스틴트 번호 (1부터, 피트 인 다음 랩부터 +1), shape [D, L]
+    'time_lost',    # 트래픽 랩의 손실 시간 (s, 트래픽 랩이 아니거나 기준이 없으면 NaN), shape [D, L]
+    'stints',       # 스틴트별 요약 DataFrame (TRAFFIC_STINT_COLUMNS)
+])
+
+_traffic_cache = BoundedCache()
+
+
+# =============================================================================
+# 계산
+# =============================================================================
+def gap_ahead_on_track(race_time) -> np.ndarray:
+    """
+    전체 그리드의 랩 종료 시각을 한 번 정렬해서 각 라인 통과 직전에 지나간 다른 차와의 간격을 구합니다.
+    순위가 아니라 트랙 위 위치 기준이라 랩 다운 차량 / 선두의 백마커 추월도 포함됩니다.
+    """
+    n_laps = race_time.shape[1]
+    flat = race_time.ravel()
+    cells = np.nonzero(np.isfinite(flat))[0]
+    cells = cells[np.argsort(flat[cells], kind='stable')]
+    owner = cells // n_laps
+
+    gap = np.full(flat.shape, np.nan)
+    gap[cells[1:]] = np.where(owner[1:] != owner[:-1], np.diff(flat[cells]), np.nan)
+    return gap.reshape(race_time.shape)
+
+
+def compute_traffic(matrix, threshold: float = TRAFFIC_GAP) -> TrafficResult:
+    """RaceMatrix 1개 → TrafficResult (전체 그리드 한 번에)"""
+    lap_times = matrix.lap_times
+    n_drivers, n_laps = lap_times.shape
+    gap = gap_ahead_on_track(matrix.race_time)
+
+    # 스틴트 번호 / 아웃 랩 (피트 인 랩 다음 랩)
+    out_lap = np.zeros_like(matrix.pit_in)
+    out_lap[:, 1:] = matrix.pit_in[:, :-1]
+    stint = 1 + np.cumsum(out_lap, axis=1)
+
+    with np.errstate(invalid='ignore'):
+        fastest = np.nanmin(lap_times) if np.isfinite(lap_times).any() else np.nan
+        racing = (np.isfinite(lap_times) & (lap_times <= fastest * QUICKLAP_THRESHOLD)
+                  & (matrix.track_status == TRACK_GREEN)[None, :]
+                  & ~matrix.pit_in & ~out_lap)
+        racing[:, :1] = False
+        dirty_air = racing & (gap < threshold)
+    clean = racing & ~dirty_air
+
+    # 스틴트(드라이버 × 스틴트) 그룹 합계로 클린 랩 1차 추세 적합
+    group = (np.arange(n_drivers)[:, None] * (n_laps + 1) + stint).ravel()
+    _, group = np.unique(group, return_inverse=True)
+    n_groups = group.max() + 1 if group.size else 0
+    x = np.broadcast_to(np.arange(1, n_laps + 1, dtype=float), lap_times.shape).ravel()
+    y = np.where(clean, lap_times, 0.0).ravel()
+    w = clean.ravel().astype(float)
+
+    def total(values):
+        return np.bincount(group, weights=values, minlength=n_groups)
+
+    n, sx, sy = total(w), total(w * x), total(y)
+    sxx, sxy = total(w * x * x), total(x * y)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x, mean_y = sx / n, sy / n
+        var_x = sxx - n * mean_x ** 2
+        slope = np.where((n >= MIN_TREND_LAPS) & (var_x > 0), (sxy - n * mean_x * mean_y) / var_x, 0.0)
+        expected = mean_y[group] + slope[group] * (x - mean_x[group])
+    time_lost = np.where(dirty_air.ravel(), lap_times.ravel() - expected, np.nan).reshape(lap_times.shape)
+
+    stints = _stint_summary(matrix.drivers, stint, racing, dirty_air, time_lost)
+    return TrafficResult(matrix.drivers, gap, racing, dirty_air, stint, time_lost, stints)
+
+
+def _stint_summary(drivers, stint, racing, dirty_air, time_lost) -> pd.DataFrame:
+    frame = pd.DataFrame({
+        'Driver': np.repeat(np.asarray(drivers, dtype=object), stint.shape[1]),
+        'Stint': stint.ravel(),
+        'Racing_Laps': racing.ravel(),
+        'Traffic_Laps': dirty_air.ravel(),
+        'Time_Lost': time_lost.ravel(),
+    })
+    frame = frame[frame['Racing_Laps']]
+    summary = frame.groupby(['Driver', 'Stint'], sort=False).agg(
+        Racing_Laps=('Racing_Laps', 'size'),
+        Traffic_Laps=('Traffic_Laps', 'sum'),
+        Time_Lost=('Time_Lost', lambda s: s.sum(min_count=1)),
+    ).reset_index()
+    summary['Time_Lost'] = summary['Time_Lost'].round(2)
+    return summary[TRAFFIC_STINT_COLUMNS]
+
+
+# =============================================================================
+# 조회 (레이스 단위 프로세스 캐시)
+# =============================================================================
+def get_race_traffic(year: int, circuit: str, threshold: float = TRAFFIC_GAP) -> TrafficResult:
+    """레이스 1개의 트래픽 판정 (레이스 × 임계값 단위 프로세스 캐시)"""
+    event_name = resolve_event_name(circuit, year)
+    return _traffic_cache.get_or_load((int(year), event_name, float(threshold)),
+                                      lambda: compute_traffic(get_race_matrix(year, event_name), threshold))
+
+
+def lap_traffic(traffic: TrafficResult, drivers, lap_numbers):
+    """
+    (드라이버 약어, LapNumber) 배열 → (더티 에어 여부, 손실 시간) 배열.
+    랩 테이블에 행을 붙일 때 사용 (행렬에 없는 드라이버 / 랩은 False / NaN)
+    """
+    row_of = {drv: i for i, drv in enumerate(traffic.drivers)}
+    d = pd.Series(drivers).map(row_of).to_numpy(dtype=float)
+    l = np.asarray(lap_numbers, dtype=float) - 1
+    n_drivers, n_laps = traffic.dirty_air.shape
+    valid = np.isfinite(d) & np.isfinite(l) & (l >= 0) & (l < n_laps)
+    d, l = d[valid].astype(int), l[valid].astype(int)
+
+    dirty_air = np.zeros(valid.shape, dtype=bool)
+    time_lost = np.full(valid.shape, np.nan)
+    dirty_air[valid] = traffic.dirty_air[d, l]
+    time_lost[valid] = traffic.time_lost[d, l]
+    return dirty_air, time_lost
@@ -2,6 +2,10 @@ import fastf1
 import sqlite3
 import pandas as pd
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from data_pipeline.race_db import migrate_schema, tag_event_columns
 
 # --- 경로 설정 ---
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
@@ -40,16 +44,19 @@ def update_race_results(year: int, gp: str):
             'Points': results['Points'],
             'Status': results['Status']
         })
+        df = tag_event_columns(df, year, race_id, event['RoundNumber'])
         
         conn = sqlite3.connect(DB_FILE_PATH)
+        migrate_schema(conn)  # 기존 DB에 event_key / round 컬럼이 없으면 추가
         cursor = conn.cursor()
         
-        # 3. 멱등성 보장 (실수로 두 번 돌려도 중복 안 쌓이게 기존 데이터 삭제)
-        cursor.execute("DELETE FROM race_results WHERE Year = ? AND RaceID = ?", (year, race_id))
+        # 3. 멱등성 보장 (실수로 두 번 돌려도 중복 안 쌓이게 기존 데이터 삭제, (Year, event_key) 인덱스 사용)
+        cursor.execute("DELETE FROM race_results WHERE Year = ? AND event_key = ?", (year, df['event_key'].iloc[0]))
         conn.commit()
         
-        # 4. 새 데이터 DB에 꽂아넣기
+        # 4. 새 데이터 DB에 꽂아넣기 (새로 만든 테이블이면 인덱스도 생성)
         df.to_sql('race_results', conn, if_exists='append', index=False)
+        migrate_schema(conn)
         print(f"✅ 성공! {year} {race_id} 레이스 결과 {len(df)}건이 DB에 저장되었습니다.")
         
     except Exception as e:
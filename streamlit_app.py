@@ -2,13 +2,6 @@ import streamlit as st
 import numpy as np
 if not hasattr(np, 'NaN'):
     np.NaN = np.nan  # NumPy 2.0 호환성 패치
-import matplotlib
-
-matplotlib.use('Agg')
-
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-import plotly.graph_objects as go
 import os
 import sys
 import asyncio
@@ -17,85 +10,10 @@ import json
 import re
 import logging
 logging.getLogger('fastf1').setLevel(logging.ERROR)
-import fastf1
 
-
-# FastF1 캐시 설정 (앱 진입점에서 먼저 초기화)
-_project_root = os.path.dirname(os.path.abspath(__file__))
-_local_cache = os.path.join(_project_root, 'data', 'cache')
-try:
-    os.makedirs(_local_cache, exist_ok=True)
-    _wt = os.path.join(_local_cache, '.write_test')
-    with open(_wt, 'w') as f:
-        f.write('ok')
-    os.remove(_wt)
-    fastf1.Cache.enable_cache(_local_cache)
-except (PermissionError, OSError):
-    _tmp_cache = '/tmp/fastf1_cache'
-    os.makedirs(_tmp_cache, exist_ok=True)
-    if os.path.exists(_local_cache):
-        for _item in os.listdir(_local_cache):
-            _src = os.path.join(_local_cache, _item)
-            _dst = os.path.join(_tmp_cache, _item)
-            if os.path.isdir(_src) and not os.path.exists(_dst):
-                try:
-                    os.symlink(_src, _dst)
-                except OSError:
-                    pass
-    fastf1.Cache.enable_cache(_tmp_cache)
-
-# FastF1 캐시 설정 (앱 진입점에서 먼저 초기화)
-_project_root = os.path.dirname(os.path.abspath(__file__))
-_local_cache = os.path.join(_project_root, 'data', 'cache')
-try:
-    os.makedirs(_local_cache, exist_ok=True)
-    _wt = os.path.join(_local_cache, '.write_test')
-    with open(_wt, 'w') as f:
-        f.write('ok')
-    os.remove(_wt)
-    fastf1.Cache.enable_cache(_local_cache)
-except (PermissionError, OSError):
-    _tmp_cache = '/tmp/fastf1_cache'
-    os.makedirs(_tmp_cache, exist_ok=True)
-    if os.path.exists(_local_cache):
-        for _item in os.listdir(_local_cache):
-            _src = os.path.join(_local_cache, _item)
-            _dst = os.path.join(_tmp_cache, _item)
-            if os.path.isdir(_src) and not os.path.exists(_dst):
-                try:
-                    os.symlink(_src, _dst)
-                except OSError:
-                    pass
-    fastf1.Cache.enable_cache(_tmp_cache)
-
-# FastF1 캐시 설정 (앱 진입점에서 먼저 초기화)
-_project_root = os.path.dirname(os.path.abspath(__file__))
-_local_cache = os.path.join(_project_root, 'data', 'cache')
-try:
-    os.makedirs(_local_cache, exist_ok=True)
-    _wt = os.path.join(_local_cache, '.write_test')
-    with open(_wt, 'w') as f:
-        f.write('ok')
-    os.remove(_wt)
-    fastf1.Cache.enable_cache(_local_cache)
-except (PermissionError, OSError):
-    _tmp_cache = '/tmp/fastf1_cache'
-    os.makedirs(_tmp_cache, exist_ok=True)
-    if os.path.exists(_local_cache):
-        for _item in os.listdir(_local_cache):
-            _src = os.path.join(_local_cache, _item)
-            _dst = os.path.join(_tmp_cache, _item)
-            if os.path.isdir(_src) and not os.path.exists(_dst):
-                try:
-                    os.symlink(_src, _dst)
-                except OSError:
-                    pass
-    fastf1.Cache.enable_cache(_tmp_cache)
-
-################################################################
-from llama_index.core import Settings
-from llama_index.embeddings.google_genai import GoogleGenAIEmbedding
-from llama_index.llms.google_genai import GoogleGenAI
+# matplotlib / 한글 폰트 / LlamaIndex / 에이전트 모듈은 버튼을 눌러 처음 필요해질 때 로드
+# (import 시간 프로파일: python -m app.lazy_loader)
+os.environ.setdefault('MPLBACKEND', 'Agg')
 
 # API 키 가져오기 (Secrets or Env)
 api_key = os.getenv("GOOGLE_API_KEY")
@@ -106,46 +24,51 @@ if not api_key:
         st.error("🚨 API Key가 없습니다!")
         st.stop()
 
-# 1. LLM 강제 설정 (Gemini)
-llm = GoogleGenAI(model="models/gemini-2.5-flash", api_key=api_key)
-Settings.llm = llm
-
-# 2. 임베딩 강제 설정 (Gemini) 
-# ★ 이게 없으면 자꾸 OpenAI를 찾습니다!
-Settings.embed_model = GoogleGenAIEmbedding(
-    model_name="models/gemini-embedding-001",  # 아까 쓰기로 한 그 모델
-    api_key=api_key
-)
-#############################################################################
-
-# --- [1. 한글 폰트 설정] ---
-font_path = "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"
-if os.path.exists(font_path):
-    fm.fontManager.addfont(font_path)
-    font_name = fm.FontProperties(fname=font_path).get_name()
-    plt.rc('font', family=font_name)
-    plt.rc('axes', unicode_minus=False)
-
-# --- [2. 프로젝트 경로 설정] ---
+# --- [1. 프로젝트 경로 설정] ---
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
-# --- [3. 모듈 임포트] ---
+# --- [2. 모듈 임포트 (경량 모듈만)] ---
 try:
-    from app.agents.briefing_agent import run_briefing_agent, generate_quick_summary
-    from app.agents.strategy_agent import run_strategy_agent
-    from app.tools.telemetry_data import (
-        generate_track_dominance_plot,
-        get_race_pace_data,
-        get_speed_trace_data,
-        DRIVER_MAPPING
-    )
-    from app.agents.tactic_simulation_agent import run_simulation_agent
+    from app.lazy_loader import lazy_attr, memoized
+    from app.tools.driver_mapping import DRIVER_MAPPING
+    from app.tools.strategy_chart import plot_tire_strategy_chart, plot_race_trace
+    from data_pipeline.tire_atlas import query_atlas
 except ImportError as e:
     st.error(f"모듈 로드 실패: {e}")
     st.stop()
 
+
+################################################################
+# --- [3. LLM / 임베딩 설정 (첫 에이전트 호출 시 1회)] ---
+@memoized
+def configure_llm_settings():
+    from llama_index.core import Settings
+    from llama_index.embeddings.google_genai import GoogleGenAIEmbedding
+    from llama_index.llms.google_genai import GoogleGenAI
+
+    # 1. LLM 강제 설정 (Gemini)
+    Settings.llm = GoogleGenAI(model="models/gemini-2.5-flash", api_key=api_key)
+
+    # 2. 임베딩 강제 설정 (Gemini) 
+    # ★ 이게 없으면 자꾸 OpenAI를 찾습니다!
+    Settings.embed_model = GoogleGenAIEmbedding(
+        model_name="models/gemini-embedding-001",  # 아까 쓰기로 한 그 모델
+        api_key=api_key
+    )
+    return Settings
+#############################################################################
+
+# 에이전트 진입점: 첫 호출 시 LLM 설정 → 에이전트 모듈 import (이후 재사용)
+run_briefing_agent = lazy_attr('app.agents.briefing_agent', 'run_briefing_agent', on_load=configure_llm_settings)
+generate_quick_summary = lazy_attr('app.agents.briefing_agent', 'generate_quick_summary', on_load=configure_llm_settings)
+run_strategy_agent = lazy_attr('app.agents.strategy_agent', 'run_strategy_agent', on_load=configure_llm_settings)
+run_simulation_agent = lazy_attr('app.agents.tactic_simulation_agent', 'run_simulation_agent', on_load=configure_llm_settings)
+get_race_stints = lazy_attr('data_pipeline.analytics', 'get_race_stints')
+get_race_matrix = lazy_attr('data_pipeline.race_matrix', 'get_race_matrix')
+simulate_race_strategies = lazy_attr('data_pipeline.strategy_sim', 'simulate_race_strategies')
+
 # --- [4. 페이지 설정] ---
 st.set_page_config(
     page_title="PitWall-AI Pro",
@@ -249,114 +172,26 @@ TELEMETRY_TIPS = {
 
 @st.cache_data(ttl=3600)
 def get_all_drivers_stint_data(year, gp):
-    """전체 드라이버의 스틴트 정보를 가져옵니다 (로컬 캐시 스캐너 적용판)."""
-    import os
-    import fastf1
+    """전체 드라이버의 스틴트 정보를 가져옵니다 (프리웜 아티팩트 → 랩 스토어 → 세션)."""
     import pandas as pd
 
     try:
-        # 1. 절대 경로 캐시 디렉토리 연결
-        BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-        CACHE_DIR = os.path.abspath(os.path.join(BASE_DIR, '../data/cache')) # 경로 레벨 확인 필요
-        fastf1.Cache.enable_cache(CACHE_DIR)
-
-        # 2. 로컬 디렉토리 스캔을 통한 이름 강제 보정
-        year_dir = os.path.join(CACHE_DIR, str(year))
-        matched_event_name = gp
-
-        # [방어막] 중국(China), 미국 등 자주 틀리는 이름 매핑
-        TRACK_ALIASES = {
-            "silverstone": "british", "monza": "italian", "spa": "belgian",
-            "interlagos": "sao paulo", "zandvoort": "dutch", "suzuka": "japanese",
-            "saopaulo": "s o paulo", "cota": "united states", "austin": "united states",
-            "china": "chinese", "shanghai": "chinese"
-        }
-
-        search_keyword = gp.lower().replace(" ", "").replace("_", "")
-        for alias, real_name in TRACK_ALIASES.items():
-            if alias in search_keyword:
-                search_keyword = real_name.replace(" ", "")
-                break
-
-        if os.path.exists(year_dir):
-            for folder_name in os.listdir(year_dir):
-                clean_name = folder_name.split('_', 1)[-1] if '_' in folder_name else folder_name
-                compare_name = clean_name.lower().replace("_", "").replace(" ", "")
-                if search_keyword in compare_name:
-                    matched_event_name = clean_name.replace("_", " ")
-                    break
-
-        print(f"🔍 [UI Stint Load] 입력: '{gp}' -> 캐시 매칭: '{matched_event_name}'")
-
-        # 3. 보정된 이름으로 세션 로드
-        session = fastf1.get_session(year, matched_event_name, 'R')
-        session.load(laps=True, telemetry=False, weather=False, messages=False)
-        
-        stints_list = []
-        drivers = session.results['Abbreviation'].tolist()
-        
-        for drv in drivers:
-            laps = session.laps.pick_driver(drv)
-            if laps.empty: continue
-            
-            laps['Stint'] = laps['Stint'].fillna(1).astype(int)
-            for stint_id, data in laps.groupby('Stint'):
-                compound = data['Compound'].iloc[0]
-                start_lap = data['LapNumber'].min()
-                end_lap = data['LapNumber'].max()
-                tyre_life_start = data['TyreLife'].iloc[0]
-                is_new = True if tyre_life_start <= 2.0 else False
-                
-                stints_list.append({
-                    "Driver": drv,
-                    "Stint": stint_id,
-                    "Compound": str(compound).upper(),
-                    "Start": start_lap,
-                    "End": end_lap,
-                    "Duration": end_lap - start_lap,
-                    "Status": "NEW" if is_new else "USED"
-                })
-        return pd.DataFrame(stints_list), drivers
+        stint_df, drivers = get_race_stints(year, gp)
+        print(f"🔍 [UI Stint Load] 입력: '{gp}' -> 스틴트 {len(stint_df)}개 / 드라이버 {len(drivers)}명")
+        return stint_df, drivers
 
     except Exception as e:
         print(f"🚨 UI 스틴트 데이터 로드 실패: {e}")
         return pd.DataFrame(), []
 
-def plot_tire_strategy_chart(df, sorted_drivers):
-    """Pirelli Style Stint Map"""
-    fig = go.Figure()
-    PIRELLI_COLORS = {
-        "SOFT": "#DA291C", "MEDIUM": "#FFD100", "HARD": "#F0F0F0",
-        "INTERMEDIATE": "#43B02A", "WET": "#0067A5"
-    }
-    y_order = list(reversed(sorted_drivers))
-    
-    for _, row in df.iterrows():
-        compound_key = row['Compound'].upper()
-        color = PIRELLI_COLORS.get(compound_key, "#808080")
-        pattern_shape = "/" if row['Status'] == "USED" else ""
-        hover_text = f"<b>{row['Driver']}</b> (Stint {row['Stint']})<br>Tyre: {row['Compound']} ({row['Status']})<br>Laps: {row['Start']} ~ {row['End']}"
-
-        fig.add_trace(go.Bar(
-            y=[row['Driver']], x=[row['Duration']], base=[row['Start']],
-            orientation='h',
-            marker=dict(color=color, line=dict(color='#111111', width=1), pattern_shape=pattern_shape, pattern_solidity=0.5),
-            name=row['Compound'], hovertemplate=hover_text, showlegend=False
-        ))
-
-    fig.update_layout(
-        title=dict(text="<b>🏁 Tire Strategy History</b>", font=dict(size=20, color="white")),
-        template="plotly_dark", barmode='stack',
-        yaxis=dict(categoryorder='array', categoryarray=y_order, title=None),
-        xaxis=dict(title="Lap Number", dtick=5, showgrid=True, gridcolor='#333333', zeroline=False),
-        height=800, bargap=0.4, margin=dict(l=20, r=20, t=60, b=20),
-        plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', showlegend=False
-    )
-    # 범례 추가
-    for name, color in PIRELLI_COLORS.items():
-        if name in df['Compound'].unique():
-            fig.add_trace(go.Bar(x=[0], y=[y_order[0]], marker_color=color, name=name, showlegend=True, visible='legendonly'))
-    return fig
+@st.cache_data(ttl=3600)
+def get_race_trace_matrix(year, gp):
+    """레이스 누적 시간 행렬 (저장된 .npz → 랩 스토어 → 세션). 실패하면 None."""
+    try:
+        return get_race_matrix(year, gp)
+    except Exception as e:
+        print(f"🚨 UI 레이스 트레이스 로드 실패: {e}")
+        return None
 
 def display_strategy_result(response_object):
     """JSON 응답을 예쁜 UI로 변환하여 출력 (Tab 3 전용 Helper)"""
@@ -507,6 +342,19 @@ with tab2:
     if not stint_df.empty:
         fig = plot_tire_strategy_chart(stint_df, drivers_sorted)
         st.plotly_chart(fig, use_container_width=True)
+
+    # 1-1. 서킷 타이어 아틀라스 (시즌별 비교, 배치 잡으로 미리 계산된 표)
+    with st.expander("📚 Circuit Tire Atlas (시즌별 컴파운드 비교)"):
+        atlas_df = query_atlas(selected_gp)
+        if atlas_df.empty:
+            st.info("아틀라스가 없습니다. `python -m data_pipeline.pipelines.build_tire_atlas` 로 생성하세요.")
+        else:
+            st.dataframe(atlas_df.drop(columns=['Circuit', 'Version']), use_container_width=True, hide_index=True)
+
+    # 1-2. 레이스 트레이스 (랩별 선두와의 간격)
+    race_matrix = get_race_trace_matrix(selected_year, selected_gp)
+    if race_matrix is not None and race_matrix.race_time.size:
+        st.plotly_chart(plot_race_trace(race_matrix), use_container_width=True)
     
     st.divider()
     
@@ -605,3 +453,15 @@ with tab2:
                             st.markdown(response)
                         except Exception as e:
                             st.error(f"Simulation Error: {e}")
+
+    # 3-1. 몬테카를로 피트 전략 시뮬레이터 (LLM 없이 동기 계산, 입력은 프리웜 'strategy_inputs' 아티팩트 → 롤아웃만 실행)
+    if st.button("🎲 Monte Carlo Strategy (1~3 Stop)", use_container_width=True):
+        with st.spinner("Simulating strategies..."):
+            try:
+                mc_inputs, mc_table = simulate_race_strategies(selected_year, selected_gp)
+                seasons = ", ".join(str(y) for y, _ in mc_inputs.races)
+                st.caption(f"Fitted from {seasons} | {mc_inputs.laps} laps | Pit loss {mc_inputs.pit_loss}s "
+                           f"(SC {mc_inputs.sc_pit_loss}s) | SC/race {mc_inputs.sc_rate * mc_inputs.laps:.2f}")
+                st.dataframe(mc_table, use_container_width=True, hide_index=True)
+            except Exception as e:
+                st.error(f"Strategy Simulation Error: {e}")
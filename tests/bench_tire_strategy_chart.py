@@ -0,0 +1,111 @@
+"""
+타이어 전략 차트 벤치마크 (스틴트당 트레이스 vs 컴파운드당 트레이스)
+실행: python tests/bench_tire_strategy_chart.py [--years 2021 2025] [--repeat 5]
+
+측정 항목 (캐시된 레이스별):
+- Figure 생성 시간 (repeat 회 중 중앙값)
+- 트레이스 수
+- fig.to_json() 페이로드 크기
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import plotly.graph_objects as go
+
+from app.tools.strategy_chart import plot_tire_strategy_chart, PIRELLI_COLORS
+from data_pipeline import analytics
+from data_pipeline.event_resolver import get_resolver
+
+
+# ────────────────────────────────────────
+# 비교 기준: 기존 구현 (스틴트마다 go.Bar 1개 + 범례용 트레이스)
+# ────────────────────────────────────────
+def legacy_plot_tire_strategy_chart(df, sorted_drivers):
+    fig = go.Figure()
+    y_order = list(reversed(sorted_drivers))
+
+    for _, row in df.iterrows():
+        compound_key = row['Compound'].upper()
+        color = PIRELLI_COLORS.get(compound_key, "#808080")
+        pattern_shape = "/" if row['Status'] == "USED" else ""
+        hover_text = f"<b>{row['Driver']}</b> (Stint {row['Stint']})<br>Tyre: {row['Compound']} ({row['Status']})<br>Laps: {row['Start']} ~ {row['End']}"
+
+        fig.add_trace(go.Bar(
+            y=[row['Driver']], x=[row['Duration']], base=[row['Start']],
+            orientation='h',
+            marker=dict(color=color, line=dict(color='#111111', width=1), pattern_shape=pattern_shape, pattern_solidity=0.5),
+            name=row['Compound'], hovertemplate=hover_text, showlegend=False
+        ))
+
+    fig.update_layout(
+        title=dict(text="<b>🏁 Tire Strategy History</b>", font=dict(size=20, color="white")),
+        template="plotly_dark", barmode='stack',
+        yaxis=dict(categoryorder='array', categoryarray=y_order, title=None),
+        xaxis=dict(title="Lap Number", dtick=5, showgrid=True, gridcolor='#333333', zeroline=False),
+        height=800, bargap=0.4, margin=dict(l=20, r=20, t=60, b=20),
+        plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', showlegend=False
+    )
+    for name, color in PIRELLI_COLORS.items():
+        if name in df['Compound'].unique():
+            fig.add_trace(go.Bar(x=[0], y=[y_order[0]], marker_color=color, name=name, showlegend=True, visible='legendonly'))
+    return fig
+
+
+def measure(builder, df, drivers, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fig = builder(df, drivers)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), len(fig.data), len(fig.to_json())
+
+
+def run_benchmark(years, repeat):
+    rows = []
+    for record in get_resolver().events():
+        if record.year not in years:
+            continue
+        try:
+            df, drivers = analytics.get_race_stints(record.year, record.event_name)
+        except Exception as e:
+            print(f"   ❌ {record.year} {record.event_name}: {e}")
+            continue
+        if df.empty:
+            continue
+
+        old = measure(legacy_plot_tire_strategy_chart, df, drivers, repeat)
+        new = measure(plot_tire_strategy_chart, df, drivers, repeat)
+        rows.append((record.year, record.event_name, old, new))
+        print(f"   {record.year} {record.event_name:<28} "
+              f"build {old[0]*1000:7.1f}ms → {new[0]*1000:6.1f}ms | "
+              f"traces {old[1]:3d} → {new[1]:2d} | "
+              f"json {old[2]/1024:6.1f}KB → {new[2]/1024:5.1f}KB")
+
+    if not rows:
+        print("측정할 레이스가 없습니다.")
+        return
+
+    old_build = sum(r[2][0] for r in rows)
+    new_build = sum(r[3][0] for r in rows)
+    old_json = sum(r[2][2] for r in rows)
+    new_json = sum(r[3][2] for r in rows)
+    print(f"\n [Bench] {len(rows)}개 레이스 합계")
+    print(f"   build: {old_build:.2f}s → {new_build:.2f}s (x{old_build / new_build:.1f})")
+    print(f"   json : {old_json/1024/1024:.2f}MB → {new_json/1024/1024:.2f}MB (x{old_json / new_json:.1f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="타이어 전략 차트 생성 시간 / 페이로드 벤치마크")
+    parser.add_argument('--years', type=int, nargs=2, default=[2021, 2025], metavar=('START', 'END'))
+    parser.add_argument('--repeat', type=int, default=5, help="레이스별 반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+
+    from data_pipeline.cache_setup import ensure_cache
+    ensure_cache()
+    run_benchmark(set(range(args.years[0], args.years[1] + 1)), args.repeat)
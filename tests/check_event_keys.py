@@ -0,0 +1,127 @@
+"""
+레이스 결과 DB event_key 왕복 확인 (기존 RaceID 형식 ↔ 조회 쪽 키)
+실행: python tests/check_event_keys.py
+
+확인 항목:
+- '2025_São_Paulo_Grand_Prix_R' 같은 기존 RaceID가 get_race_standings가 만드는 키와 같은 event_key로 바뀌는지
+- Year 컬럼이 없는 lap_times / weather_data 도 RaceID 연도로 Year / event_key / 인덱스가 채워지는지
+- v1 스키마(RaceID 전체를 정규화한 키)로 마이그레이션된 DB가 다시 계산되는지
+- 마이그레이션한 DB에서 get_race_standings가 실제로 행을 돌려주는지 (드라이버 이름 필터 포함)
+- 마이그레이션 전 DB(event_key 컬럼 없음)에서도 RaceID 정확 일치로 같은 행을 돌려주는지
+"""
+
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from data_pipeline import race_db
+from data_pipeline.event_resolver import event_key
+from app.tools import deterministic_data
+
+TEMPLATE_DB = os.path.join(os.path.dirname(__file__), 'f1_test.db')
+
+# (기존 RaceID, 연도, 사용자가 넣는 그랑프리 이름)
+LEGACY_RACES = [
+    ('2025_São_Paulo_Grand_Prix_R', 2025, 'saopaulo'),
+    ('2025_São_Paulo_Grand_Prix_R', 2025, 'Brazil - 브라질'),
+    ('2023_Las_Vegas_R', 2023, 'Las Vegas'),
+    ('2024_Hungarian_Grand_Prix_R', 2024, 'Hungary - 헝가리'),
+    ('2021_Styrian_Grand_Prix_R', 2021, '스티리아'),
+]
+
+
+def check_round_trip():
+    for race_id, year, user_input in LEGACY_RACES:
+        stored = race_db.race_id_event_key(race_id)
+        queried = event_key(user_input.split('-')[0].strip(), year)
+        assert stored == queried, f"{race_id} → {stored!r} != {user_input!r} → {queried!r}"
+        print(f"   ✅ {race_id:32s} → {stored}")
+
+
+def _legacy_db(path):
+    shutil.copy(TEMPLATE_DB, path)
+    conn = sqlite3.connect(path)
+    for race_id, year, _ in LEGACY_RACES[1:]:
+        conn.executemany(
+            "INSERT INTO race_results (RaceID, Year, Circuit, Driver, TeamName, Position, GridPosition, Points, Status) "
+            "VALUES (?, ?, '', ?, '', ?, ?, ?, 'Finished')",
+            [(race_id, year, 'ANT', 1, 2, 25.0), (race_id, year, 'VER', 2, 1, 18.0)],
+        )
+        conn.execute("INSERT INTO lap_times (RaceID, Driver, LapNumber, LapTime_Sec) VALUES (?, 'ANT', 1, 80.5)",
+                     (race_id,))
+        conn.execute("INSERT INTO weather_data (RaceID, Time_Sec, AirTemp) VALUES (?, 0.0, 25.0)", (race_id,))
+    conn.commit()
+    return conn
+
+
+def check_migration(path):
+    conn = _legacy_db(path)
+    race_db.migrate_schema(conn)
+    for table in race_db.EVENT_TABLES:
+        rows = conn.execute(f'SELECT RaceID, Year, event_key FROM "{table}"').fetchall()
+        for race_id, year, key in rows:
+            assert year == int(race_id[:4]) and key == race_db.race_id_event_key(race_id), (table, race_id, year, key)
+        indexes = {row[1] for row in conn.execute(f'PRAGMA index_list("{table}")')}
+        assert f"idx_{table}_year_event" in indexes, (table, indexes)
+        print(f"   ✅ {table}: {len(rows)}행 Year / event_key / 인덱스")
+
+    # v1 키('2023lasvegasr')가 남아 있는 DB → v2 마이그레이션에서 다시 계산
+    conn.execute("UPDATE race_results SET event_key = lower(replace(RaceID, '_', ''))")
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    race_db.migrate_schema(conn)
+    stale = conn.execute("SELECT COUNT(*) FROM race_results WHERE event_key LIKE '20%'").fetchone()[0]
+    assert stale == 0, f"v1 키 {stale}행 남음"
+    print("   ✅ v1 → v2 event_key 재계산")
+    conn.close()
+
+
+def check_standings(path):
+    race_db._pool = race_db.ReadOnlyPool(path)
+    for _, year, user_input in LEGACY_RACES[1:]:
+        table = deterministic_data.get_race_standings(year, user_input)
+        assert table.startswith('| Position'), table
+        filtered = deterministic_data.get_race_standings(year, user_input, driver='Kimi Antonelli')
+        assert 'ANT' in filtered and 'VER' not in filtered, filtered
+    print("   ✅ get_race_standings (그랑프리 이름 / 드라이버 이름 필터)")
+    race_db.close_pool()
+
+
+def check_legacy_standings(path):
+    _legacy_db(path).close()
+    race_db._pool = race_db.ReadOnlyPool(path)
+    assert not race_db.has_event_keys()
+    for _, year, user_input in LEGACY_RACES[1:]:
+        table = deterministic_data.get_race_standings(year, user_input)
+        assert table.startswith('| Position'), table
+        filtered = deterministic_data.get_race_standings(year, user_input, driver='Kimi Antonelli')
+        assert 'ANT' in filtered and 'VER' not in filtered, filtered
+    print("   ✅ 마이그레이션 전 DB: RaceID 정확 일치로 조회")
+
+    # 같은 파일을 마이그레이션하면 다음 조회부터 event_key 쿼리로 전환
+    conn = sqlite3.connect(path)
+    race_db.migrate_schema(conn)
+    conn.close()
+    assert race_db.has_event_keys()
+    print("   ✅ 마이그레이션 후 event_key 조회로 전환")
+    race_db.close_pool()
+
+
+if __name__ == "__main__":
+    print(" [EventKey] RaceID ↔ 조회 키")
+    check_round_trip()
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(tmp_dir, 'f1_legacy.db')
+        print(" [EventKey] 기존 스키마 마이그레이션")
+        check_migration(db_path)
+        check_standings(db_path)
+        check_legacy_standings(os.path.join(tmp_dir, 'f1_unmigrated.db'))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    print("\n [EventKey] 모두 통과")
@@ -0,0 +1,106 @@
+"""
+레이스 결과 DB 적재 엔진 확인 (로컬 캐시 레이스 → tests/f1_test.db 임시 복사본)
+실행: python tests/check_ingest.py
+
+확인 항목:
+- 로컬 캐시 레이스를 이벤트 이름으로 적재하고 ingest_progress에 'done'으로 기록하는지
+- 캐시에 없는 레이스는 다른 레이스를 막지 않고 'failed' + 에러 메시지로 기록되는지
+- 다시 실행하면 완료된 레이스는 건너뛰고, overwrite로 다시 적재해도 행 수가 그대로인지 (중복 없음)
+- 중간에 멈춘 것처럼 진행 기록 1개를 지우면 그 레이스만 다시 적재하는지
+"""
+
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from data_pipeline import ingest
+from data_pipeline.event_resolver import event_key
+
+TEMPLATE_DB = os.path.join(os.path.dirname(__file__), 'f1_test.db')
+
+# 적재할 캐시 레이스 수 (가장 최근 레이스부터) + 캐시에 없는 레이스 1개
+CACHED_RACE_COUNT = 2
+MISSING_RACE = (2021, None, 'Atlantis Grand Prix')
+
+
+def _ingest(races, db_path, **kwargs):
+    return ingest.ingest_races(races, db_path=db_path, workers=1, fetch=ingest.fetch_cached_race, **kwargs)
+
+
+def _counts(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in ingest.TABLE_COLUMNS}
+    finally:
+        conn.close()
+
+
+def _progress(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {(year, key): (status, error) for year, key, status, error in
+                conn.execute(f"SELECT Year, event_key, Status, Error FROM {ingest.PROGRESS_TABLE}")}
+    finally:
+        conn.close()
+
+
+def check_first_run(races, db_path):
+    stats = _ingest(races + [MISSING_RACE], db_path)
+    assert stats['done'] == len(races) and stats['failed'] == 1, stats
+    counts = _counts(db_path)
+    # 커밋된 캐시에는 날씨 pickle이 없어서 weather_data는 비어 있을 수 있음 (race_frames가 경고 후 건너뜀)
+    assert counts['race_results'] and counts['lap_times'], counts
+
+    progress = _progress(db_path)
+    for year, _, event_name in races:
+        assert progress[(year, event_key(event_name, year))][0] == 'done', progress
+    status, error = progress[(MISSING_RACE[0], event_key(MISSING_RACE[2], MISSING_RACE[0]))]
+    assert status == 'failed' and error, (status, error)
+    print(f"   ✅ 적재 {stats['done']}개 / 실패 기록 1개 ({counts})")
+    return counts
+
+
+def check_rerun(races, db_path, counts):
+    stats = _ingest(races, db_path)
+    assert stats['skipped'] == len(races) and stats['done'] == 0, stats
+    stats = _ingest(races, db_path, overwrite=True)
+    assert stats['done'] == len(races), stats
+    assert _counts(db_path) == counts, (_counts(db_path), counts)
+    print("   ✅ 다시 실행: 완료 레이스 건너뜀 / overwrite 후 행 수 동일")
+
+
+def check_resume(races, db_path, counts):
+    year, _, event_name = races[0]
+    conn = sqlite3.connect(db_path)
+    with conn:
+        key = event_key(event_name, year)
+        conn.execute(f"DELETE FROM {ingest.PROGRESS_TABLE} WHERE Year = ? AND event_key = ?", (year, key))
+        for table in ingest.TABLE_COLUMNS:
+            conn.execute(f'DELETE FROM "{table}" WHERE Year = ? AND event_key = ?', (year, key))
+    conn.close()
+
+    stats = _ingest(races, db_path)
+    assert stats['done'] == 1 and stats['skipped'] == len(races) - 1, stats
+    assert _counts(db_path) == counts, (_counts(db_path), counts)
+    print(f"   ✅ 진행 기록 없는 {year} {event_name}만 다시 적재")
+
+
+if __name__ == "__main__":
+    races = ingest.cached_races()[-CACHED_RACE_COUNT:]
+    assert len(races) == CACHED_RACE_COUNT, "data/cache 에 레이스 캐시가 없음"
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(tmp_dir, 'f1_ingest.db')
+        shutil.copy(TEMPLATE_DB, db_path)
+        print(" [Ingest] 로컬 캐시 레이스 적재")
+        counts = check_first_run(races, db_path)
+        check_rerun(races, db_path, counts)
+        check_resume(races, db_path, counts)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    print("\n [Ingest] 모두 통과")